@@ -0,0 +1,440 @@
+"""
+Core pipeline benchmarks: discovery, Excel parsing, PDF matching, search/highlight and full runs
+"""
+
+import shutil
+import time
+
+from harness import BenchContext, SkipBenchmark, benchmark, measure
+
+
+@benchmark('discovery')
+def bench_discovery(ctx: BenchContext):
+    """Folder pair discovery over the whole archive"""
+    processor = ctx.make_processor(force_ocr=False)
+    timing = measure(processor.discover_folder_pairs, ctx.repeat)
+    return {'seconds': timing['median'], 'pairs': len(timing['value'])}
+
+
+@benchmark('read_excel_tables')
+def bench_read_excel_tables(ctx: BenchContext):
+    """Table extraction from every generated workbook"""
+    processor = ctx.make_processor(force_ocr=False, excel_cache=False)
+    excel_files = ctx.corpus.excel_files
+
+    def run():
+        return sum(len(processor.read_excel_tables(path)) for path in excel_files)
+
+    timing = measure(run, ctx.repeat)
+    expected = len(ctx.corpus.rows)
+    return {
+        'seconds': timing['median'],
+        'workbooks': len(excel_files),
+        'rows': timing['value'],
+        'rows_expected': expected,
+        'per_workbook_ms': timing['median'] / max(1, len(excel_files)) * 1000,
+    }
+
+
+@benchmark('read_excel_tables_cached')
+def bench_read_excel_tables_cached(ctx: BenchContext):
+    """Table extraction from unchanged workbooks through the on-disk table cache"""
+    processor = ctx.make_processor(force_ocr=False)
+    shutil.rmtree(processor.excel_cache_dir, ignore_errors=True)
+    excel_files = ctx.corpus.excel_files
+
+    def run():
+        return sum(len(processor.read_excel_tables(path)) for path in excel_files)
+
+    cold = measure(run, 1)
+    timing = measure(run, ctx.repeat)
+    return {
+        'seconds': timing['median'],
+        'cold_seconds': cold['median'],
+        'workbooks': len(excel_files),
+        'rows': timing['value'],
+        'rows_expected': len(ctx.corpus.rows),
+        'per_workbook_ms': timing['median'] / max(1, len(excel_files)) * 1000,
+        'speedup': cold['median'] / max(timing['median'], 1e-9),
+    }
+
+
+@benchmark('find_matching_pdf')
+def bench_find_matching_pdf(ctx: BenchContext):
+    """PDF lookup for every workbook row"""
+    processor = ctx.make_processor(force_ocr=False)
+    rows = ctx.corpus.rows
+
+    def run():
+        correct = 0
+        for row in rows:
+            match = processor.find_matching_pdf(row.cablex_pn, row.fair_id, row.coc_folder)
+            correct += (match == row.pdf_path)
+        return correct
+
+    timing = measure(run, ctx.repeat)
+    return {
+        'seconds': timing['median'],
+        'rows': len(rows),
+        'correct': timing['value'],
+        'per_row_us': timing['median'] / max(1, len(rows)) * 1e6,
+    }
+
+
+def _search_rows(ctx: BenchContext, rows, **options):
+    processor = ctx.make_processor(**options)
+
+    def run():
+        hits = 0
+        for row in rows:
+            found, _ = processor.search_and_highlight_pdf(row.pdf_path, row.part_number, row.coc_folder.name)
+            hits += (found == row.term_present)
+        return hits
+
+    timing = measure(run, ctx.repeat)
+    return {
+        'seconds': timing['median'],
+        'pdfs': len(rows),
+        'correct': timing['value'],
+        'accuracy': timing['value'] / max(1, len(rows)),
+        'per_pdf_ms': timing['median'] / max(1, len(rows)) * 1000,
+    }
+
+
+@benchmark('search_and_highlight_native')
+def bench_search_native(ctx: BenchContext):
+    """search_and_highlight_pdf on born-digital PDFs (text layer only)"""
+    rows = [row for row in ctx.corpus.pdf_rows if not row.rasterised]
+    if not rows:
+        raise SkipBenchmark('corpus has no born-digital PDFs')
+    return _search_rows(ctx, rows, force_ocr=False)
+
+
+@benchmark('word_index_lookup')
+def bench_word_index_lookup(ctx: BenchContext):
+    """Looking up every part number of a workbook in its born-digital PDFs: search_for vs WordIndex"""
+    import fitz
+
+    from pdf_excel_processor import WordIndex
+
+    rows = [row for row in ctx.corpus.pdf_rows if not row.rasterised]
+    if not rows:
+        raise SkipBenchmark('corpus has no born-digital PDFs')
+    terms = {}
+    for row in ctx.corpus.rows:
+        terms.setdefault(row.excel_path, []).append(row.part_number)
+    docs = [(fitz.open(str(row.pdf_path)), terms[row.excel_path]) for row in rows]
+
+    def with_search_for():
+        return sum(bool(page.search_for(term)) for doc, doc_terms in docs for term in doc_terms for page in doc)
+
+    def with_index():
+        hits = 0
+        for doc, doc_terms in docs:
+            index = WordIndex(doc)
+            hits += sum(len(index.search(term)) for term in doc_terms)
+        return hits
+
+    search_for = measure(with_search_for, ctx.repeat)
+    indexed = measure(with_index, ctx.repeat)
+    for doc, _ in docs:
+        doc.close()
+
+    # Accuracy: terms split across neighbouring words must not be found, the real ones must
+    decoys = fitz.open()
+    page = decoys.new_page()
+    for i, line in enumerate(('Qty 1 27K-667 lot 12 7K667', 'Rev A 123', 'P/N 139-3002 and 139 3003')):
+        page.insert_text((50, 80 + 20 * i), line, fontsize=11)
+    decoy_index = WordIndex(decoys)
+    false_matches = sum(bool(decoy_index.search(term)) for term in ('127K-667', 'A123'))
+    missed = sum(not decoy_index.search(term) for term in ('27K-667', '139-3002', '139-3003'))
+    decoys.close()
+    return {
+        'seconds': indexed['median'],
+        'search_for_seconds': search_for['median'],
+        'speedup': search_for['median'] / indexed['median'] if indexed['median'] else 0.0,
+        'pdfs': len(docs),
+        'lookups': sum(len(doc_terms) for _, doc_terms in docs),
+        'pages_found': indexed['value'],
+        'search_for_pages_found': search_for['value'],
+        'false_matches': false_matches,
+        'missed_matches': missed,
+    }
+
+
+@benchmark('search_and_highlight_ocr', needs_ocr=True)
+def bench_search_ocr(ctx: BenchContext):
+    """search_and_highlight_pdf on rasterised PDFs (OCR path)"""
+    rows = [row for row in ctx.corpus.pdf_rows if row.rasterised]
+    if not rows:
+        raise SkipBenchmark('corpus has no rasterised PDFs')
+    return _search_rows(ctx, rows, force_ocr=False)
+
+
+def _full_run(ctx: BenchContext, **options):
+    def run():
+        processor = ctx.make_processor(**options)
+        results = processor.process_directory()
+        return processor, results
+
+    timing = measure(run, ctx.repeat)
+    processor, results = timing['value']
+    found = int((results['Part Number Found'] == 'Yes').sum()) if not results.empty else 0
+    stages = {name: entry['wall'] for name, entry in processor.run_report.get('stages', {}).items()}
+    output_folder = ctx.corpus.root / 'highlighted_pdfs'
+    return {
+        'seconds': timing['median'],
+        'rows': len(results),
+        'parts_found': found,
+        'parts_expected': sum(row.term_present for row in ctx.corpus.rows),
+        'output_mb': sum(f.stat().st_size for f in output_folder.rglob('*') if f.is_file()) / 2**20,
+        'stages': stages,
+    }
+
+
+@benchmark('process_directory')
+def bench_process_directory(ctx: BenchContext):
+    """Full process_directory run, OCR only where there is no text layer"""
+    return _full_run(ctx, force_ocr=False)
+
+
+@benchmark('process_directory_force_ocr', needs_ocr=True)
+def bench_process_directory_force_ocr(ctx: BenchContext):
+    """Full process_directory run with Force OCR enabled (the GUI default)"""
+    return _full_run(ctx, force_ocr=True)
+
+
+@benchmark('process_directory_sidecar')
+def bench_process_directory_sidecar(ctx: BenchContext):
+    """Full process_directory run writing match sidecars instead of highlighted PDFs"""
+    return _full_run(ctx, force_ocr=False, sidecar_output=True)
+
+
+@benchmark('materialise_all')
+def bench_materialise_all(ctx: BenchContext):
+    """Creating every highlighted PDF from the sidecars of a sidecar run"""
+    processor = ctx.make_processor(force_ocr=False, sidecar_output=True)
+    processor.process_directory()
+    sidecars = list(processor.output_folder.rglob(f'*{processor.SIDECAR_SUFFIX}'))
+
+    def run():
+        for path in processor.output_folder.rglob('*.pdf'):
+            path.unlink()
+        return processor.materialise_all()
+
+    timing = measure(run, ctx.repeat)
+    return {
+        'seconds': timing['median'],
+        'sidecars': len(sidecars),
+        'created': timing['value']['created'],
+        'per_pdf_ms': timing['median'] / max(1, len(sidecars)) * 1000,
+    }
+
+
+@benchmark('watch_latency')
+def bench_watch_latency(ctx: BenchContext):
+    """FolderWatcher: seconds from editing one workbook to its pair's results, vs. a full run
+
+    Also checks that the watch batches leave the full run's journal resumable.
+    """
+    import os
+    import time
+
+    from pdf_excel_processor import FolderWatcher
+
+    full_processor = ctx.make_processor(force_ocr=False)
+    full = measure(full_processor.process_directory, 1)
+    journal_before = full_processor.journal_path.read_bytes()
+
+    settle = 0.5
+    processor = ctx.make_processor(force_ocr=False)
+    watcher = FolderWatcher(processor, settle_seconds=settle)
+    watcher.state_path = ctx.workdir / FolderWatcher.STATE_NAME
+    watcher.baseline()
+    processor.open_worker_pool()
+    workbooks = ctx.corpus.excel_files
+    latencies, batch_seconds = [], []
+    try:
+        for i in range(ctx.repeat):
+            os.utime(workbooks[i % len(workbooks)])
+            changed = time.perf_counter()
+            while watcher.poll_once() is None:
+                time.sleep(0.05)
+            latencies.append(time.perf_counter() - changed)
+            batch_seconds.append(watcher.batches[-1]['seconds'])
+    finally:
+        processor.close_worker_pool()
+
+    # Resuming the full run redoes only the rows of the workbooks edited above
+    journal_kept = full_processor.journal_path.read_bytes() == journal_before
+    edited = {workbooks[i % len(workbooks)] for i in range(ctx.repeat)}
+    resumed = ctx.make_processor(force_ocr=False)
+    resumed.process_directory(resume=True)
+    latencies.sort()
+    batch_seconds.sort()
+    return {
+        'seconds': latencies[len(latencies) // 2],
+        'settle_seconds': settle,
+        'batch_seconds': batch_seconds[len(batch_seconds) // 2],
+        'full_run_seconds': full['median'],
+        'pairs': len(watcher.processed),
+        'main_journal_kept': journal_kept,
+        'rows_resumed': resumed.run_report['stats']['rows_resumed'],
+        'rows_unedited': sum(1 for row in ctx.corpus.rows if row.excel_path not in edited),
+    }
+
+
+@benchmark('work_queue_local')
+def bench_work_queue_local(ctx: BenchContext):
+    """Distributed run through a WorkQueue with local worker processes, vs. one process_directory"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    import pdf_excel_processor
+
+    if ctx.ocr_reason and any(row.rasterised for row in ctx.corpus.rows):
+        # The worker processes build their own processors, whose OCR cannot be turned off
+        raise SkipBenchmark(f'scanned PDFs in the corpus and {ctx.ocr_reason}')
+    script = str(Path(pdf_excel_processor.__file__).resolve())
+    queue_path = ctx.workdir / 'work_queue.sqlite'
+    workers = 2
+
+    def run():
+        processor = ctx.make_processor(force_ocr=False)
+        units = processor.create_work_queue(queue_path)
+        procs = [subprocess.Popen([sys.executable, script, '--work', str(queue_path)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(workers)]
+        results = processor.collect_work_queue(queue_path, poll_seconds=0.1)
+        for proc in procs:
+            proc.wait()
+        return units, results
+
+    timing = measure(run, ctx.repeat)
+    units, results = timing['value']
+    single = measure(ctx.make_processor(force_ocr=False).process_directory, 1)
+    return {
+        'seconds': timing['median'],
+        'workers': workers,
+        'units': units,
+        'rows': len(results),
+        'single_process_seconds': single['median'],
+    }
+
+
+@benchmark('profiling_overhead')
+def bench_profiling_overhead(ctx: BenchContext):
+    """Full run with the profiling mode off, with cProfile and with sampling (nothing over the threshold)"""
+    def run(**options):
+        return measure(ctx.make_processor(force_ocr=False, **options).process_directory, ctx.repeat)['median']
+
+    plain = run()
+    cprofile = run(profile_threshold=3600, profile_mode='cprofile')
+    sampling = run(profile_threshold=3600, profile_mode='sampling')
+    memory = run(profile_threshold=3600, profile_mode='sampling', profile_memory=True)
+    return {
+        'seconds': cprofile,
+        'plain_seconds': plain,
+        'sampling_seconds': sampling,
+        'sampling_memory_seconds': memory,
+        'cprofile_overhead': cprofile / plain - 1 if plain else 0.0,
+        'sampling_overhead': sampling / plain - 1 if plain else 0.0,
+    }
+
+
+_BULK = {}
+
+
+def _bulk_archive(ctx: BenchContext, rows: int = 100_000, workbooks: int = 20):
+    """Archive of large workbooks whose rows have no CoC PDF (generated once per workdir)
+
+    Every CoC folder holds a few unrelated PDFs, so each row is matched against a real
+    listing, but no PDF is searched and the run is all row handling.
+    """
+    import openpyxl
+
+    root = ctx.workdir / 'bulk_archive'
+    if root not in _BULK:
+        per_workbook = rows // workbooks
+        for book in range(workbooks):
+            identifier = f'100K{book:03d}G00'
+            excel_folder = root / f'FAI {identifier}'
+            coc_folder = root / f'Material CoC {identifier}'
+            excel_folder.mkdir(parents=True, exist_ok=True)
+            coc_folder.mkdir(parents=True, exist_ok=True)
+            for decoy in range(20):
+                (coc_folder / f'999-{decoy:04d}_000000_{identifier}.pdf').touch()
+            wb = openpyxl.Workbook(write_only=True)
+            sheet = wb.create_sheet('Form 1')
+            sheet.append(['Cablex P/N', 'FAIR Identifier', 'Part Number'])
+            for row in range(per_workbook):
+                sheet.append([f'139-{book}{row:05d}', f'{book}{row:06d}', f'{book:03d}K{row:05d}-01'])
+            wb.save(excel_folder / f'FAI Sheets-{identifier}.xlsx')
+        _BULK[root] = per_workbook * workbooks
+    return root, _BULK[root]
+
+
+@benchmark('rows_100k')
+def bench_rows_100k(ctx: BenchContext):
+    """100k-row run (tables from the Excel cache, no PDFs found): time and peak traced memory,
+    plus dict rows (iterrows/to_dict) vs ResultRow slots for building the same results"""
+    import tracemalloc
+
+    import pandas as pd
+    from pdf_excel_processor import PDFExcelProcessor, ResultRow, apply_result_schema, results_from_rows
+
+    root, expected = _bulk_archive(ctx)
+    processor = PDFExcelProcessor(str(root), force_ocr=False)
+    processor.process_directory()  # fills the Excel table cache
+
+    timing = measure(processor.process_directory, ctx.repeat)
+    tracemalloc.start()
+    processor.process_directory()
+    run_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tables = pd.concat([processor.read_excel_tables(path) for path in sorted(root.rglob('*.xlsx'))],
+                       ignore_index=True)
+    status = {'PDF Status': 'Not Found', 'PDF File': '', 'Part Number Found': 'N/A', 'Highlighted PDF': '',
+              'Match Pages': [], 'PDF Seconds': None}
+
+    def dict_rows():
+        rows = []
+        for _, row in tables.iterrows():
+            result = row.to_dict()
+            result.update(status)
+            rows.append(result)
+        return apply_result_schema(pd.DataFrame(rows))
+
+    def slot_rows():
+        rows = []
+        for cablex_pn, fair_id, part_number, sheet in zip(tables['Cablex P/N'].tolist(),
+                                                          tables['FAIR Identifier'].tolist(),
+                                                          tables['Part Number'].tolist(), tables['Sheet'].tolist()):
+            rows.append(ResultRow(cablex_pn=cablex_pn, fair_id=fair_id, part_number=part_number, sheet=sheet,
+                                  pdf_status='Not Found', pdf_file='', part_found='N/A', highlighted_pdf='',
+                                  match_pages=[], pdf_seconds=None))
+        return results_from_rows(rows)
+
+    def traced(func):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return seconds, peak
+
+    dict_seconds, dict_peak = traced(dict_rows)
+    slot_seconds, slot_peak = traced(slot_rows)
+    return {
+        'seconds': timing['median'],
+        'rows': len(processor.results_df),
+        'rows_expected': expected,
+        'run_peak_mb': run_peak / 2**20,
+        'dict_rows_seconds': dict_seconds,
+        'dict_rows_peak_mb': dict_peak / 2**20,
+        'slot_rows_seconds': slot_seconds,
+        'slot_rows_peak_mb': slot_peak / 2**20,
+    }
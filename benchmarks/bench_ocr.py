@@ -0,0 +1,110 @@
+"""
+OCR strategy benchmarks (all require Tesseract and Poppler)
+"""
+
+from harness import BenchContext, SkipBenchmark, benchmark, measure
+
+
+def _rasterised_rows(ctx: BenchContext):
+    rows = [row for row in ctx.corpus.pdf_rows if row.rasterised]
+    if not rows:
+        raise SkipBenchmark('corpus has no rasterised PDFs')
+    return rows
+
+
+def _ocr_pass(ctx: BenchContext, rows, **options):
+    """Time search_and_highlight_pdf over rows and score it against the manifest"""
+    processor = ctx.make_processor(force_ocr=True, **options)
+
+    def run():
+        return [processor.search_and_highlight_pdf(row.pdf_path, row.part_number, row.coc_folder.name)[0]
+                for row in rows]
+
+    timing = measure(run, ctx.repeat)
+    found = timing['value']
+    hits = sum(f and row.term_present for f, row in zip(found, rows))
+    expected = sum(row.term_present for row in rows)
+    counters = processor.run_timings.to_dict()['counters']
+    return {
+        'seconds': timing['median'],
+        'recall': hits / max(1, expected),
+        'false_positives': sum(f and not row.term_present for f, row in zip(found, rows)),
+        'pages_ocred': counters.get('pages_ocred', 0) // max(1, timing['samples']),
+        'pages_escalated': counters.get('pages_escalated', 0) // max(1, timing['samples']),
+    }
+
+
+@benchmark('ocr_adaptive_vs_fixed', needs_ocr=True)
+def bench_ocr_adaptive_vs_fixed(ctx: BenchContext):
+    """Adaptive low/high DPI OCR compared with a fixed 200 DPI pass on scanned PDFs"""
+    rows = _rasterised_rows(ctx)
+    fixed = _ocr_pass(ctx, rows, adaptive_ocr=False)
+    adaptive = _ocr_pass(ctx, rows, adaptive_ocr=True)
+    small_print = [row for row in rows if row.small_print]
+    return {
+        'seconds': adaptive['seconds'],
+        'fixed_seconds': fixed['seconds'],
+        'speedup': fixed['seconds'] / adaptive['seconds'] if adaptive['seconds'] else 0.0,
+        'adaptive_recall': adaptive['recall'],
+        'fixed_recall': fixed['recall'],
+        'adaptive_pages_ocred': adaptive['pages_ocred'],
+        'fixed_pages_ocred': fixed['pages_ocred'],
+        'adaptive_pages_escalated': adaptive['pages_escalated'],
+        'small_print_pdfs': len(small_print),
+        'pdfs': len(rows),
+    }
+
+
+@benchmark('ocr_backend_overhead', needs_ocr=True)
+def bench_ocr_backend_overhead(ctx: BenchContext):
+    """Per-page OCR cost: one Tesseract process per page vs batched pages vs tesserocr"""
+    import fitz
+    from PIL import Image
+
+    from pdf_excel_processor import TESSEROCR_AVAILABLE, StageTimings
+
+    rows = _rasterised_rows(ctx)
+    backends = ['per-page', 'batch'] + (['tesserocr'] if TESSEROCR_AVAILABLE else [])
+    metrics = {'pdfs': len(rows)}
+
+    # Fixed cost per engine call, measured on blank pages where recognition is trivial
+    blank_pages = 16
+    blank_doc = fitz.open()
+    for _ in range(blank_pages):
+        blank_doc.new_page(width=612, height=792)
+    chunk = [(i, Image.new('L', (200, 200), 255)) for i in range(blank_pages)]
+    for backend in backends:
+        processor = ctx.make_processor(force_ocr=True, ocr_backend=backend)
+        timing = measure(lambda: processor._ocr_pages(chunk, blank_doc, StageTimings()), ctx.repeat)
+        metrics[f'{backend}_blank_ms_per_page'] = timing['median'] / blank_pages * 1000
+    blank_doc.close()
+
+    # Real scanned pages at the fixed resolution so every backend OCRs the same pixels
+    for backend in backends:
+        result = _ocr_pass(ctx, rows, adaptive_ocr=False, ocr_backend=backend)
+        pages = max(1, result['pages_ocred'])
+        metrics[f'{backend}_seconds'] = result['seconds']
+        metrics[f'{backend}_ms_per_page'] = result['seconds'] / pages * 1000
+        metrics[f'{backend}_recall'] = result['recall']
+
+    metrics['seconds'] = metrics['batch_seconds']
+    return metrics
+
+
+@benchmark('ocr_profiles', needs_ocr=True)
+def bench_ocr_profiles(ctx: BenchContext):
+    """Speed and recall of every OCR profile on scanned PDFs"""
+    from pdf_excel_processor import PDFExcelProcessor
+
+    rows = _rasterised_rows(ctx)
+    metrics = {'pdfs': len(rows)}
+    for profile in PDFExcelProcessor.OCR_PROFILES:
+        result = _ocr_pass(ctx, rows, ocr_profile=profile)
+        metrics[f'{profile}_seconds'] = result['seconds']
+        metrics[f'{profile}_per_page_ms'] = result['seconds'] / max(1, result['pages_ocred']) * 1000
+        metrics[f'{profile}_recall'] = result['recall']
+        metrics[f'{profile}_false_positives'] = result['false_positives']
+    fast = metrics['fast-sparse_seconds']
+    metrics['seconds'] = fast
+    metrics['speedup'] = metrics['default_seconds'] / fast if fast else 0.0
+    return metrics
@@ -0,0 +1,70 @@
+"""
+Scan clean-up benchmarks: cost of the NumPy preprocessing per page, and its effect on OCR
+"""
+
+import fitz
+from PIL import Image
+
+from bench_ocr import _ocr_pass
+from corpus import generate_corpus
+from harness import BenchContext, benchmark, measure
+
+_SKEWED = {}
+
+
+def _skewed_rows(ctx: BenchContext):
+    """Rows of a small all-scanned archive where most pages are crooked (generated once per workdir)"""
+    root = ctx.workdir / 'skewed_archive'
+    if root not in _SKEWED:
+        pairs = max(2, len(ctx.corpus.excel_files) // 2)
+        corpus = generate_corpus(root, pairs=pairs, rows_per_workbook=6, pages_per_pdf=2,
+                                 raster_fraction=1.0, skew_fraction=0.8, seed=4321)
+        _SKEWED[root] = corpus.pdf_rows
+    return _SKEWED[root]
+
+
+@benchmark('preprocess_page')
+def bench_preprocess_page(ctx: BenchContext):
+    """preprocess_page_image on 200 DPI grayscale renders of skewed scans"""
+    from pdf_excel_processor import preprocess_page_image
+
+    rows = _skewed_rows(ctx)
+    pages = []
+    for row in rows:
+        with fitz.open(str(row.pdf_path)) as doc:
+            for page in doc:
+                pix = page.get_pixmap(dpi=200, colorspace=fitz.csGRAY)
+                pages.append((row.skew, Image.frombytes('L', (pix.width, pix.height), pix.samples)))
+
+    timing = measure(lambda: [preprocess_page_image(image) for _, image in pages], ctx.repeat)
+    results = timing['value']
+    # The corpus rotates pages by +skew, so the correcting rotation is -skew
+    errors = [abs(transform.angle + skew) for (skew, _), (_, transform) in zip(pages, results)]
+    rgb_bytes = sum(image.width * image.height * 3 for _, image in pages)
+    bilevel_bytes = sum((image.width + 7) // 8 * image.height for image, _ in results)
+    return {
+        'seconds': timing['median'],
+        'pages': len(pages),
+        'per_page_ms': timing['median'] / max(1, len(pages)) * 1000,
+        'mean_skew_error_deg': sum(errors) / max(1, len(errors)),
+        'max_skew_error_deg': max(errors, default=0.0),
+        'image_bytes_ratio': bilevel_bytes / max(1, rgb_bytes),
+    }
+
+
+@benchmark('ocr_preprocess', needs_ocr=True)
+def bench_ocr_preprocess(ctx: BenchContext):
+    """OCR time per page and recall on skewed scans with and without scan clean-up"""
+    rows = _skewed_rows(ctx)
+    plain = _ocr_pass(ctx, rows, preprocess_ocr=False)
+    cleaned = _ocr_pass(ctx, rows, preprocess_ocr=True)
+    return {
+        'seconds': cleaned['seconds'],
+        'plain_seconds': plain['seconds'],
+        'per_page_ms': cleaned['seconds'] / max(1, cleaned['pages_ocred']) * 1000,
+        'plain_per_page_ms': plain['seconds'] / max(1, plain['pages_ocred']) * 1000,
+        'recall': cleaned['recall'],
+        'plain_recall': plain['recall'],
+        'false_positives': cleaned['false_positives'],
+        'pdfs': len(rows),
+    }
@@ -0,0 +1,66 @@
+"""
+Startup benchmarks: time to import the application in a fresh interpreter, checked against a budget
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from harness import BenchContext, benchmark
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Importing pdf_excel_processor must stay within this budget, and must not pull in any of
+# its heavy modules: they are imported on first use (or preloaded once the window is up)
+IMPORT_BUDGET_SECONDS = 0.3
+
+_IMPORT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import pdf_excel_processor
+seconds = time.perf_counter() - start
+heavy = [name for name in pdf_excel_processor.HEAVY_MODULES + ('tkinter', 'pytesseract', 'pyarrow')
+         if name in sys.modules]
+print(json.dumps({'seconds': seconds, 'heavy': heavy}))
+"""
+
+_WINDOW_CHILD = """
+import json, time
+start = time.perf_counter()
+import pdf_excel_processor
+root = pdf_excel_processor.tk.Tk()
+pdf_excel_processor.ProcessorGUI(root)
+root.update()
+print(json.dumps({'seconds': time.perf_counter() - start}))
+root.destroy()
+"""
+
+
+def _child(code: str):
+    """Run code in a fresh interpreter from the repository root; its JSON output, or None if it failed"""
+    done = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True)
+    if done.returncode != 0:
+        return None
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+@benchmark('startup_import')
+def bench_startup_import(ctx: BenchContext):
+    """Import time of pdf_excel_processor in a fresh interpreter, and time until the window is drawn"""
+    _child(_IMPORT_CHILD)  # brings the bytecode cache up to date
+    runs = [_child(_IMPORT_CHILD) for _ in range(max(3, ctx.repeat))]
+    seconds = statistics.median(run['seconds'] for run in runs)
+    heavy = sorted({name for run in runs for name in run['heavy']})
+    metrics = {
+        'seconds': seconds,
+        'budget_seconds': IMPORT_BUDGET_SECONDS,
+        'within_budget': seconds <= IMPORT_BUDGET_SECONDS and not heavy,
+        'heavy_modules_loaded': ', '.join(heavy) or 'none',
+    }
+    # Needs a display; skipped on headless machines
+    windows = [_child(_WINDOW_CHILD) for _ in range(max(1, ctx.repeat))]
+    if all(windows):
+        metrics['window_seconds'] = statistics.median(window['seconds'] for window in windows)
+    return metrics
@@ -0,0 +1,257 @@
+"""
+Synthetic FAI / Material CoC archive generator for the benchmark suite
+
+Builds a directory tree that looks like the real share:
+
+    <root>/
+      Program 0/
+        FAI 127K600G00/            <- messy multi-sheet workbook(s)
+        Material CoC 127K600G00/   <- born-digital and rasterised CoC PDFs
+      Program 1/
+        Kit 127K601G01/
+          127K601G01/              <- kit-style Excel folder (bare identifier)
+          Material CoC 127K601G01/
+
+Every generated row is recorded in the returned manifest together with the
+expected outcome, so benchmarks can report hit rates as well as timings.
+"""
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+import openpyxl
+
+
+NOISE_WORDS = (
+    'Supplier', 'Lot', 'Heat', 'Batch', 'Material', 'Spec', 'Rev', 'Qty',
+    'Inspection', 'Conforms', 'ASTM', 'Certified', 'Drawing', 'Finish',
+    'Tensile', 'Yield', 'Hardness', 'Plating', 'Date', 'Signature',
+)
+
+FOOTERS = (
+    'Does FAIR contain a documented nonconformance? NO',
+    'FAIR Verified By: J. Smith',
+    'FAIR Reviewed By: QA',
+    'Customer Approval:',
+    'Comments:',
+)
+
+SCALES = {
+    # name: (folder pairs, rows per workbook, pages per PDF)
+    'tiny': (2, 4, 1),
+    'small': (5, 8, 2),
+    'medium': (20, 15, 4),
+    'large': (60, 25, 8),
+}
+
+
+@dataclass
+class ExpectedRow:
+    """Ground truth for one generated workbook row"""
+    identifier: str
+    cablex_pn: str
+    fair_id: str
+    part_number: str
+    excel_path: Path
+    coc_folder: Path
+    pdf_path: Optional[Path]
+    term_present: bool
+    rasterised: bool
+    small_print: bool = False
+    skew: float = 0.0
+
+
+@dataclass
+class Corpus:
+    """Manifest of a generated archive"""
+    root: Path
+    rows: List[ExpectedRow] = field(default_factory=list)
+
+    @property
+    def excel_files(self) -> List[Path]:
+        return sorted({row.excel_path for row in self.rows})
+
+    @property
+    def pdf_rows(self) -> List[ExpectedRow]:
+        return [row for row in self.rows if row.pdf_path]
+
+
+def _noise_line(rng: random.Random, words: int = 8) -> str:
+    return ' '.join(rng.choice(NOISE_WORDS) for _ in range(words))
+
+
+def _write_workbook(path: Path, identifier: str, rows: List[ExpectedRow], rng: random.Random):
+    """Write a workbook where the table is buried between noise and footers"""
+    wb = openpyxl.Workbook()
+
+    cover = wb.active
+    cover.title = 'Cover'
+    cover['A1'] = f'First Article Inspection Report - {identifier}'
+    for r in range(3, 3 + rng.randint(3, 8)):
+        cover.cell(row=r, column=1, value=_noise_line(rng, 4))
+        cover.cell(row=r, column=3, value=rng.randint(1, 9999))
+
+    sheet = wb.create_sheet('Form 1')
+    top = rng.randint(2, 9)
+    left = rng.randint(1, 4)
+    for r in range(1, top):
+        sheet.cell(row=r, column=1, value=_noise_line(rng, 5))
+        if rng.random() < 0.4:
+            sheet.cell(row=r, column=left + 2, value=f'Rev {rng.choice("ABCD")}')
+
+    headers = ['Cablex\nP/N', 'FAIR  Identifier', 'Part Number', 'Notes']
+    for c, header in enumerate(headers):
+        sheet.cell(row=top, column=left + c, value=header)
+
+    r = top + 1
+    for idx, row in enumerate(rows):
+        sheet.cell(row=r, column=left, value=row.cablex_pn)
+        sheet.cell(row=r, column=left + 1, value=row.fair_id)
+        sheet.cell(row=r, column=left + 2, value=row.part_number)
+        if rng.random() < 0.3:
+            sheet.cell(row=r, column=left + 3, value=_noise_line(rng, 3))
+        r += 1
+        # An isolated blank row inside the table must not end it
+        if idx == len(rows) // 2 and rng.random() < 0.5:
+            r += 1
+
+    for footer in rng.sample(FOOTERS, k=2):
+        sheet.cell(row=r, column=left, value=footer)
+        r += 1
+    for _ in range(rng.randint(2, 6)):
+        sheet.cell(row=r, column=left, value=_noise_line(rng, 6))
+        r += 1
+
+    notes = wb.create_sheet('Revision History')
+    for i in range(1, rng.randint(4, 12)):
+        notes.cell(row=i, column=1, value=f'Rev {i}')
+        notes.cell(row=i, column=2, value=_noise_line(rng, 6))
+
+    wb.save(path)
+
+
+def _write_pdf(path: Path, part_number: Optional[str], pages: int, rasterise: bool,
+               rng: random.Random, fontsize: float = 10, raster_dpi: int = 150, part_fontsize: Optional[float] = None,
+               skew: float = 0.0):
+    """Write a CoC PDF, optionally flattened to page images like a scan
+
+    A rasterised PDF with a non-zero skew has its pages rotated by that many degrees
+    on a grey background, like a crooked fax copy.
+    """
+    doc = fitz.open()
+    target_page = rng.randrange(pages)
+    for page_num in range(pages):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 60), 'CERTIFICATE OF CONFORMANCE', fontsize=16)
+        lines = []
+        y = 100
+        while y < 700:
+            lines.append(y)
+            y += fontsize * 2
+        # The part number takes the place of one noise line, so it never overprints text
+        part_line = rng.choice([y for y in lines if 150 <= y <= 650]) if page_num == target_page else None
+        for y in lines:
+            if part_number and y == part_line:
+                page.insert_text((rng.randint(72, 300), y), f'P/N: {part_number}',
+                                 fontsize=part_fontsize or fontsize + 2)
+            else:
+                page.insert_text((72, y), _noise_line(rng, 9), fontsize=fontsize)
+
+    if rasterise:
+        scanned = fitz.open()
+        for page in doc:
+            pix = page.get_pixmap(dpi=raster_dpi, colorspace=fitz.csGRAY)
+            new_page = scanned.new_page(width=page.rect.width, height=page.rect.height)
+            if skew:
+                from PIL import Image
+                image = Image.frombytes('L', (pix.width, pix.height), pix.samples)
+                image = image.point(lambda v: 60 + v * 170 // 255).rotate(skew, resample=Image.BILINEAR,
+                                                                          fillcolor=230)
+                pix = fitz.Pixmap(fitz.csGRAY, pix.width, pix.height, image.tobytes(), False)
+            new_page.insert_image(new_page.rect, pixmap=pix)
+        doc.close()
+        doc = scanned
+
+    doc.save(str(path), garbage=3, deflate=True)
+    doc.close()
+
+
+def generate_corpus(root, pairs: int = 5, rows_per_workbook: int = 8, pages_per_pdf: int = 2,
+                    raster_fraction: float = 0.3, missing_pdf_fraction: float = 0.1,
+                    absent_term_fraction: float = 0.1, small_print_fraction: float = 0.2,
+                    seed: int = 1234, skew_fraction: float = 0.0, max_skew: float = 4.0) -> Corpus:
+    """Generate a synthetic archive under root and return its manifest
+
+    small_print_fraction of the PDFs carry the part number as a tiny stamp,
+    which is hard to read from a low-resolution scan. skew_fraction of the
+    rasterised PDFs are scanned crooked by up to max_skew degrees.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    corpus = Corpus(root=root)
+
+    for pair_idx in range(pairs):
+        identifier = f'127K{600 + pair_idx}G{pair_idx % 100:02d}'
+        program = root / f'Program {pair_idx % 3}'
+        if pair_idx % 4 == 1:
+            # Kit layout: bare identifier folder next to the CoC folder, one level deeper
+            container = program / f'Kit {identifier}'
+            excel_folder = container / identifier
+        else:
+            container = program
+            excel_folder = container / f'FAI {identifier}'
+        coc_folder = container / f'Material CoC {identifier}'
+        excel_folder.mkdir(parents=True, exist_ok=True)
+        coc_folder.mkdir(parents=True, exist_ok=True)
+
+        excel_path = excel_folder / f'FAI Sheets-{identifier}.xlsx'
+        rows = []
+        for row_idx in range(rows_per_workbook):
+            cablex_pn = f'139-{3000 + pair_idx * 50 + row_idx}'
+            fair_id = f'{760000 + pair_idx * 100 + row_idx}'
+            part_number = f'{rng.randint(100, 999)}K{rng.randint(100, 999)}-{rng.randint(1, 99):02d}'
+            has_pdf = rng.random() >= missing_pdf_fraction
+            term_present = has_pdf and rng.random() >= absent_term_fraction
+            rasterised = has_pdf and rng.random() < raster_fraction
+            small_print = rng.random() < small_print_fraction
+            # Only draw from rng when enabled so existing corpora stay identical
+            skew = 0.0
+            if skew_fraction and rasterised and rng.random() < skew_fraction:
+                skew = round(rng.uniform(-max_skew, max_skew), 1)
+
+            pdf_path = None
+            if has_pdf:
+                if rng.random() < 0.5:
+                    pdf_name = f'{cablex_pn}_{fair_id}_30-07-2024.pdf'
+                else:
+                    pdf_name = f'{fair_id}-{cablex_pn}.pdf'
+                pdf_path = coc_folder / pdf_name
+                _write_pdf(pdf_path, part_number if term_present else None,
+                           pages_per_pdf, rasterised, rng, part_fontsize=5 if small_print else None, skew=skew)
+
+            rows.append(ExpectedRow(
+                identifier=identifier,
+                cablex_pn=cablex_pn,
+                fair_id=fair_id,
+                part_number=part_number,
+                excel_path=excel_path,
+                coc_folder=coc_folder,
+                pdf_path=pdf_path,
+                term_present=term_present,
+                rasterised=rasterised,
+                small_print=small_print,
+                skew=skew,
+            ))
+
+        # Unrelated PDFs that must not be matched
+        for decoy in range(2):
+            _write_pdf(coc_folder / f'999-{decoy:04d}_000000_{identifier}.pdf', None, 1, False, rng)
+
+        _write_workbook(excel_path, identifier, rows, rng)
+        corpus.rows.extend(rows)
+
+    return corpus
@@ -0,0 +1,173 @@
+"""
+Benchmark registry, timing helpers and the regression history store
+"""
+
+import json
+import shutil
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+HISTORY_FILE = RESULTS_DIR / 'history.jsonl'
+
+BENCHMARKS: Dict[str, 'Benchmark'] = {}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable
+    needs_ocr: bool = False
+    description: str = ''
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark that cannot run in this environment"""
+
+
+def benchmark(name: str, needs_ocr: bool = False):
+    """Register a benchmark function taking a BenchContext and returning a metrics dict"""
+    def decorator(func):
+        BENCHMARKS[name] = Benchmark(name, func, needs_ocr, (func.__doc__ or '').strip())
+        return func
+    return decorator
+
+
+def measure(func: Callable, repeat: int = 3) -> Dict:
+    """Run func repeat times and return wall time statistics plus the last return value"""
+    samples = []
+    value = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        value = func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'samples': len(samples),
+        'value': value,
+    }
+
+
+def ocr_ready() -> Optional[str]:
+    """Return None if Tesseract and Poppler are usable, otherwise the reason they are not"""
+    import pdf_excel_processor as processor_module
+
+    # The probe also puts Tesseract/Poppler on the path on Windows
+    if not processor_module.ocr_available():
+        return 'pytesseract/pdf2image not installed'
+    try:
+        processor_module.pytesseract.get_tesseract_version()
+    except Exception as e:
+        return f'Tesseract not usable: {e}'
+    if not shutil.which('pdftoppm'):
+        return 'Poppler (pdftoppm) not on PATH'
+    return None
+
+
+def git_revision(repo_root: Path) -> Dict:
+    """Commit hash and dirty flag of the tree being benchmarked"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return {'commit': commit, 'dirty': dirty}
+    except Exception:
+        return {'commit': None, 'dirty': None}
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def record_result(entry: Dict, history_file: Path = HISTORY_FILE):
+    """Append one benchmark result to the history file"""
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(_jsonable(entry)) + '\n')
+
+
+def load_history(history_file: Path = HISTORY_FILE) -> List[Dict]:
+    if not history_file.exists():
+        return []
+    entries = []
+    with open(history_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+def previous_result(history: List[Dict], name: str, scale: str, commit: Optional[str],
+                    ocr: bool = True) -> Optional[Dict]:
+    """Most recent result of the same benchmark, scale and OCR availability recorded at a different commit"""
+    for entry in reversed(history):
+        if (entry.get('benchmark') == name and entry.get('scale') == scale and entry.get('commit') != commit
+                and entry.get('ocr', True) == ocr):
+            return entry
+    return None
+
+
+def compare(current: Dict, previous: Optional[Dict], key: str = 'seconds') -> str:
+    """Format the change of a timing metric against a previous result"""
+    if not previous:
+        return ''
+    before = previous.get('metrics', {}).get(key)
+    after = current.get('metrics', {}).get(key)
+    if not before or after is None:
+        return ''
+    change = (after - before) / before * 100
+    return f"{change:+.1f}% vs {previous.get('commit')}"
+
+
+def timestamp() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+@dataclass
+class BenchContext:
+    """Everything a benchmark needs: the generated corpus and run settings"""
+    corpus: object
+    scale: str
+    repeat: int
+    workdir: Path
+    # Why OCR cannot run here (ocr_ready()), or None if it can
+    ocr_reason: Optional[str] = None
+
+    def make_processor(self, **options):
+        """Fresh PDFExcelProcessor over the corpus with outputs cleared
+
+        Without Tesseract/Poppler the processor's OCR is turned off, so scanned PDFs count
+        as not found instead of failing (and logging) inside the timed region.
+        """
+        from pdf_excel_processor import PDFExcelProcessor
+
+        output_folder = self.corpus.root / 'highlighted_pdfs'
+        if output_folder.exists():
+            shutil.rmtree(output_folder)
+        processor = PDFExcelProcessor(str(self.corpus.root), **options)
+        if self.ocr_reason:
+            processor.ocr_pdf_and_create_searchable = _ocr_off
+        return processor
+
+
+def _ocr_off(*args, **kwargs):
+    """Stands in for ocr_pdf_and_create_searchable when OCR cannot run: nothing found"""
+    return False, []
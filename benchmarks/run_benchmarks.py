@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Run the FAI/CoC benchmark suite against a freshly generated synthetic archive
+
+Examples:
+    python benchmarks/run_benchmarks.py                       # all benchmarks, 'small' scale
+    python benchmarks/run_benchmarks.py --scale medium -k excel
+    python benchmarks/run_benchmarks.py --pairs 40 --rows 30 --pages 6 --repeat 1
+    python benchmarks/run_benchmarks.py --list
+
+Every result is appended to benchmarks/results/history.jsonl together with the
+git commit it was measured at, and compared with the last result recorded at a
+different commit so regressions show up directly in the output.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+import pdf_excel_processor  # noqa: E402,F401  (configures logging on import)
+import harness  # noqa: E402
+from corpus import SCALES, generate_corpus  # noqa: E402
+
+# Importing the benchmark modules registers their benchmarks
+import bench_core  # noqa: E402,F401
+import bench_ocr  # noqa: E402,F401
+import bench_preprocess  # noqa: E402,F401
+import bench_startup  # noqa: E402,F401
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Preset corpus size')
+    parser.add_argument('--pairs', type=int, help='Override number of FAI/CoC folder pairs')
+    parser.add_argument('--rows', type=int, help='Override rows per workbook')
+    parser.add_argument('--pages', type=int, help='Override pages per PDF')
+    parser.add_argument('--raster-fraction', type=float, default=0.3, help='Share of rasterised (scanned) PDFs')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per benchmark (median is reported)')
+    parser.add_argument('-k', '--filter', default='', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--workdir', help='Generate the corpus here instead of a temporary directory')
+    parser.add_argument('--history', default=str(harness.HISTORY_FILE), help='History file (JSONL)')
+    parser.add_argument('--no-record', action='store_true', help='Do not append results to the history file')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and exit')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show the processor log output')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.list:
+        for name, bench in sorted(harness.BENCHMARKS.items()):
+            tag = ' [ocr]' if bench.needs_ocr else ''
+            print(f"{name}{tag}: {bench.description}")
+        return 0
+
+    # Keep the processor's own logging out of the benchmark output
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    pairs, rows, pages = SCALES[args.scale]
+    pairs = args.pairs or pairs
+    rows = args.rows or rows
+    pages = args.pages or pages
+    scale = args.scale if not (args.pairs or args.rows or args.pages) else f"custom-{pairs}x{rows}x{pages}"
+
+    selected = [bench for name, bench in sorted(harness.BENCHMARKS.items()) if args.filter in name]
+    if not selected:
+        print(f"No benchmarks match '{args.filter}'")
+        return 1
+
+    ocr_reason = harness.ocr_ready()
+    revision = harness.git_revision(REPO_ROOT)
+    history_file = Path(args.history)
+    history = harness.load_history(history_file)
+
+    with tempfile.TemporaryDirectory(prefix='fai_bench_') as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        corpus_root = workdir / 'archive'
+        print(f"Generating corpus ({pairs} pairs x {rows} rows, {pages} pages/PDF) in {corpus_root} ...")
+        corpus = generate_corpus(
+            corpus_root, pairs=pairs, rows_per_workbook=rows, pages_per_pdf=pages,
+            raster_fraction=args.raster_fraction, seed=args.seed
+        )
+        ctx = harness.BenchContext(corpus=corpus, scale=scale, repeat=args.repeat, workdir=workdir,
+                                   ocr_reason=ocr_reason)
+        print(f"Commit {revision['commit']}{' (dirty)' if revision['dirty'] else ''}, "
+              f"OCR {'available' if ocr_reason is None else 'off, scanned PDFs count as not found: ' + ocr_reason}\n")
+
+        for bench in selected:
+            if bench.needs_ocr and ocr_reason is not None:
+                print(f"{bench.name:<36} SKIPPED ({ocr_reason})")
+                continue
+            try:
+                metrics = bench.func(ctx)
+            except harness.SkipBenchmark as e:
+                print(f"{bench.name:<36} SKIPPED ({e})")
+                continue
+
+            entry = {
+                'timestamp': harness.timestamp(),
+                'benchmark': bench.name,
+                'scale': scale,
+                'repeat': args.repeat,
+                'ocr': ocr_reason is None,
+                **revision,
+                'metrics': metrics,
+            }
+            delta = harness.compare(entry, harness.previous_result(history, bench.name, scale, revision['commit'],
+                                                                       ocr_reason is None))
+            extras = ', '.join(
+                f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in metrics.items() if key != 'seconds' and not isinstance(value, dict)
+            )
+            print(f"{bench.name:<36} {metrics.get('seconds', 0):9.3f}s  {extras}  {delta}")
+
+            if not args.no_record:
+                harness.record_result(entry, history_file)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
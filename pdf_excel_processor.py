@@ -4,22 +4,43 @@ PDF and Excel Processor for FAI/Material CoC Analysis
 Processes FAI Excel sheets and corresponding Material CoC PDFs
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import argparse
+import signal
+import uuid
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import re
 import logging
 import subprocess
 import platform
+import tempfile
+import time
+import json
+import sqlite3
+import hashlib
+import importlib
+import importlib.util
+import shutil
+import math
+import bisect
+import cProfile
+import inspect
+import marshal
+import pstats
+import tracemalloc
+from collections import Counter, deque, OrderedDict
+from contextlib import contextmanager, closing, nullcontext
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-import pandas as pd
-import openpyxl
-import fitz  # PyMuPDF
-import tkinter as tk
-from tkinter import filedialog, ttk, scrolledtext, messagebox
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import threading
+import queue
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +50,69 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class _LazyModule:
+    """Stand-in for a module that is only imported when one of its attributes is first used
+
+    On first use the module global named alias is rebound to the real module, so later
+    lookups in this file cost nothing extra.
+    """
+
+    def __init__(self, name: str, alias: str):
+        self._name = name
+        self._alias = alias
+
+    def _load(self):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'>"
+
+
+def _module_available(name: str) -> bool:
+    """Whether a module can be found, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Heavy libraries are imported on first use, so the window shows without waiting for them
+# (preload_heavy_modules imports them in the background once it is up)
+HEAVY_MODULES = ('pandas', 'numpy', 'fitz')
+pd = _LazyModule('pandas', 'pd')
+np = _LazyModule('numpy', 'np')
+fitz = _LazyModule('fitz', 'fitz')  # PyMuPDF
+tk = _LazyModule('tkinter', 'tk')
+ttk = _LazyModule('tkinter.ttk', 'ttk')
+filedialog = _LazyModule('tkinter.filedialog', 'filedialog')
+scrolledtext = _LazyModule('tkinter.scrolledtext', 'scrolledtext')
+messagebox = _LazyModule('tkinter.messagebox', 'messagebox')
+
+
+def preload_heavy_modules() -> threading.Thread:
+    """Import HEAVY_MODULES in a background thread, so the first run does not wait for them
+    
+    tesserocr, which must be imported on the main thread, is imported before the thread starts.
+    """
+    tesserocr_loaded()
+    
+    def load():
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logger.debug(f"Could not preload {name}: {e}")
+
+    thread = threading.Thread(target=load, name='preload-modules', daemon=True)
+    thread.start()
+    return thread
+
+
 def setup_windows_paths():
     """Setup Tesseract and Poppler paths for Windows"""
     if platform.system() != 'Windows':
@@ -112,428 +196,2623 @@ def setup_windows_paths():
     return tesseract_found and poppler_found
 
 
-# Setup Windows paths before importing OCR libraries
-if platform.system() == 'Windows':
-    setup_windows_paths()
+# OCR libraries: only looked up here; DependencyProbe imports them and finds Tesseract/Poppler
+OCR_MISSING = [name for name in ('pytesseract', 'pdf2image', 'PIL') if not _module_available(name)]
+OCR_AVAILABLE = not OCR_MISSING
+if not OCR_AVAILABLE:
+    OCR_ERROR = f"No module named {', '.join(repr(name) for name in OCR_MISSING)}"
+    logger.warning(f"OCR libraries not available: {OCR_ERROR}")
+pytesseract = _LazyModule('pytesseract', 'pytesseract')
+Image = _LazyModule('PIL.Image', 'Image')
 
-# OCR imports with error handling
-try:
-    import pytesseract
-    from pdf2image import convert_from_path
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError as e:
-    OCR_AVAILABLE = False
-    OCR_ERROR = str(e)
-    logger.warning(f"OCR libraries not available: {e}")
 
+def convert_from_path(*args, **kwargs):
+    """pdf2image.convert_from_path, imported on first use"""
+    from pdf2image import convert_from_path as convert
+    return convert(*args, **kwargs)
 
-class PDFExcelProcessor:
-    """Main processor class for handling FAI Excel sheets and Material CoC PDFs"""
+
+# Optional in-process Tesseract bindings (keeps one warm engine per worker thread)
+TESSEROCR_AVAILABLE = _module_available('tesserocr')
+tesserocr = _LazyModule('tesserocr', 'tesserocr')
+_tesserocr_loaded = None
+
+
+def tesserocr_loaded() -> bool:
+    """Import tesserocr, returning whether it can be used
     
-    def __init__(self, base_path: str, force_ocr: bool = True, separate_output: bool = True, destructive: bool = False):
-        self.base_path = Path(base_path)
-        self.results_df = pd.DataFrame()
-        self.processed_pdfs = []
-        self.force_ocr = force_ocr
-        self.separate_output = separate_output
-        self.destructive = destructive
-        self.output_folder = None
-        
-        # Create output folder if needed (only if not destructive and separate output is enabled)
-        if self.separate_output and not self.destructive:
-            self.output_folder = self.base_path / "highlighted_pdfs"
-            self.output_folder.mkdir(exist_ok=True)
-        
-        # Track folder structure for organizing outputs
-        self.folder_map = {}
-        
-    @staticmethod
-    def _clean_cell(value) -> str:
-        """Normalize cell contents by stripping whitespace and collapsing newlines"""
-        if pd.isna(value):
-            return ''
-        text = str(value).replace('\n', ' ')
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+    Builds of tesserocr that use cysignals install signal handlers on import, which only
+    the main thread may do, so the entry points call this on the main thread before any
+    worker needs it. A failed import from another thread is not remembered.
+    """
+    global _tesserocr_loaded
+    if _tesserocr_loaded is None and TESSEROCR_AVAILABLE:
+        try:
+            import tesserocr  # noqa: F401
+            _tesserocr_loaded = True
+        except ImportError as e:
+            logger.warning(f"tesserocr is installed but cannot be loaded: {e}")
+            _tesserocr_loaded = False
+        except ValueError as e:
+            logger.warning(f"tesserocr was first imported outside the main thread: {e}")
+            return False
+    return bool(_tesserocr_loaded)
 
-    def _extract_table_from_sheet(self, sheet_df: pd.DataFrame) -> pd.DataFrame:
-        """Locate and extract the Cablex/FAIR/Part Number table from a messy worksheet"""
-        if sheet_df.empty:
-            return pd.DataFrame()
+# Optional columnar export of results (Parquet / Arrow IPC)
+PYARROW_AVAILABLE = _module_available('pyarrow')
+pa = _LazyModule('pyarrow', 'pa')
+feather = _LazyModule('pyarrow.feather', 'feather')
+pq = _LazyModule('pyarrow.parquet', 'pq')
 
-        normalized = sheet_df.map(self._clean_cell)
+# Optional filesystem notifications (inotify on Linux) that wake the folder watcher early
+WATCHDOG_AVAILABLE = _module_available('watchdog')
 
-        header_row_idx = None
-        header_candidates = {}
 
-        for idx, row in normalized.iterrows():
-            row_lower = [cell.lower() for cell in row if cell]
-            if not row_lower:
-                continue
+class DependencyProbe:
+    """Imports the OCR libraries and locates Tesseract and Poppler, off the main thread
 
-            has_cablex = any('cablex' in cell and 'p/n' in cell for cell in row_lower)
-            has_fair = any('fair' in cell and 'identifier' in cell for cell in row_lower)
-            has_part = any('part number' in cell for cell in row_lower)
+    start() runs the probe in a background thread so the window does not wait for it;
+    wait() returns its result, probing first if nothing started it. On Windows the
+    probe runs setup_windows_paths. What it finds is cached in CACHE_FILE and reused
+    on the next start while the Tesseract executable is unchanged and Poppler is still
+    there, so Tesseract is not asked for its version on every launch.
+    """
 
-            if has_cablex and has_fair and has_part:
-                header_row_idx = idx
-                header_candidates = {
-                    'Cablex P/N': None,
-                    'FAIR Identifier': None,
-                    'Part Number': None,
-                }
+    CACHE_FILE = Path(os.environ.get('LOCALAPPDATA') or Path.home() / '.cache') / 'fai_processor' / 'dependencies.json'
+    CACHE_VERSION = 1
 
-                header_row = normalized.iloc[idx]
-                for col_idx, text in header_row.items():
-                    lower = text.lower()
-                    if not lower:
-                        continue
-                    if 'cablex' in lower and 'p/n' in lower:
-                        header_candidates['Cablex P/N'] = col_idx
-                    elif 'fair' in lower and 'identifier' in lower:
-                        header_candidates['FAIR Identifier'] = col_idx
-                    elif 'part number' in lower:
-                        header_candidates['Part Number'] = col_idx
-                break
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = Path(cache_file) if cache_file else self.CACHE_FILE
+        self._lock = threading.Lock()
+        self._thread = None
+        self._result = None
 
-        if header_row_idx is None or None in header_candidates.values():
-            return pd.DataFrame()
+    @property
+    def done(self) -> bool:
+        return self._result is not None
 
-        records = []
-        empty_streak = 0
+    def start(self) -> 'DependencyProbe':
+        """Start probing in the background (no-op if already started)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='dependency-probe', daemon=True)
+                self._thread.start()
+        return self
 
-        footer_markers = (
-            'does fair contain',
-            'fair verified',
-            'fair reviewed',
-            'customer approval',
-            'comments:',
-        )
+    def wait(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Result of the probe, waiting up to timeout seconds for it (None if still running)"""
+        self.start()
+        self._thread.join(timeout)
+        return self._result
 
-        for idx in range(header_row_idx + 1, len(normalized)):
-            row = normalized.iloc[idx]
-            row_text = ' '.join(cell for cell in row if cell)
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            result = self._probe()
+        except Exception as e:
+            logger.error(f"Dependency check failed: {e}")
+            result = {'ocr_libraries': False, 'ocr_error': str(e), 'tesseract': None,
+                      'tesseract_version': None, 'poppler': None, 'cached': False}
+        result['seconds'] = time.perf_counter() - started
+        self._result = result
 
-            if not row_text:
-                empty_streak += 1
-                if empty_streak >= 2:
-                    break
-                continue
+    def _probe(self) -> Dict:
+        result = {'ocr_libraries': False, 'ocr_error': None, 'tesseract': None,
+                  'tesseract_version': None, 'poppler': None, 'cached': False}
+        try:
+            import pytesseract
+            import pdf2image  # noqa: F401
+            import PIL.Image  # noqa: F401
+            result['ocr_libraries'] = True
+        except ImportError as e:
+            result['ocr_error'] = str(e)
+            logger.warning(f"OCR libraries not available: {e}")
 
-            empty_streak = 0
+        cached = self._load_cache()
+        if cached:
+            result.update(cached, cached=True)
+            if result['ocr_libraries']:
+                pytesseract.pytesseract.tesseract_cmd = cached['tesseract']
+            if cached['poppler'] not in os.environ.get('PATH', '').split(os.pathsep):
+                os.environ['PATH'] = f"{cached['poppler']}{os.pathsep}{os.environ.get('PATH', '')}"
+            return result
 
-            lowered = row_text.lower()
-            if any(marker in lowered for marker in footer_markers):
-                break
+        setup_windows_paths()
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd if result['ocr_libraries'] else 'tesseract'
+        result['tesseract'] = shutil.which(tesseract_cmd)
+        pdftoppm = shutil.which('pdftoppm')
+        result['poppler'] = str(Path(pdftoppm).parent) if pdftoppm else None
+        if result['tesseract'] and result['ocr_libraries']:
+            try:
+                result['tesseract_version'] = str(pytesseract.get_tesseract_version())
+            except Exception as e:
+                logger.warning(f"Tesseract at {result['tesseract']} does not run: {e}")
+                result['tesseract'] = None
+        if result['tesseract'] and result['poppler']:
+            self._save_cache(result)
+        return result
 
-            record = {}
-            filled = False
-            for key, col_idx in header_candidates.items():
-                value = row.get(col_idx, '')
-                record[key] = value
-                if value:
-                    filled = True
+    def _load_cache(self) -> Optional[Dict]:
+        """Cached locations, if the executables found last time are still the same"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('version') != self.CACHE_VERSION:
+                return None
+            if os.stat(entry['tesseract']).st_mtime != entry['tesseract_mtime']:
+                return None
+            if not any((Path(entry['poppler']) / name).exists() for name in ('pdftoppm', 'pdftoppm.exe')):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return {key: entry[key] for key in ('tesseract', 'tesseract_version', 'poppler')}
 
-            if filled:
-                records.append(record)
+    def _save_cache(self, result: Dict):
+        entry = {key: result[key] for key in ('tesseract', 'tesseract_version', 'poppler')}
+        try:
+            entry.update(version=self.CACHE_VERSION, tesseract_mtime=os.stat(result['tesseract']).st_mtime)
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=2)
+        except OSError as e:
+            logger.debug(f"Could not cache dependency locations: {e}")
 
-        if not records:
-            return pd.DataFrame()
 
-        return pd.DataFrame(records)
+# Shared by the whole process: started at launch, waited for before the first OCR
+DEPENDENCIES = DependencyProbe()
 
-    def extract_identifier(self, folder_name: str) -> str:
-        """Extract the identifier from folder name
-        
-        Examples:
-            'FAI 127K667G02' -> '127K667G02'
-            'Material CoC 127K667G02' -> '127K667G02'
-            '127K667G02' -> '127K667G02'
-        """
-        # Try to extract from 'FAI <identifier>' pattern
-        match = re.search(r'FAI\s+(.+)', folder_name)
-        if match:
-            return match.group(1)
-        
-        # Try to extract from 'Material CoC <identifier>' pattern
-        match = re.search(r'Material\s+CoC\s+(.+)', folder_name)
-        if match:
-            return match.group(1)
-        
-        # Return as-is if no pattern matches
-        return folder_name
-    
-    def extract_fai_number(self, folder_name: str) -> str:
-        """Legacy method - calls extract_identifier for backward compatibility"""
-        return self.extract_identifier(folder_name)
-    
-    def read_excel_tables(self, excel_path: Path) -> pd.DataFrame:
-        """Read Excel file and extract tables with required columns"""
+
+def ocr_available() -> bool:
+    """Whether the OCR libraries load (waits for DEPENDENCIES, which also sets up Tesseract/Poppler paths)"""
+    return OCR_AVAILABLE and DEPENDENCIES.wait()['ocr_libraries']
+
+# Column layout of Tesseract's TSV output (tesserocr omits the header line)
+TESSERACT_TSV_HEADER = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                        'left', 'top', 'width', 'height', 'conf', 'text')
+
+
+# Typed result schema, in output column order. Statuses are categoricals with fixed
+# categories (given as the tuple of categories), 'Match Pages' holds lists of 1-based
+# page numbers and 'PDF Seconds' the wall time spent on the row's PDF. Columns not
+# listed here are kept after these.
+PDF_STATUSES = ('Found', 'Not Found')
+PART_STATUSES = ('Yes', 'No', 'N/A', 'Timed Out', 'Cancelled')
+RESULT_SCHEMA = {
+    'Cablex P/N': 'string',
+    'FAIR Identifier': 'string',
+    'Part Number': 'string',
+    'Sheet': 'string',
+    'FAI Folder': 'string',
+    'Excel File': 'string',
+    'Excel Folder Name': 'string',
+    'PDF Status': PDF_STATUSES,
+    'PDF File': 'string',
+    'Part Number Found': PART_STATUSES,
+    'Highlighted PDF': 'string',
+    'Source Folder': 'string',
+    'Match Pages': 'object',
+    'PDF Seconds': 'float64',
+}
+
+
+def _page_list(value) -> List[int]:
+    """Match pages as a list of ints, also accepting the '1, 3' text form used in CSVs"""
+    if isinstance(value, str):
+        return [int(page) for page in re.findall(r'\d+', value)]
+    if value is None or (isinstance(value, float) and value != value):
+        return []
+    return [int(page) for page in value]
+
+
+def apply_result_schema(results: pd.DataFrame) -> pd.DataFrame:
+    """Return results with RESULT_SCHEMA's column order and dtypes"""
+    columns = list(RESULT_SCHEMA) + [column for column in results.columns if column not in RESULT_SCHEMA]
+    typed = results.reindex(columns=columns)
+    for column, dtype in RESULT_SCHEMA.items():
+        if column == 'Match Pages':
+            typed[column] = typed[column].map(_page_list).astype(object)
+        elif isinstance(dtype, tuple):
+            # Values outside the categories would silently become missing; keep them visible
+            unknown = set(typed[column].dropna().astype(str)) - set(dtype)
+            dtype = pd.CategoricalDtype(list(dtype) + sorted(unknown))
+            typed[column] = typed[column].astype(object).where(typed[column].notna(), None).astype(dtype)
+        elif dtype == 'string':
+            typed[column] = typed[column].astype(object).where(typed[column].notna(), None).astype('string')
+        else:
+            typed[column] = pd.to_numeric(typed[column], errors='coerce').astype(dtype)
+    return typed
+
+
+class ResultRow:
+    """One result row, with a slot per RESULT_SCHEMA column
+
+    process_directory carries rows in this form from the Excel table to the final
+    DataFrame, which results_from_rows builds column by column. A column that was
+    never set is missing, like an absent dict key; columns outside the schema go
+    into extra. Item access by column name (row['Part Number']) also works.
+    """
+
+    COLUMNS = {
+        'Cablex P/N': 'cablex_pn',
+        'FAIR Identifier': 'fair_id',
+        'Part Number': 'part_number',
+        'Sheet': 'sheet',
+        'FAI Folder': 'fai_folder',
+        'Excel File': 'excel_file',
+        'Excel Folder Name': 'excel_folder_name',
+        'PDF Status': 'pdf_status',
+        'PDF File': 'pdf_file',
+        'Part Number Found': 'part_found',
+        'Highlighted PDF': 'highlighted_pdf',
+        'Source Folder': 'source_folder',
+        'Match Pages': 'match_pages',
+        'PDF Seconds': 'pdf_seconds',
+    }
+    __slots__ = tuple(COLUMNS.values()) + ('extra',)
+
+    def __init__(self, **values):
+        for slot, value in values.items():
+            setattr(self, slot, value)
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'ResultRow':
+        row = cls()
+        for column, value in values.items():
+            row[column] = value
+        return row
+
+    def __getitem__(self, column: str):
+        slot = self.COLUMNS.get(column)
         try:
-            # Try reading all sheets
-            excel_file = pd.ExcelFile(excel_path)
-            all_data = []
+            return getattr(self, slot) if slot else self.extra[column]
+        except (AttributeError, KeyError):
+            raise KeyError(column) from None
+
+    def __setitem__(self, column: str, value):
+        slot = self.COLUMNS.get(column)
+        if slot:
+            setattr(self, slot, value)
+        else:
+            if getattr(self, 'extra', None) is None:
+                self.extra = {}
+            self.extra[column] = value
+
+    def get(self, column: str, default=None):
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def as_dict(self) -> Dict:
+        """The row as a plain dict of the columns that are set (for callbacks and the journal)"""
+        values = {column: getattr(self, slot) for column, slot in self.COLUMNS.items() if hasattr(self, slot)}
+        values.update(getattr(self, 'extra', None) or {})
+        return values
+
+
+def results_from_rows(rows: List[ResultRow]) -> pd.DataFrame:
+    """Typed results DataFrame of rows, built one column at a time"""
+    columns = {column: [getattr(row, slot, None) for row in rows] for column, slot in ResultRow.COLUMNS.items()}
+    extra_columns = []
+    for row in rows:
+        for column in getattr(row, 'extra', None) or ():
+            if column not in columns and column not in extra_columns:
+                extra_columns.append(column)
+    for column in extra_columns:
+        columns[column] = [row.get(column) for row in rows]
+    return apply_result_schema(pd.DataFrame(columns))
+
+
+def results_for_csv(results: pd.DataFrame) -> pd.DataFrame:
+    """Flatten the typed results for CSV: page lists become '1, 3'"""
+    flat = results.copy()
+    if 'Match Pages' in flat.columns:
+        flat['Match Pages'] = flat['Match Pages'].map(lambda pages: ', '.join(str(page) for page in _page_list(pages)))
+    return flat
+
+
+def total_memory_bytes() -> Optional[int]:
+    """Physical memory of this machine, or None if it cannot be determined"""
+    try:
+        if platform.system() == 'Windows':
+            import ctypes
             
-            for sheet_name in excel_file.sheet_names:
-                try:
-                    raw_sheet = pd.read_excel(
-                        excel_path,
-                        sheet_name=sheet_name,
-                        header=None,
-                        dtype=object
-                    )
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+            
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(status)
+            if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return None
+            return int(status.ullTotalPhys)
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except Exception:
+        return None
 
-                    table_df = self._extract_table_from_sheet(raw_sheet)
 
-                    if not table_df.empty:
-                        table_df['Sheet'] = sheet_name
-                        all_data.append(table_df)
-                    else:
-                        logger.debug(f"Required table not found in sheet {sheet_name}")
-                        
-                except Exception as e:
-                    logger.warning(f"Error reading sheet {sheet_name}: {e}")
+def peak_memory_bytes() -> Dict[str, Optional[int]]:
+    """Peak resident memory so far of this process and of its largest finished child (Tesseract/Poppler)"""
+    try:
+        if platform.system() == 'Windows':
+            import ctypes
             
-            if all_data:
-                return pd.concat(all_data, ignore_index=True)
-            else:
-                return pd.DataFrame()
-        except Exception as e:
-            logger.error(f"Error reading Excel file {excel_path}: {e}")
-            return pd.DataFrame()
-    
-    def find_matching_pdf(self, cablex_pn: str, fair_id: str, coc_folder: Path) -> Optional[Path]:
-        """Find matching PDF file based on Cablex P/N and FAIR Identifier"""
-        if not coc_folder.exists():
-            return None
-        
-        cablex_pn = str(cablex_pn).strip()
-        fair_id = str(fair_id).strip()
-        
-        # More flexible matching - just check if both identifiers are in the filename
-        for pdf_file in coc_folder.glob('*.pdf'):
-            filename = pdf_file.name.lower()
-            # Remove common separators for better matching
-            filename_clean = filename.replace('_', ' ').replace('-', ' ')
-            cablex_clean = cablex_pn.lower().replace('_', ' ').replace('-', ' ')
-            fair_clean = fair_id.lower().replace('_', ' ').replace('-', ' ')
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
             
-            # Check if both identifiers appear in the filename
-            if cablex_clean in filename_clean and fair_clean in filename_clean:
-                return pdf_file
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+            get_current_process.restype = ctypes.c_void_p
+            get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_memory_info.argtypes = [ctypes.c_void_p, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), ctypes.c_ulong]
+            if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+                return {'process': None, 'children': None}
+            return {'process': int(counters.PeakWorkingSetSize), 'children': None}
         
-        # Fallback to original strict pattern matching
-        for pdf_file in coc_folder.glob('*.pdf'):
-            filename = pdf_file.name
-            pattern = f"{cablex_pn}_{fair_id}_"
-            if filename.startswith(pattern):
-                return pdf_file
-        return None
+        import resource
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return {
+            'process': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+        }
+    except Exception:
+        return {'process': None, 'children': None}
+
+
+class PageTransform:
+    """Maps boxes on a preprocessed page image back onto the rendered page image
     
-    def check_pdf_has_text(self, pdf_path: Path) -> bool:
-        """Check if PDF has searchable text"""
-        try:
-            doc = fitz.open(str(pdf_path))
-            for page_num in range(min(3, len(doc))):  # Check first 3 pages
-                page = doc[page_num]
-                text = page.get_text()
-                if text and len(text.strip()) > 50:  # Has meaningful text
-                    doc.close()
-                    return True
-            doc.close()
-            return False
-        except Exception as e:
-            logger.error(f"Error checking PDF text in {pdf_path}: {e}")
-            return False
+    The preprocessed image is the rendered one (width x height) rotated counter-clockwise
+    by angle degrees on an expanded canvas of rotated_size, then cropped at (crop_x, crop_y).
+    """
     
-    def ocr_pdf_and_create_searchable(self, pdf_path: Path, doc: fitz.Document, search_term: str) -> Tuple[bool, List[Tuple[int, List[fitz.Rect]]]]:
-        """Perform OCR on PDF and create searchable text layer, returns (found, [(page_num, [match_rects])])"""
-        if not OCR_AVAILABLE:
-            logger.warning("OCR not available. Install pytesseract and pdf2image.")
-            return False, []
-        
+    def __init__(self, width: int, height: int, angle: float = 0.0,
+                 rotated_size: Optional[Tuple[int, int]] = None, crop_x: int = 0, crop_y: int = 0):
+        self.width = width
+        self.height = height
+        self.angle = angle
+        self.rotated_width, self.rotated_height = rotated_size or (width, height)
+        self.crop_x = crop_x
+        self.crop_y = crop_y
+    
+    def to_original(self, left: float, top: float, width: float, height: float) -> Tuple[float, float, float, float]:
+        """(left, top, width, height) on the preprocessed image as a box on the rendered image"""
+        x0, y0 = left + self.crop_x, top + self.crop_y
+        if not self.angle:
+            return x0, y0, width, height
+        cos, sin = math.cos(math.radians(self.angle)), math.sin(math.radians(self.angle))
+        xs, ys = [], []
+        for x, y in ((x0, y0), (x0 + width, y0), (x0, y0 + height), (x0 + width, y0 + height)):
+            dx, dy = x - self.rotated_width / 2, y - self.rotated_height / 2
+            xs.append(cos * dx - sin * dy + self.width / 2)
+            ys.append(sin * dx + cos * dy + self.height / 2)
+        return min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)
+
+
+def binarise_page(gray: np.ndarray, window: int, sensitivity: float = 0.15, block: int = 4) -> np.ndarray:
+    """Ink mask of a grayscale page by adaptive (Bradley) thresholding
+    
+    A pixel is ink when it is more than sensitivity darker than the mean of the window
+    around it. The local means are computed on block x block averages, so uneven
+    lighting and fax backgrounds are handled without a full-size integral image.
+    """
+    h, w = gray.shape
+    hb, wb = -(-h // block), -(-w // block)
+    padded = np.pad(gray, ((0, hb * block - h), (0, wb * block - w)), mode='edge')
+    blocks = padded.reshape(hb, block, wb, block).sum(axis=3, dtype=np.uint16).sum(axis=1, dtype=np.uint32)
+    blocks = blocks / (block * block)
+    
+    integral = np.zeros((hb + 1, wb + 1))
+    integral[1:, 1:] = blocks.cumsum(axis=0).cumsum(axis=1)
+    radius = max(1, window // (2 * block))
+    y0 = np.clip(np.arange(hb) - radius, 0, hb)
+    y1 = np.clip(np.arange(hb) + radius + 1, 0, hb)
+    x0 = np.clip(np.arange(wb) - radius, 0, wb)
+    x1 = np.clip(np.arange(wb) + radius + 1, 0, wb)
+    sums = (integral[np.ix_(y1, x1)] - integral[np.ix_(y0, x1)]
+            - integral[np.ix_(y1, x0)] + integral[np.ix_(y0, x0)])
+    local_mean = sums / ((y1 - y0)[:, None] * (x1 - x0)[None, :])
+    
+    threshold = (local_mean * (1 - sensitivity)).astype(np.float32)
+    threshold = np.repeat(np.repeat(threshold, block, axis=0), block, axis=1)[:h, :w]
+    return gray < threshold
+
+
+def estimate_skew(ink: np.ndarray, max_angle: float = 5.0, max_points: int = 20000) -> float:
+    """Rotation (degrees, counter-clockwise) that makes the text lines of an ink mask horizontal
+    
+    Ink pixels are projected onto the rows they would land on for each candidate angle;
+    level text lines give the sharpest row histogram (largest sum of squared counts).
+    A coarse 0.5 degree search is refined in 0.1 degree steps.
+    """
+    ys, xs = np.nonzero(ink)
+    if len(xs) < 100:
+        return 0.0
+    if len(xs) > max_points:
+        step = len(xs) // max_points
+        ys, xs = ys[::step], xs[::step]
+    h, w = ink.shape
+    dx = xs - w / 2
+    dy = ys - h / 2
+    
+    def sharpest(angles):
+        theta = np.radians(angles)[:, None]
+        rows = np.rint(dy * np.cos(theta) - dx * np.sin(theta)).astype(np.int64)
+        rows -= rows.min(axis=1, keepdims=True)
+        scores = [np.dot(counts, counts) for counts in (np.bincount(r).astype(np.float64) for r in rows)]
+        return float(angles[int(np.argmax(scores))])
+    
+    coarse = sharpest(np.arange(-max_angle, max_angle + 1e-9, 0.5))
+    return sharpest(np.arange(coarse - 0.5, coarse + 0.5 + 1e-9, 0.1))
+
+
+def preprocess_page_image(image, sensitivity: float = 0.15, max_skew: float = 5.0,
+                          min_skew: float = 0.2) -> Tuple[object, PageTransform]:
+    """Grayscale, binarise, deskew and crop a rendered page for OCR
+    
+    Returns a 1-bit PIL image (much smaller to hand to Tesseract than RGB) and the
+    PageTransform that maps OCR boxes on it back to the rendered image.
+    """
+    gray = np.asarray(image.convert('L'))
+    height, width = gray.shape
+    ink = binarise_page(gray, window=max(16, width // 16), sensitivity=sensitivity)
+    
+    # Every other pixel is plenty to find the angle of the text lines
+    angle = estimate_skew(ink[::2, ::2], max_skew)
+    rotated_size = None
+    if abs(angle) >= min_skew:
+        rotated = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8)).rotate(
+            angle, resample=Image.NEAREST, expand=True, fillcolor=255)
+        rotated_size = rotated.size
+        ink = np.asarray(rotated) < 128
+    else:
+        angle = 0.0
+    
+    # Crop the blank margins, ignoring rows/columns with only a few specks of ink
+    margin = max(8, width // 100)
+    rows = np.flatnonzero(np.count_nonzero(ink, axis=1) > 2)
+    cols = np.flatnonzero(np.count_nonzero(ink, axis=0) > 2)
+    crop_x = crop_y = 0
+    if len(rows) and len(cols):
+        crop_y, crop_x = max(0, rows[0] - margin), max(0, cols[0] - margin)
+        ink = ink[crop_y:rows[-1] + margin + 1, crop_x:cols[-1] + margin + 1]
+    
+    prepared = Image.fromarray(~ink)  # mode '1': white background, black ink
+    return prepared, PageTransform(width, height, angle, rotated_size, int(crop_x), int(crop_y))
+
+
+class StageTimings:
+    """Accumulates wall/CPU time and counters per processing stage
+
+    CPU time is measured with time.thread_time() so that stages timed from
+    worker threads are not polluted by other threads. Work done in child
+    processes (Tesseract, pdftoppm) only shows up as wall time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to the named stage"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+    def add_time(self, name: str, wall: float, cpu: float, calls: int = 1):
+        with self._lock:
+            entry = self.stages.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+            entry['calls'] += calls
+            entry['wall'] += wall
+            entry['cpu'] += cpu
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other: 'StageTimings'):
+        """Fold another set of timings (e.g. from one PDF) into this one"""
+        snapshot = other.to_dict()
+        for name, entry in snapshot['stages'].items():
+            self.add_time(name, entry['wall'], entry['cpu'], entry['calls'])
+        for name, amount in snapshot['counters'].items():
+            self.count(name, amount)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'stages': {name: dict(entry) for name, entry in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+
+class PDFProfiler:
+    """Profiles PDF tasks and keeps the profiles of those that take threshold seconds or more
+    
+    In 'cprofile' mode each task runs under its own cProfile.Profile and outliers are
+    dumped as .pstats files. Python 3.12+ allows only one cProfile at a time, so tasks
+    that cannot get one are sampled instead. In 'sampling' mode a background thread
+    records the stack of every running task each SAMPLE_INTERVAL; its overhead does not
+    grow with the number of calls, and outliers are written as collapsed stacks
+    (.folded, as read by flamegraph.pl and speedscope).
+    
+    With trace_memory, tracemalloc runs while the profiler does. The same thread keeps
+    the peak of traced Python memory while each task runs, and for tasks already past
+    the threshold takes a snapshot of the top allocation sites at their highest peak.
+    Both are process-wide, so they include PDFs processed at the same time, and memory
+    MuPDF or Tesseract allocate outside Python is not traced.
+    """
+    
+    MODES = ('cprofile', 'sampling')
+    SAMPLE_INTERVAL = 0.01
+    # Minimum time between two tracemalloc snapshots for the same task
+    SNAPSHOT_INTERVAL = 1.0
+    MAX_STACK_DEPTH = 100
+    
+    def __init__(self, threshold: float, output_dir: Path, mode: str = 'cprofile', trace_memory: bool = False,
+                 top_n: int = 15):
+        self.threshold = threshold
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.outliers = []
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._seq = 0
+        self._owns_tracemalloc = False
+    
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._thread = threading.Thread(target=self._monitor, daemon=True, name='pdf-profiler')
+        self._thread.start()
+    
+    def stop(self):
+        """Stop sampling; tasks still running past the threshold are written as unfinished"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        with self._lock:
+            leftover = list(self._active.values())
+            self._active = {}
+        for record in leftover:
+            wall = time.perf_counter() - record['started']
+            if wall >= self.threshold and record['samples']:
+                self._finish(record, wall, None, unfinished=True)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+    
+    @contextmanager
+    def profile(self, pdf_path: Path, part_number: str):
+        """Profile the enclosed block as one PDF task"""
+        record = {
+            'pdf': str(pdf_path),
+            'part_number': str(part_number),
+            'thread': threading.get_ident(),
+            'started': time.perf_counter(),
+            'sampled': self.mode == 'sampling',
+            # Frames above the caller (thread and pool plumbing) are left out of the samples;
+            # the stack here ends with the caller, contextlib's __enter__ and this generator
+            'skip': len(self._stack(sys._getframe())) - 3,
+            'samples': Counter(),
+            'traced_peak': 0,
+            'snapshot': None,
+            'snapshot_at': 0.0,
+        }
+        profiler = None
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is active (one at a time on Python 3.12+)
+                profiler = None
+                record['sampled'] = True
+        with self._lock:
+            self._active[record['thread']] = record
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            with self._lock:
+                self._active.pop(record['thread'], None)
+            wall = time.perf_counter() - record['started']
+            if wall >= self.threshold:
+                self._finish(record, wall, profiler)
+    
+    def _stack(self, frame) -> Tuple:
+        """(file, first line, function) of every frame, outermost first"""
+        stack = []
+        while frame is not None and len(stack) < self.MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+    
+    def _monitor(self):
+        while not self._stop.wait(self.SAMPLE_INTERVAL):
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for record in self._active.values():
+                    frame = frames.get(record['thread'])
+                    if record['sampled'] and frame is not None:
+                        record['samples'][self._stack(frame)[record['skip']:]] += 1
+                if self.trace_memory and tracemalloc.is_tracing():
+                    self._track_memory()
+    
+    def _track_memory(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        now = time.perf_counter()
+        snapshot = None
+        for record in self._active.values():
+            if peak <= record['traced_peak']:
+                continue
+            record['traced_peak'] = peak
+            if now - record['started'] >= self.threshold and now - record['snapshot_at'] >= self.SNAPSHOT_INTERVAL:
+                # One snapshot serves every outlier that peaks in this interval
+                snapshot = snapshot or tracemalloc.take_snapshot()
+                record['snapshot'] = snapshot
+                record['snapshot_at'] = now
+    
+    @staticmethod
+    def _label(function: Tuple) -> str:
+        filename, line, name = function
+        return f"{name} ({Path(filename).name}:{line})"
+    
+    def _finish(self, record: Dict, wall: float, profiler: Optional[cProfile.Profile], unfinished: bool = False):
+        """Write an outlier's profile and add its summary to outliers"""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{seq:03d}_{Path(record['pdf']).stem[:60]}"
+        entry = {
+            'pdf': record['pdf'],
+            'part_number': record['part_number'],
+            'wall': wall,
+            'mode': 'cprofile' if profiler else 'sampling',
+        }
+        if unfinished:
+            entry['unfinished'] = True
+        
+        if profiler:
+            path = self.output_dir / f"{stem}.pstats"
+            profiler.dump_stats(str(path))
+            stats = pstats.Stats(profiler).stats
+            top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top_n]
+            entry['top'] = [
+                {'function': self._label(function), 'calls': calls, 'self_seconds': round(own, 4),
+                 'cumulative_seconds': round(cumulative, 4)}
+                for function, (_, calls, own, cumulative, _) in top
+            ]
+        else:
+            path = self.output_dir / f"{stem}.folded"
+            samples = record['samples']
+            total = sum(samples.values()) or 1
+            own = Counter()
+            inclusive = Counter()
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in samples.most_common():
+                    f.write(';'.join(self._label(function) for function in stack) + f" {count}\n")
+                    own[stack[-1]] += count
+                    for function in set(stack):
+                        inclusive[function] += count
+            # Samples are spread over the task's wall time, whatever interval was achieved
+            seconds = wall / total
+            entry['samples'] = total
+            entry['top'] = [
+                {'function': self._label(function), 'self_seconds': round(own[function] * seconds, 4),
+                 'cumulative_seconds': round(count * seconds, 4)}
+                for function, count in inclusive.most_common(self.top_n)
+            ]
+        entry['profile'] = str(path)
+        
+        if self.trace_memory:
+            entry['traced_peak_mb'] = round(record['traced_peak'] / 2**20, 1)
+            if record['snapshot'] is not None:
+                entry['top_allocations'] = [
+                    {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                     'size_mb': round(stat.size / 2**20, 2), 'count': stat.count}
+                    for stat in record['snapshot'].statistics('lineno')[:self.top_n]
+                ]
+        with self._lock:
+            self.outliers.append(entry)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a PDF task when the run is stopped by the user"""
+
+
+class TaskTimedOut(TaskCancelled):
+    """Raised inside a PDF task when its time budget is used up"""
+
+
+class PDFTask:
+    """A row's PDF as scheduled by _run_pdf_tasks
+
+    content_hash, cost and duplicates (the tasks that reuse this one's result) are
+    filled in by the scheduler.
+    """
+
+    __slots__ = ('pdf_path', 'part_number', 'source_folder', 'result_index', 'journal_key', 'content_hash',
+                 'cost', 'duplicates')
+
+    def __init__(self, pdf_path: Path, part_number: str, source_folder: Optional[str], result_index: int,
+                 journal_key: Optional[str] = None):
+        self.pdf_path = pdf_path
+        self.part_number = part_number
+        self.source_folder = source_folder
+        self.result_index = result_index
+        self.journal_key = journal_key
+        self.content_hash = None
+        self.cost = None
+        self.duplicates = []
+
+
+class TaskBudget:
+    """Per-PDF time budget plus the run-wide stop event
+
+    Long-running steps call check() between pages (and while waiting on
+    Tesseract/Poppler subprocesses) so that a stopped run or an overlong PDF
+    is abandoned promptly instead of running to completion.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, stop_event: Optional[threading.Event] = None):
+        self.timeout = timeout
+        self.stop_event = stop_event
+        self.started = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        if not self.timeout:
+            return None
+        return self.timeout - (time.monotonic() - self.started)
+
+    def expired(self, grace: float = 0.0) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining < -grace
+
+    def check(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise TaskCancelled("Processing stopped by user")
+        if self.expired():
+            raise TaskTimedOut(f"Time budget of {self.timeout:.0f}s exceeded")
+
+
+class WordIndex:
+    """Words of a document's text layer, extracted once with get_text("words"), for term lookup
+    
+    Each text line is kept as the concatenation of its words' letters and digits in lower
+    case, with the offset each word starts at. Terms are normalised the same way, so
+    '127K-667', '127K 667' and '127k667' all find each other without touching the pages
+    again, however many part numbers are looked up.
+    
+    A match may only run from one word into the next where the term itself has a
+    separator, and only if the words are set close together (not in different columns),
+    so 'Qty 1 27K-667' does not contain '127K-667' and 'Rev A 123' does not contain 'A123'.
+    """
+    
+    # Everything that is not a letter or digit (including '_') is a separator
+    SEPARATORS = re.compile(r'[\W_]+')
+    # Adjacent words further apart than this many word heights are not read as one term
+    MAX_WORD_GAP = 1.0
+    
+    def __init__(self, doc: fitz.Document, budget: Optional[TaskBudget] = None):
+        # Per page: [(normalised line text, word start offsets, offsets where a word
+        # boundary may be bridged, [(x0, y0, x1, y1, word)])]
+        self.pages = []
+        for page in doc:
+            if budget:
+                budget.check()
+            self.pages.append(self._index_page(page))
+    
+    @classmethod
+    def normalise(cls, text: str) -> str:
+        """Letters and digits of text in lower case"""
+        return cls.SEPARATORS.sub('', text).lower()
+    
+    @classmethod
+    def _term_breaks(cls, text: str) -> Set[int]:
+        """Offsets in the normalised term where the original term has a separator"""
+        breaks = set()
+        offset = 0
+        for part in cls.SEPARATORS.split(text):
+            offset += len(part)
+            breaks.add(offset)
+        return breaks
+    
+    @classmethod
+    def _index_page(cls, page: fitz.Page) -> List[Tuple[str, List[int], Set[int], List[Tuple]]]:
+        lines = {}
+        for x0, y0, x1, y1, word, block_no, line_no, _ in page.get_text("words"):
+            lines.setdefault((block_no, line_no), []).append((x0, y0, x1, y1, word))
+        indexed = []
+        separators = cls.SEPARATORS
+        for words in lines.values():
+            parts = [separators.sub('', word[4]).lower() for word in words]
+            starts = []
+            # A boundary is bridgeable only if every gap at that offset is narrow (a word
+            # made only of separators, like a lone '-', adds a second gap at the same offset)
+            bridges = {}
+            offset = 0
+            previous = None
+            for word, part in zip(words, parts):
+                starts.append(offset)
+                if previous is not None:
+                    gap = word[0] - previous[2]
+                    height = max(word[3] - word[1], previous[3] - previous[1])
+                    bridges[offset] = bridges.get(offset, True) and gap <= cls.MAX_WORD_GAP * height
+                previous = word
+                offset += len(part)
+            if offset:
+                indexed.append((''.join(parts), starts, {o for o, ok in bridges.items() if ok}, words))
+        return indexed
+    
+    @classmethod
+    def _span_rect(cls, word: Tuple, first: int, last: int) -> fitz.Rect:
+        """Rect of the normalised characters first..last-1 of a word, interpolated along the word"""
+        x0, y0, x1, y1, text = word
+        raw = [i for i, ch in enumerate(text) if not cls.SEPARATORS.match(ch) for _ in ch.lower()]
+        if (first, last) == (0, len(raw)) or x1 - x0 < y1 - y0:
+            # Whole word, or vertical text where interpolating along x makes no sense
+            return fitz.Rect(x0, y0, x1, y1)
+        width = (x1 - x0) / len(text)
+        return fitz.Rect(x0 + raw[first] * width, y0, x0 + (raw[last - 1] + 1) * width, y1)
+    
+    def search(self, term: str) -> Dict[int, List[fitz.Rect]]:
+        """{0-based page number: [rects]} of every occurrence of term, ignoring case and separators"""
+        term = str(term)
+        needle = self.normalise(term)
+        hits = {}
+        if not needle:
+            return hits
+        term_breaks = self._term_breaks(term)
+        for page_num, lines in enumerate(self.pages):
+            for text, starts, bridges, words in lines:
+                start = text.find(needle)
+                while start != -1:
+                    end = start + len(needle)
+                    first_word = bisect.bisect_right(starts, start) - 1
+                    last_word = bisect.bisect_left(starts, end)
+                    # Every word boundary inside the match must be bridgeable and fall where
+                    # the term has a separator
+                    if any(starts[index] > start and (starts[index] not in bridges
+                                                     or starts[index] - start not in term_breaks)
+                           for index in range(first_word + 1, last_word)):
+                        start = text.find(needle, start + 1)
+                        continue
+                    for index in range(first_word, last_word):
+                        word_start = starts[index]
+                        word_end = starts[index + 1] if index + 1 < len(starts) else len(text)
+                        if word_end <= start:
+                            continue  # Word without letters or digits
+                        hits.setdefault(page_num, []).append(self._span_rect(
+                            words[index], max(start, word_start) - word_start, min(end, word_end) - word_start))
+                    start = text.find(needle, end)
+        return hits
+
+
+class OCRCache:
+    """OCR words and word indexes by PDF content hash, for searches of the same content
+    
+    A run's own cache (no max_contents) only keeps the contents passed to reset(), the
+    ones its planner knows are searched more than once. A shared cache (max_contents
+    set, like the job server's) keeps every content it is given across runs and drops
+    the least recently used ones beyond max_contents.
+    """
+    
+    def __init__(self, max_contents: Optional[int] = None):
+        self.max_contents = max_contents
+        self.hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def shared(self) -> bool:
+        return self.max_contents is not None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def reset(self, contents=()):
+        """Drop everything and keep only contents from now on (a run's own cache)"""
+        with self._lock:
+            self._entries = OrderedDict((content, {}) for content in contents)
+    
+    def release(self, content: str):
+        with self._lock:
+            self._entries.pop(content, None)
+    
+    def get_many(self, content: str, keys) -> Dict:
+        """Cached values of content for those of keys that are present"""
+        with self._lock:
+            entry = self._entries.get(content)
+            if not entry:
+                return {}
+            if self.shared:
+                self._entries.move_to_end(content)
+            found = {key: entry[key] for key in keys if key in entry}
+            self.hits += len(found)
+            return found
+    
+    def get(self, content: str, key):
+        return self.get_many(content, (key,)).get(key)
+    
+    def put_many(self, content: str, values: Dict):
+        with self._lock:
+            entry = self._entries.get(content)
+            if entry is None:
+                if not self.shared:
+                    return
+                entry = self._entries[content] = {}
+                while len(self._entries) > self.max_contents:
+                    self._entries.popitem(last=False)
+            entry.update(values)
+    
+    def put(self, content: str, key, value):
+        self.put_many(content, {key: value})
+
+
+class JournalInUse(RuntimeError):
+    """Raised when another run already holds the run journal"""
+
+
+class RunJournal:
+    """Append-only JSONL journal of finished result rows, so an interrupted run can resume
+    
+    Every record is written and flushed as soon as it is appended; fsync is batched
+    to every FSYNC_EVERY records or FSYNC_SECONDS, whichever comes first, so at most
+    that much work is lost if the machine goes down. A line cut short by a crash is
+    ignored when the journal is read back.
+    
+    The journal is held with an exclusive lock on a .lock file next to it until it is
+    closed, so a second run over the same journal fails with JournalInUse instead of
+    truncating or interleaving with the first. The operating system drops the lock when
+    the process dies, so a crashed run never leaves the journal locked.
+    """
+    
+    FSYNC_EVERY = 50
+    FSYNC_SECONDS = 2.0
+    
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Locked before the journal is touched; the journal itself stays unlocked so it
+        # can be read back while the run appends to it
+        self._lock_file = self._acquire_lock()
+        try:
+            # A fresh run starts a new journal; resuming keeps appending to the old one
+            self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        except OSError:
+            self._release_lock(self._lock_file)
+            raise
+    
+    @staticmethod
+    def lock_path(path: Path) -> Path:
+        """The lock file that guards the journal at path"""
+        return Path(path).with_name(Path(path).name + '.lock')
+    
+    def _acquire_lock(self):
+        lock_file = open(self.lock_path(self.path), 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise JournalInUse(f"The run journal {self.path} is in use by another run")
+        return lock_file
+    
+    @staticmethod
+    def _release_lock(lock_file):
+        # The lock file is left in place: removing it could let a run that opened it
+        # meanwhile lock a file nobody else sees
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        lock_file.close()
+    
+    def append(self, record: Dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.FSYNC_EVERY or time.monotonic() - self._last_sync >= self.FSYNC_SECONDS:
+                self._sync()
+    
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._sync()
+                self._file.close()
+            finally:
+                self._release_lock(self._lock_file)
+    
+    @staticmethod
+    def load(path: Path) -> List[Dict]:
+        """All complete records of a journal (empty if it does not exist)"""
+        records = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # Partial line from an interrupted write
+        except FileNotFoundError:
+            pass
+        return records
+
+
+class ResultsStore:
+    """SQLite history of runs, their result rows and per-PDF timings
+    
+    One database collects every run over an archive, so "when did this part number
+    last verify?" is a query instead of a search through old CSVs. Each run is
+    written in a single transaction.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            finished_at TEXT NOT NULL,
+            base_path TEXT,
+            wall_seconds REAL,
+            options TEXT,
+            stats TEXT
+        );
+        CREATE TABLE IF NOT EXISTS rows (
+            id INTEGER PRIMARY KEY,
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            fai_folder TEXT,
+            excel_file TEXT,
+            cablex_pn TEXT,
+            fair_identifier TEXT,
+            part_number TEXT,
+            pdf_status TEXT,
+            pdf_file TEXT,
+            part_found TEXT,
+            highlighted_pdf TEXT,
+            match_pages TEXT
+        );
+        CREATE TABLE IF NOT EXISTS pdf_timings (
+            id INTEGER PRIMARY KEY,
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            pdf TEXT,
+            part_number TEXT,
+            found INTEGER,
+            status TEXT,
+            wall_seconds REAL,
+            pages INTEGER,
+            match_pages TEXT,
+            stages TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_rows_part_number ON rows(part_number);
+        CREATE INDEX IF NOT EXISTS idx_rows_fair_identifier ON rows(fair_identifier);
+        CREATE INDEX IF NOT EXISTS idx_rows_cablex_pn ON rows(cablex_pn);
+        CREATE INDEX IF NOT EXISTS idx_pdf_timings_run ON pdf_timings(run_id);
+    """
+    
+    # Result row column -> rows table column
+    ROW_COLUMNS = {
+        'FAI Folder': 'fai_folder',
+        'Excel File': 'excel_file',
+        'Cablex P/N': 'cablex_pn',
+        'FAIR Identifier': 'fair_identifier',
+        'Part Number': 'part_number',
+        'PDF Status': 'pdf_status',
+        'PDF File': 'pdf_file',
+        'Part Number Found': 'part_found',
+        'Highlighted PDF': 'highlighted_pdf',
+        'Match Pages': 'match_pages',
+    }
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        with closing(self._connect()) as conn:
+            conn.executescript(self.SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+    
+    def record_run(self, report: Dict, results: pd.DataFrame) -> int:
+        """Insert one run with all its rows and per-PDF timings; returns the run id"""
+        columns = list(self.ROW_COLUMNS.values())
+        if results.empty:
+            row_values = []
+        else:
+            table = results.reindex(columns=list(self.ROW_COLUMNS)).astype(object)
+            table = table.where(table.notna(), None)
+            if 'Match Pages' in results.columns:
+                table['Match Pages'] = results_for_csv(results)['Match Pages']
+            row_values = [tuple(None if value is None else str(value) for value in row)
+                          for row in table.itertuples(index=False, name=None)]
+        
+        pdf_values = [
+            (entry.get('pdf'), entry.get('part_number'), int(bool(entry.get('found'))), entry.get('status'),
+             entry.get('wall'), entry.get('counters', {}).get('pages'),
+             ', '.join(str(page) for page in entry.get('match_pages', [])),
+             json.dumps(entry.get('stages', {})))
+            for entry in report.get('pdfs', [])
+        ]
+        
+        with closing(self._connect()) as conn:
+            with conn:  # One transaction for the whole run
+                cursor = conn.execute(
+                    "INSERT INTO runs (finished_at, base_path, wall_seconds, options, stats) VALUES (?, ?, ?, ?, ?)",
+                    (report.get('finished_at') or datetime.now().isoformat(timespec='seconds'),
+                     report.get('base_path'), report.get('wall_seconds'),
+                     json.dumps(report.get('options', {})), json.dumps(report.get('stats', {})))
+                )
+                run_id = cursor.lastrowid
+                conn.executemany(
+                    f"INSERT INTO rows (run_id, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))})",
+                    [(run_id,) + values for values in row_values]
+                )
+                conn.executemany(
+                    "INSERT INTO pdf_timings (run_id, pdf, part_number, found, status, wall_seconds, pages, "
+                    "match_pages, stages) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id,) + values for values in pdf_values]
+                )
+        return run_id
+    
+    def query(self, part_number: Optional[str] = None, fair_identifier: Optional[str] = None,
+              cablex_pn: Optional[str] = None, contains: Optional[str] = None, found_only: bool = False,
+              since: Optional[str] = None, limit: int = 500) -> pd.DataFrame:
+        """Result rows across all runs, newest first
+        
+        part_number, fair_identifier and cablex_pn match exactly (indexed); contains is a
+        case-insensitive substring match on any of the three. since is an ISO date/time.
+        """
+        conditions = []
+        params = []
+        for column, value in (('part_number', part_number), ('fair_identifier', fair_identifier),
+                              ('cablex_pn', cablex_pn)):
+            if value:
+                conditions.append(f"r.{column} = ?")
+                params.append(str(value).strip())
+        if contains:
+            conditions.append("(r.part_number LIKE ? OR r.fair_identifier LIKE ? OR r.cablex_pn LIKE ?)")
+            params.extend([f"%{contains.strip()}%"] * 3)
+        if found_only:
+            conditions.append("r.part_found = 'Yes'")
+        if since:
+            conditions.append("runs.finished_at >= ?")
+            params.append(since)
+        
+        sql = ("SELECT runs.finished_at AS run_finished, r.run_id, r.fai_folder, r.excel_file, r.cablex_pn, "
+               "r.fair_identifier, r.part_number, r.pdf_status, r.pdf_file, r.part_found, r.highlighted_pdf, "
+               "r.match_pages FROM rows r JOIN runs ON runs.id = r.run_id")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY runs.finished_at DESC, r.run_id DESC, r.id LIMIT ?"
+        params.append(int(limit))
+        
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+    
+    def last_verified(self, part_number: str) -> Optional[Dict]:
+        """The most recent row where part_number was found and highlighted, or None"""
+        found = self.query(part_number=part_number, found_only=True, limit=1)
+        return None if found.empty else found.iloc[0].to_dict()
+    
+    def runs(self, limit: int = 50) -> pd.DataFrame:
+        """Recorded runs, newest first"""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT id, finished_at, base_path, wall_seconds, stats FROM runs ORDER BY id DESC LIMIT ?",
+                conn, params=[int(limit)]
+            )
+
+
+class WorkQueue:
+    """SQLite lease queue of folder-pair work units for spreading one run over several hosts
+    
+    A coordinator creates one unit per folder pair (PDFExcelProcessor.create_work_queue)
+    and QueueWorkers claim them, biggest first. A claimed unit is leased to its worker
+    for lease_seconds and the worker keeps renewing the lease while it works; if the
+    worker dies, the lease runs out and another worker claims the unit again, up to
+    MAX_ATTEMPTS times. A finished unit holds its result rows and run report until the
+    coordinator merges them (collect_work_queue).
+    
+    Every change is one short transaction, so the queue file can sit on a share that
+    all hosts mount, as long as the share supports file locking. Paths are stored
+    relative to the base folder, so hosts may mount it in different places.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queue_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS units (
+            id INTEGER PRIMARY KEY,
+            excel_folder TEXT,
+            coc_folder TEXT NOT NULL,
+            identifier TEXT,
+            weight INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            rows TEXT,
+            report TEXT,
+            error TEXT,
+            finished_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_units_state ON units(state);
+    """
+    
+    STATES = ('pending', 'leased', 'done', 'failed')
+    LEASE_SECONDS = 120
+    MAX_ATTEMPTS = 3
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        with closing(self._connect()) as conn:
+            conn.executescript(self.SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+    
+    @contextmanager
+    def _transaction(self):
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def create(self, base_path: Path, options: Dict, folder_pairs: List[Tuple[Optional[Path], Path, str]]) -> int:
+        """Replace the queue's contents with one unit per folder pair; returns the number of units"""
+        base_path = Path(base_path)
+        
+        def relative(path: Optional[Path]) -> Optional[str]:
+            return path.relative_to(base_path).as_posix() if path else None
+        
+        units = []
+        for excel_folder, coc_folder, identifier in folder_pairs:
+            # Bytes of CoC PDFs stand in for the unit's cost, so the biggest units start first
+            weight = sum(pdf.stat().st_size for pdf in coc_folder.glob('*.pdf')) if excel_folder else 0
+            units.append((relative(excel_folder), relative(coc_folder), identifier, weight))
+        meta = {
+            'base_path': str(base_path),
+            'options': json.dumps(options),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'created_ts': repr(time.time()),
+        }
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM units")
+            conn.execute("DELETE FROM queue_meta")
+            conn.executemany("INSERT INTO queue_meta (key, value) VALUES (?, ?)", list(meta.items()))
+            conn.executemany("INSERT INTO units (excel_folder, coc_folder, identifier, weight) VALUES (?, ?, ?, ?)",
+                             units)
+        return len(units)
+    
+    def meta(self) -> Dict:
+        """base_path, options and creation time of the queue"""
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM queue_meta").fetchall())
+        if 'options' in meta:
+            meta['options'] = json.loads(meta['options'])
+        return meta
+    
+    def claim(self, worker: str, lease_seconds: float = LEASE_SECONDS) -> Optional[Dict]:
+        """Lease the biggest pending (or abandoned) unit to worker; None when there is none"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("UPDATE units SET state = 'failed', error = 'Lease expired on the last attempt' "
+                         "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, self.MAX_ATTEMPTS))
+            row = conn.execute(
+                "SELECT id, excel_folder, coc_folder, identifier, attempts FROM units "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY weight DESC, id LIMIT 1", (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE units SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                         "WHERE id = ?", (worker, now + lease_seconds, row[0]))
+        return {'id': row[0], 'excel_folder': row[1], 'coc_folder': row[2], 'identifier': row[3],
+                'attempt': row[4] + 1}
+    
+    def renew(self, unit_id: int, worker: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        """Extend worker's lease; False if the unit is no longer leased to it"""
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE units SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                                  (time.time() + lease_seconds, unit_id, worker))
+        return cursor.rowcount == 1
+    
+    def complete(self, unit_id: int, worker: str, rows: List[Dict], report: Dict) -> bool:
+        """Store a finished unit's results; False (and nothing stored) if the lease was lost"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE units SET state = 'done', rows = ?, report = ?, finished_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (json.dumps(rows, default=str), json.dumps(report, default=str),
+                 datetime.now().isoformat(timespec='seconds'), unit_id, worker)
+            )
+        return cursor.rowcount == 1
+    
+    def fail(self, unit_id: int, worker: str, error: str):
+        """Give a unit back after an error; it fails for good after MAX_ATTEMPTS"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE units SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_expires = NULL WHERE id = ? AND worker = ? AND state = 'leased'",
+                (self.MAX_ATTEMPTS, error, unit_id, worker)
+            )
+    
+    def release(self, unit_id: int, worker: str):
+        """Give a unit back unfinished (worker stopping) without using up an attempt"""
+        with self._transaction() as conn:
+            conn.execute("UPDATE units SET state = 'pending', attempts = attempts - 1, lease_expires = NULL "
+                         "WHERE id = ? AND worker = ? AND state = 'leased'", (unit_id, worker))
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of units per state"""
+        with closing(self._connect()) as conn:
+            found = dict(conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+        return {state: found.get(state, 0) for state in self.STATES}
+    
+    def units(self) -> List[Dict]:
+        """All units in discovery order, with rows and report decoded"""
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            units = [dict(row) for row in conn.execute("SELECT * FROM units ORDER BY id")]
+        for unit in units:
+            unit['rows'] = json.loads(unit['rows']) if unit['rows'] else []
+            unit['report'] = json.loads(unit['report']) if unit['report'] else {}
+        return units
+
+
+class PDFExcelProcessor:
+    """Main processor class for handling FAI Excel sheets and Material CoC PDFs"""
+    
+    # OCR resolution: fixed mode uses OCR_DPI, adaptive mode starts at OCR_LOW_DPI
+    # and escalates to OCR_HIGH_DPI only for pages that need it. When the term was
+    # not found anywhere only the OCR_ESCALATE_MAX_PAGES least confident pages are
+    # re-read, so a PDF without the term does not pay for a full 300 DPI pass
+    OCR_DPI = 200
+    OCR_LOW_DPI = 150
+    OCR_HIGH_DPI = 300
+    OCR_MIN_CONFIDENCE = 60
+    OCR_ESCALATE_MAX_PAGES = 1
+    
+    # Pages rasterised per pdftoppm call; cancellation is checked between chunks
+    RENDER_CHUNK_PAGES = 8
+    # How often blocked subprocess waits wake up to check for cancellation
+    CANCEL_POLL_SECONDS = 0.2
+    # Extra time a worker gets to notice its deadline before it is abandoned
+    TIMEOUT_GRACE_SECONDS = 15
+    
+    # OCR engines: 'batch' runs one Tesseract process per chunk of pages, 'per-page' one
+    # per page image, 'tesserocr' a warm in-process engine; 'auto' prefers tesserocr
+    OCR_BACKENDS = ('auto', 'batch', 'per-page', 'tesserocr')
+    
+    # Named Tesseract settings. 'default' is Tesseract's own configuration (full layout
+    # analysis, default engine). 'fast-sparse' looks for scattered tokens only (PSM 11),
+    # runs the LSTM engine without the legacy one and only knows the characters part
+    # numbers are made of. 'accurate' keeps full layout analysis with the LSTM engine
+    # and reads every page at OCR_HIGH_DPI straight away.
+    PART_NUMBER_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-/._'
+    OCR_PROFILES = {
+        'default': {},
+        'fast-sparse': {'psm': 11, 'oem': 1, 'whitelist': PART_NUMBER_CHARS},
+        'accurate': {'psm': 3, 'oem': 1, 'dpi': 300},
+    }
+    
+    # Rough cost model (seconds on a typical workstation) used to schedule the
+    # most expensive PDFs first and to estimate the time left
+    COST_BASE_SECONDS = 0.05
+    COST_TEXT_PAGE_SECONDS = 0.01
+    COST_OCR_PAGE_SECONDS = 1.5
+    COST_SECONDS_PER_MB = 0.02
+    
+    # Memory model for admission control: a worker holds the open document plus, when
+    # it OCRs, one chunk of rendered RGB pages at the highest DPI it may use and a
+    # Tesseract process. Without a configured budget, half the physical RAM is used.
+    MEMORY_BASE_MB = 30
+    MEMORY_DOC_FACTOR = 2
+    MEMORY_BYTES_PER_PIXEL = 3
+    MEMORY_OCR_OVERHEAD_MB = 150
+    MEMORY_DEFAULT_FRACTION = 0.5
+    MEMORY_FALLBACK_BUDGET_MB = 4096
+    
+    # Journal of finished rows in the base folder, used to resume interrupted runs
+    JOURNAL_NAME = 'processing_journal.jsonl'
+    # Default name of the optional SQLite history (ResultsStore) in the base folder
+    HISTORY_DB_NAME = 'processing_history.sqlite'
+    # Profiles of slow PDFs, one subfolder per run (profile_threshold)
+    PROFILE_DIR_NAME = 'profiles'
+    PROFILE_TOP_N = 15
+    
+    # Text that ends a FAI table: the form's footer rows (matched lower-case, anywhere in the row)
+    TABLE_FOOTER_MARKERS = (
+        'does fair contain',
+        'fair verified',
+        'fair reviewed',
+        'customer approval',
+        'comments:',
+    )
+    
+    # Parsed workbook tables are cached column-wise in the base folder, one file per workbook
+    # content hash. A cache file only counts if it was written by the same extractor_version(),
+    # which changes with the extraction code, the footer markers and the pandas version.
+    EXCEL_CACHE_NAME = '.excel_table_cache'
+    
+    # Columnar export formats and their file extensions
+    COLUMNAR_SUFFIXES = {'parquet': '.parquet', 'arrow': '.arrow'}
+    
+    # Read size when hashing file contents (copies of a certificate, cached workbooks)
+    CONTENT_HASH_CHUNK_BYTES = 1 << 20
+    
+    # Sidecar output mode: matches are written to <highlighted name>.matches.json and
+    # the highlighted PDF itself is only created on demand (materialise_highlighted)
+    SIDECAR_SUFFIX = '.matches.json'
+    SIDECAR_VERSION = 1
+    
+    # Constructor options that describe how a run is done (everything but paths and caches)
+    OPTION_NAMES = ('force_ocr', 'separate_output', 'destructive', 'adaptive_ocr', 'pdf_timeout', 'ocr_backend',
+                    'memory_budget_mb', 'sidecar_output', 'preprocess_ocr', 'ocr_profile', 'profile_threshold',
+                    'profile_mode', 'profile_memory')
+    
+    def __init__(self, base_path: str, force_ocr: bool = True, separate_output: bool = True, destructive: bool = False,
+                 adaptive_ocr: bool = True, pdf_timeout: Optional[float] = 300, ocr_backend: str = 'auto',
+                 memory_budget_mb: Optional[float] = None, results_db: Optional[str] = None,
+                 sidecar_output: bool = False, preprocess_ocr: bool = False, ocr_profile: str = 'default',
+                 ocr_cache: Optional[OCRCache] = None, profile_threshold: Optional[float] = None,
+                 profile_mode: str = 'cprofile', profile_memory: bool = False, profile_dir: Optional[str] = None,
+                 excel_cache: bool = True):
+        self.base_path = Path(base_path)
+        self.results_df = pd.DataFrame()
+        self.processed_pdfs = []
+        self.force_ocr = force_ocr
+        self.separate_output = separate_output
+        self.destructive = destructive
+        # Sidecars describe changes to a copy, so they are never used when editing in place
+        self.sidecar_output = sidecar_output and not destructive
+        self.adaptive_ocr = adaptive_ocr
+        # Clean up rendered pages (preprocess_page_image) before they are handed to Tesseract
+        self.preprocess_ocr = preprocess_ocr
+        self.pdf_timeout = pdf_timeout
+        if ocr_backend not in self.OCR_BACKENDS:
+            raise ValueError(f"Unknown OCR backend '{ocr_backend}'. Choose from: {', '.join(self.OCR_BACKENDS)}")
+        self.ocr_backend = ocr_backend
+        if ocr_profile not in self.OCR_PROFILES:
+            raise ValueError(f"Unknown OCR profile '{ocr_profile}'. Choose from: {', '.join(self.OCR_PROFILES)}")
+        self.ocr_profile = ocr_profile
+        # Profiling mode: PDFs taking profile_threshold seconds or more get their profile saved
+        if profile_mode not in PDFProfiler.MODES:
+            raise ValueError(f"Unknown profile mode '{profile_mode}'. Choose from: {', '.join(PDFProfiler.MODES)}")
+        self.profile_threshold = profile_threshold
+        self.profile_mode = profile_mode
+        self.profile_memory = profile_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else self.base_path / self.PROFILE_DIR_NAME
+        self.profile_reports = []
+        self.memory_budget_mb = memory_budget_mb
+        self.journal_path = self.base_path / self.JOURNAL_NAME
+        # Parsed Excel tables by workbook content hash (None disables the cache)
+        self.excel_cache_dir = self.base_path / self.EXCEL_CACHE_NAME if excel_cache else None
+        self.results_db = Path(results_db) if results_db else None
+        self._tesserocr_local = threading.local()
+        # OCR words of PDFs whose content appears more than once in the run, by content hash;
+        # a shared OCRCache (e.g. the job server's) also keeps them for later runs
+        self._ocr_cache = ocr_cache if ocr_cache is not None else OCRCache()
+        # Long-lived thread pool shared by successive runs (open_worker_pool), e.g. in watch mode
+        self._worker_pool = None
+        self.output_folder = None
+        
+        # Create output folder if needed (only if not destructive and separate output is enabled)
+        if self.separate_output and not self.destructive:
+            self.output_folder = self.base_path / "highlighted_pdfs"
+            self.output_folder.mkdir(exist_ok=True)
+        
+        # Track folder structure for organizing outputs
+        self.folder_map = {}
+        
+        # Per-stage instrumentation for the current run
+        self.run_timings = StageTimings()
+        self.pdf_reports = []
+        self.run_report = {}
+        self.schedule_report = {}
+        self._report_lock = threading.Lock()
+        
+    @staticmethod
+    def _clean_cell(value) -> str:
+        """Normalize cell contents by stripping whitespace and collapsing newlines"""
+        if pd.isna(value):
+            return ''
+        text = str(value).replace('\n', ' ')
+        text = re.sub(r'\s+', ' ', text)
+        return text.strip()
+
+    def _extract_table_from_sheet(self, sheet_df: pd.DataFrame) -> pd.DataFrame:
+        """Locate and extract the Cablex/FAIR/Part Number table from a messy worksheet"""
+        if sheet_df.empty:
+            return pd.DataFrame()
+
+        normalized = sheet_df.map(self._clean_cell)
+
+        header_row_idx = None
+        header_candidates = {}
+
+        for idx, row in normalized.iterrows():
+            row_lower = [cell.lower() for cell in row if cell]
+            if not row_lower:
+                continue
+
+            has_cablex = any('cablex' in cell and 'p/n' in cell for cell in row_lower)
+            has_fair = any('fair' in cell and 'identifier' in cell for cell in row_lower)
+            has_part = any('part number' in cell for cell in row_lower)
+
+            if has_cablex and has_fair and has_part:
+                header_row_idx = idx
+                header_candidates = {
+                    'Cablex P/N': None,
+                    'FAIR Identifier': None,
+                    'Part Number': None,
+                }
+
+                header_row = normalized.iloc[idx]
+                for col_idx, text in header_row.items():
+                    lower = text.lower()
+                    if not lower:
+                        continue
+                    if 'cablex' in lower and 'p/n' in lower:
+                        header_candidates['Cablex P/N'] = col_idx
+                    elif 'fair' in lower and 'identifier' in lower:
+                        header_candidates['FAIR Identifier'] = col_idx
+                    elif 'part number' in lower:
+                        header_candidates['Part Number'] = col_idx
+                break
+
+        if header_row_idx is None or None in header_candidates.values():
+            return pd.DataFrame()
+
+        records = []
+        empty_streak = 0
+        footer_markers = self.TABLE_FOOTER_MARKERS
+
+        for idx in range(header_row_idx + 1, len(normalized)):
+            row = normalized.iloc[idx]
+            row_text = ' '.join(cell for cell in row if cell)
+
+            if not row_text:
+                empty_streak += 1
+                if empty_streak >= 2:
+                    break
+                continue
+
+            empty_streak = 0
+
+            lowered = row_text.lower()
+            if any(marker in lowered for marker in footer_markers):
+                break
+
+            record = {}
+            filled = False
+            for key, col_idx in header_candidates.items():
+                value = row.get(col_idx, '')
+                record[key] = value
+                if value:
+                    filled = True
+
+            if filled:
+                records.append(record)
+
+        if not records:
+            return pd.DataFrame()
+
+        return pd.DataFrame(records)
+
+    def extract_identifier(self, folder_name: str) -> str:
+        """Extract the identifier from folder name
+        
+        Examples:
+            'FAI 127K667G02' -> '127K667G02'
+            'Material CoC 127K667G02' -> '127K667G02'
+            '127K667G02' -> '127K667G02'
+        """
+        # Try to extract from 'FAI <identifier>' pattern
+        match = re.search(r'FAI\s+(.+)', folder_name)
+        if match:
+            return match.group(1)
+        
+        # Try to extract from 'Material CoC <identifier>' pattern
+        match = re.search(r'Material\s+CoC\s+(.+)', folder_name)
+        if match:
+            return match.group(1)
+        
+        # Return as-is if no pattern matches
+        return folder_name
+    
+    def extract_fai_number(self, folder_name: str) -> str:
+        """Legacy method - calls extract_identifier for backward compatibility"""
+        return self.extract_identifier(folder_name)
+    
+    def read_excel_tables(self, excel_path: Path) -> pd.DataFrame:
+        """Read Excel file and extract tables with required columns
+        
+        Unchanged workbooks are loaded from the table cache instead of being parsed again.
+        """
+        digest = self.content_hash(excel_path) if self.excel_cache_dir else None
+        if digest:
+            cached = self._load_cached_tables(digest)
+            if cached is not None:
+                self.run_timings.count('excel_cache_hits')
+                return cached
+        
+        try:
+            # Try reading all sheets
+            excel_file = pd.ExcelFile(excel_path)
+            all_data = []
+            complete = True
+            
+            for sheet_name in excel_file.sheet_names:
+                try:
+                    raw_sheet = pd.read_excel(
+                        excel_file,
+                        sheet_name=sheet_name,
+                        header=None,
+                        dtype=object
+                    )
+
+                    table_df = self._extract_table_from_sheet(raw_sheet)
+
+                    if not table_df.empty:
+                        table_df['Sheet'] = sheet_name
+                        all_data.append(table_df)
+                    else:
+                        logger.debug(f"Required table not found in sheet {sheet_name}")
+                        
+                except Exception as e:
+                    complete = False
+                    logger.warning(f"Error reading sheet {sheet_name}: {e}")
+            
+            if all_data:
+                tables = pd.concat(all_data, ignore_index=True)
+            else:
+                tables = pd.DataFrame()
+        except Exception as e:
+            logger.error(f"Error reading Excel file {excel_path}: {e}")
+            return pd.DataFrame()
+        
+        # Sheets that failed to read may succeed next time (e.g. the file was being saved)
+        if digest and complete:
+            self.run_timings.count('excel_cache_misses')
+            self._store_cached_tables(digest, tables)
+        return tables
+    
+    @classmethod
+    def extractor_version(cls) -> str:
+        """Fingerprint of the table extraction code and settings, part of every table cache entry"""
+        version = cls.__dict__.get('_extractor_version')
+        if version is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for func in (cls.read_excel_tables, cls._extract_table_from_sheet, cls._clean_cell):
+                try:
+                    digest.update(inspect.getsource(func).encode('utf-8'))
+                except (OSError, TypeError):
+                    # No source at hand (e.g. a frozen executable): fall back to the bytecode
+                    digest.update(marshal.dumps(func.__code__))
+            digest.update(repr(cls.TABLE_FOOTER_MARKERS).encode('utf-8'))
+            # Cell conversion in read_excel differs between pandas releases
+            digest.update(pd.__version__.encode('utf-8'))
+            version = digest.hexdigest()
+            cls._extractor_version = version
+        return version
+    
+    def _table_cache_path(self, digest: str) -> Path:
+        return self.excel_cache_dir / digest[:2] / f"{digest}.json"
+    
+    def _load_cached_tables(self, digest: str) -> Optional[pd.DataFrame]:
+        """Cached tables of the workbook with this content hash (None if missing or stale)"""
+        try:
+            with open(self._table_cache_path(digest), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('extractor') != self.extractor_version():
+            return None
+        columns = entry.get('columns', [])
+        return pd.DataFrame({column: entry['data'][column] for column in columns}, columns=columns)
+    
+    def _store_cached_tables(self, digest: str, tables: pd.DataFrame):
+        """Write the tables column-wise, replacing the entry of an older extractor version"""
+        path = self._table_cache_path(digest)
+        entry = {
+            'extractor': self.extractor_version(),
+            'rows': len(tables),
+            'columns': [str(column) for column in tables.columns],
+            'data': {str(column): tables[column].tolist() for column in tables.columns},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not cache tables of {digest}: {e}")
+    
+    @staticmethod
+    def list_coc_pdfs(coc_folder: Path) -> List[Tuple[Path, str, str]]:
+        """PDFs of a CoC folder as (path, name, cleaned-up name) for find_matching_pdf"""
+        if not coc_folder.exists():
+            return []
+        # Remove common separators for better matching
+        return [(pdf_file, pdf_file.name, pdf_file.name.lower().replace('_', ' ').replace('-', ' '))
+                for pdf_file in coc_folder.glob('*.pdf')]
+    
+    def find_matching_pdf(self, cablex_pn: str, fair_id: str, coc_folder: Path,
+                          candidates: Optional[List[Tuple[Path, str, str]]] = None) -> Optional[Path]:
+        """Find matching PDF file based on Cablex P/N and FAIR Identifier
+        
+        candidates, if given, is list_coc_pdfs(coc_folder), so that the rows of one
+        workbook do not list the folder again for every row.
+        """
+        if candidates is None:
+            candidates = self.list_coc_pdfs(coc_folder)
+        
+        cablex_pn = str(cablex_pn).strip()
+        fair_id = str(fair_id).strip()
+        cablex_clean = cablex_pn.lower().replace('_', ' ').replace('-', ' ')
+        fair_clean = fair_id.lower().replace('_', ' ').replace('-', ' ')
+        
+        # More flexible matching - just check if both identifiers are in the filename
+        for pdf_file, _, filename_clean in candidates:
+            # Check if both identifiers appear in the filename
+            if cablex_clean in filename_clean and fair_clean in filename_clean:
+                return pdf_file
+        
+        # Fallback to original strict pattern matching
+        pattern = f"{cablex_pn}_{fair_id}_"
+        for pdf_file, filename, _ in candidates:
+            if filename.startswith(pattern):
+                return pdf_file
+        return None
+    
+    def check_pdf_has_text(self, pdf_path: Path) -> bool:
+        """Check if PDF has searchable text"""
+        try:
+            doc = fitz.open(str(pdf_path))
+            for page_num in range(min(3, len(doc))):  # Check first 3 pages
+                page = doc[page_num]
+                text = page.get_text()
+                if text and len(text.strip()) > 50:  # Has meaningful text
+                    doc.close()
+                    return True
+            doc.close()
+            return False
+        except Exception as e:
+            logger.error(f"Error checking PDF text in {pdf_path}: {e}")
+            return False
+    
+    def estimate_pdf_cost(self, pdf_path: Path) -> Dict:
+        """Cheap probe of a PDF (page count, file size, text layer) and its estimated processing time"""
+        try:
+            size = pdf_path.stat().st_size
+        except OSError:
+            size = 0
+        pages = 0
+        has_text = False
+        page_area = 612 * 792  # US Letter in points, if the probe fails
+        try:
+            with fitz.open(str(pdf_path)) as doc:
+                pages = len(doc)
+                probed = [doc[page_num] for page_num in range(min(3, pages))]
+                if probed:
+                    page_area = max(page.rect.width * page.rect.height for page in probed)
+                # Same test as check_pdf_has_text, stopping at the first page with text
+                has_text = any(len(page.get_text().strip()) > 50 for page in probed)
+        except Exception as e:
+            logger.debug(f"Could not probe {pdf_path}: {e}")
+        
+        ocr = (self.force_ocr or not has_text) and ocr_available()
+        page_seconds = self.COST_OCR_PAGE_SECONDS if ocr else self.COST_TEXT_PAGE_SECONDS
+        seconds = self.COST_BASE_SECONDS + pages * page_seconds + size / 2**20 * self.COST_SECONDS_PER_MB
+        
+        memory = self.MEMORY_BASE_MB * 2**20 + size * self.MEMORY_DOC_FACTOR
+        if ocr:
+            dpi = max(self._first_ocr_dpi(), self.OCR_HIGH_DPI if self.adaptive_ocr else 0)
+            page_pixels = page_area / 72 ** 2 * dpi ** 2
+            memory += min(pages, self.RENDER_CHUNK_PAGES) * page_pixels * self.MEMORY_BYTES_PER_PIXEL
+            memory += self.MEMORY_OCR_OVERHEAD_MB * 2**20
+        
+        return {'pages': pages, 'bytes': size, 'has_text': has_text, 'ocr': ocr, 'seconds': seconds,
+                'memory': int(memory)}
+    
+    def content_hash(self, file_path: Path) -> Optional[str]:
+        """Hash of a file's bytes (a PDF or workbook), identical for every copy of it (None if unreadable)"""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(self.CONTENT_HASH_CHUNK_BYTES), b''):
+                    digest.update(block)
+        except OSError as e:
+            logger.warning(f"Could not hash file {file_path}: {e}")
+            return None
+        return digest.hexdigest()
+    
+    def resolve_memory_budget(self) -> int:
+        """Memory (bytes) the PDFs in flight may use together, by estimate_pdf_cost's model"""
+        if self.memory_budget_mb:
+            return int(self.memory_budget_mb * 2**20)
+        total = total_memory_bytes()
+        if total:
+            return int(total * self.MEMORY_DEFAULT_FRACTION)
+        return self.MEMORY_FALLBACK_BUDGET_MB * 2**20
+    
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """Short human-readable duration, e.g. '45s', '3m 05s', '1h 02m'"""
+        seconds = max(0, int(round(seconds)))
+        if seconds < 60:
+            return f"{seconds}s"
+        if seconds < 3600:
+            return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    
+    def _render_page_chunks(self, pdf_path: Path, dpi: int, page_nums: List[int],
+                            timings: StageTimings, budget: Optional[TaskBudget] = None):
+        """Rasterise the given 0-based pages, yielding lists of (page_num, image) one chunk at a time"""
+        # Render contiguous runs of pages with one pdftoppm call each
+        runs = []
+        for page_num in sorted(page_nums):
+            if runs and page_num == runs[-1][1] + 1 and page_num - runs[-1][0] < self.RENDER_CHUNK_PAGES:
+                runs[-1][1] = page_num
+            else:
+                runs.append([page_num, page_num])
+        
+        for first, last in runs:
+            if budget:
+                budget.check()
+            try:
+                with timings.stage('rasterise'):
+                    images = convert_from_path(
+                        str(pdf_path), dpi=dpi, first_page=first + 1, last_page=last + 1,
+                        grayscale=self.preprocess_ocr, timeout=budget.remaining() if budget else None
+                    )
+            except Exception:
+                # pdf2image kills pdftoppm when the timeout passes; report it as our timeout
+                if budget:
+                    budget.check()
+                raise
+            timings.count('pages_rasterised', len(images))
+            yield [(first + offset, image) for offset, image in enumerate(images)]
+    
+    def _run_tesseract(self, args: List[str], budget: Optional[TaskBudget] = None) -> str:
+        """Run the Tesseract CLI and return its stdout; the process is killed on stop or timeout"""
+        proc = subprocess.Popen(
+            [pytesseract.pytesseract.tesseract_cmd] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),  # No console flash on Windows
+        )
+        try:
+            while True:
+                try:
+                    out, err = proc.communicate(timeout=self.CANCEL_POLL_SECONDS)
+                    break
+                except subprocess.TimeoutExpired:
+                    if budget:
+                        budget.check()
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+            raise
+        
+        if proc.returncode != 0:
+            raise RuntimeError(f"Tesseract failed ({proc.returncode}): {err.decode(errors='replace').strip()}")
+        return out.decode('utf-8', errors='replace')
+    
+    @staticmethod
+    def _parse_tesseract_tsv(tsv: str, header: Optional[Tuple[str, ...]] = None) -> Dict[str, list]:
+        """Parse Tesseract TSV output into the same layout as pytesseract's Output.DICT"""
+        lines = tsv.splitlines()
+        if header is None:
+            if not lines:
+                return {'text': []}
+            header = lines[0].split('\t')
+            lines = lines[1:]
+        data = {key: [] for key in header}
+        for line in lines:
+            if not line:
+                continue
+            fields = line.split('\t')
+            if len(fields) < len(header):
+                fields += [''] * (len(header) - len(fields))
+            for key, value in zip(header, fields):
+                if key == 'text':
+                    data[key].append(value)
+                elif key == 'conf':
+                    data[key].append(float(value) if value else -1.0)
+                else:
+                    data[key].append(int(value) if value else 0)
+        return data
+    
+    @staticmethod
+    def _write_ocr_image(image, directory: str, index: int) -> str:
+        """Write an image for the Tesseract CLI as uncompressed PNM (much cheaper than PNG)"""
+        image_path = os.path.join(directory, f"page_{index:04d}.pnm")
+        image.save(image_path, format='PPM')
+        return image_path
+    
+    def _tesseract_image_to_data(self, image, budget: Optional[TaskBudget] = None) -> Dict[str, list]:
+        """Equivalent of pytesseract.image_to_data(..., output_type=DICT) that honours the task budget"""
+        with tempfile.TemporaryDirectory(prefix='fai_ocr_') as tmp_dir:
+            image_path = self._write_ocr_image(image, tmp_dir, 0)
+            args = [image_path, 'stdout'] + self._tesseract_config_args() + ['tsv']
+            return self._parse_tesseract_tsv(self._run_tesseract(args, budget))
+    
+    def _tesseract_batch_to_data(self, images: List, budget: Optional[TaskBudget] = None) -> List[Dict[str, list]]:
+        """OCR several page images with a single Tesseract process and split the result per page
+        
+        Tesseract accepts a text file listing image paths as its input and numbers the
+        pages in its TSV output in list order, so the process spawn and traineddata load
+        are paid once per batch instead of once per page.
+        """
+        with tempfile.TemporaryDirectory(prefix='fai_ocr_') as tmp_dir:
+            image_paths = [self._write_ocr_image(image, tmp_dir, idx) for idx, image in enumerate(images)]
+            list_path = os.path.join(tmp_dir, 'pages.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(image_paths) + '\n')
+            args = [list_path, 'stdout'] + self._tesseract_config_args() + ['tsv']
+            data = self._parse_tesseract_tsv(self._run_tesseract(args, budget))
+        
+        pages = [{key: [] for key in data} for _ in images]
+        for i, page_num in enumerate(data.get('page_num', [])):
+            if 1 <= page_num <= len(pages):
+                for key, values in data.items():
+                    pages[page_num - 1][key].append(values[i])
+        return pages
+    
+    def _tesserocr_image_to_data(self, image) -> Dict[str, list]:
+        """OCR with the in-process engine of the calling thread (created on first use)"""
+        api = getattr(self._tesserocr_local, 'api', None)
+        if api is None:
+            profile = self.OCR_PROFILES[self.ocr_profile]
+            options = {}
+            if profile.get('psm') is not None:
+                options['psm'] = profile['psm']
+            if profile.get('oem') is not None:
+                options['oem'] = profile['oem']
+            api = tesserocr.PyTessBaseAPI(**options)
+            if profile.get('whitelist'):
+                api.SetVariable('tessedit_char_whitelist', profile['whitelist'])
+            self._tesserocr_local.api = api
+        api.SetImage(image)
+        api.Recognize()
+        return self._parse_tesseract_tsv(api.GetTSVText(0), header=TESSERACT_TSV_HEADER)
+    
+    def _first_ocr_dpi(self) -> int:
+        """Resolution of the first OCR pass: the profile's, else low (adaptive) or fixed DPI"""
+        return self.OCR_PROFILES[self.ocr_profile].get('dpi') or (self.OCR_LOW_DPI if self.adaptive_ocr else self.OCR_DPI)
+    
+    def _tesseract_config_args(self) -> List[str]:
+        """Tesseract CLI options of the selected OCR profile"""
+        profile = self.OCR_PROFILES[self.ocr_profile]
+        args = []
+        if profile.get('psm') is not None:
+            args += ['--psm', str(profile['psm'])]
+        if profile.get('oem') is not None:
+            args += ['--oem', str(profile['oem'])]
+        if profile.get('whitelist'):
+            args += ['-c', f"tessedit_char_whitelist={profile['whitelist']}"]
+        return args
+    
+    def _resolve_ocr_backend(self) -> str:
+        if self.ocr_backend == 'auto':
+            return 'tesserocr' if tesserocr_loaded() else 'batch'
+        if self.ocr_backend == 'tesserocr' and not tesserocr_loaded():
+            return 'batch'
+        return self.ocr_backend
+    
+    def _ocr_pages(self, chunk: List[Tuple[int, object]], doc: fitz.Document, timings: StageTimings,
+                   budget: Optional[TaskBudget] = None) -> Dict[int, List[Tuple[str, fitz.Rect, float]]]:
+        """OCR a chunk of rendered pages, returning {page_num: [(text, rect in PDF coordinates, confidence)]}"""
+        images = [image for _, image in chunk]
+        transforms = [None] * len(images)
+        backend = self._resolve_ocr_backend()
+        
+        if self.preprocess_ocr:
+            with timings.stage('preprocess'):
+                prepared = [preprocess_page_image(image) for image in images]
+            images = [image for image, _ in prepared]
+            transforms = [transform for _, transform in prepared]
+            timings.count('pages_deskewed', sum(1 for transform in transforms if transform.angle))
+        
+        with timings.stage('ocr'):
+            if backend == 'tesserocr':
+                results = []
+                for image in images:
+                    if budget:
+                        budget.check()
+                    results.append(self._tesserocr_image_to_data(image))
+                timings.count('ocr_engine_calls', len(images))
+            elif backend == 'batch' and len(images) > 1:
+                results = self._tesseract_batch_to_data(images, budget)
+                timings.count('ocr_engine_calls')
+            else:
+                results = []
+                for image in images:
+                    if budget:
+                        budget.check()
+                    results.append(self._tesseract_image_to_data(image, budget))
+                timings.count('ocr_engine_calls', len(images))
+        timings.count('pages_ocred', len(images))
+        
+        page_words = {}
+        for (page_num, image), ocr_data, transform in zip(chunk, results, transforms):
+            # Convert image coordinates to PDF coordinates
+            scale = doc[page_num].rect.width / image.width
+            words = []
+            for i in range(len(ocr_data['text'])):
+                text = ocr_data['text'][i].strip()
+                if text:
+                    box = (ocr_data['left'][i], ocr_data['top'][i], ocr_data['width'][i], ocr_data['height'][i])
+                    if transform:
+                        box = transform.to_original(*box)
+                    x, y, w, h = (value * scale for value in box)
+                    words.append((text, fitz.Rect(x, y, x + w, y + h), ocr_data['conf'][i]))
+            page_words[page_num] = words
+        return page_words
+    
+    def word_index(self, doc: fitz.Document, content_key: Optional[str] = None,
+                   budget: Optional[TaskBudget] = None) -> WordIndex:
+        """WordIndex of doc, shared through the OCR cache between copies of the same content"""
+        if content_key is not None:
+            cached = self._ocr_cache.get(content_key, 'word_index')
+            if cached is not None:
+                return cached
+        index = WordIndex(doc, budget)
+        if content_key is not None:
+            self._ocr_cache.put(content_key, 'word_index', index)
+        return index
+    
+    def _ocr_settings_key(self) -> Tuple:
+        """Settings besides the DPI that change what OCR reads from a page"""
+        return (self._resolve_ocr_backend(), self.ocr_profile, self.preprocess_ocr)
+    
+    def _cached_ocr_pages(self, content_key: Optional[str], dpi: int,
+                          page_nums: List[int]) -> Dict[int, List[Tuple[str, fitz.Rect, float]]]:
+        """OCR words already read from another copy of the same content with the same DPI and settings"""
+        if content_key is None:
+            return {}
+        settings = self._ocr_settings_key()
+        found = self._ocr_cache.get_many(content_key, [(settings, dpi, page_num) for page_num in page_nums])
+        return {page_num: words for (_, _, page_num), words in found.items()}
+    
+    def _store_ocr_pages(self, content_key: Optional[str], dpi: int,
+                         page_words: Dict[int, List[Tuple[str, fitz.Rect, float]]]):
+        """Keep OCR words for later copies; a run's own cache only keeps contents the planner registered"""
+        if content_key is None:
+            return
+        settings = self._ocr_settings_key()
+        self._ocr_cache.put_many(content_key, {(settings, dpi, page_num): words
+                                               for page_num, words in page_words.items()})
+    
+    @staticmethod
+    def _page_confidence(words: List[Tuple[str, fitz.Rect, float]]) -> float:
+        """Mean Tesseract word confidence of a page (0 when nothing was recognised)"""
+        confs = [conf for _, _, conf in words if conf >= 0]
+        return sum(confs) / len(confs) if confs else 0.0
+    
+    @staticmethod
+    def _match_ocr_words(words: List[Tuple[str, fitz.Rect, float]], search_term_lower: str) -> List[fitz.Rect]:
+        """Rects of OCR words containing the search term"""
+        text_instances = [rect for text, rect, _ in words if search_term_lower in text.lower()]
+        
+        # Also check for multi-word matches in the full text
+        if not text_instances:
+            full_text = " ".join(text for text, _, _ in words)
+            if search_term_lower in full_text.lower():
+                # Add a general marker for this page
+                # This is a simplified approach - could be improved
+                text_instances.append(fitz.Rect(50, 50, 200, 70))
+        return text_instances
+    
+    def ocr_pdf_and_create_searchable(self, pdf_path: Path, doc: fitz.Document, search_term: str,
+                                      timings: Optional[StageTimings] = None,
+                                      budget: Optional[TaskBudget] = None,
+                                      content_key: Optional[str] = None,
+                                      overlay: bool = True) -> Tuple[bool, List[Tuple[int, List[fitz.Rect]]]]:
+        """Perform OCR on PDF and create searchable text layer, returns (found, [(page_num, [match_rects])])
+        
+        With adaptive OCR every page is first read at OCR_LOW_DPI. If the term was found,
+        the pages without it whose mean confidence is below OCR_MIN_CONFIDENCE are re-rendered
+        and re-read at OCR_HIGH_DPI. If it was not found anywhere, only the
+        OCR_ESCALATE_MAX_PAGES least confident pages are re-read.
+        Otherwise every page is read once at OCR_DPI. An OCR profile with its own DPI
+        replaces the first pass resolution. Tesseract runs with the profile's settings.
+        
+        content_key is the PDF's content_hash(); pages another copy of the same content
+        already read at the same DPI are taken from the run's OCR cache instead.
+        With overlay=False the invisible text layer is not added to doc.
+        
+        Raises TaskCancelled / TaskTimedOut when the budget runs out between pages.
+        """
+        if timings is None:
+            timings = StageTimings()
+        if not ocr_available():
+            logger.warning("OCR not available. Install pytesseract and pdf2image.")
+            return False, []
+        
         try:
             logger.info(f"Performing OCR on {pdf_path.name}...")
             
-            # Convert PDF to images
-            images = convert_from_path(str(pdf_path), dpi=200)
-            
-            found_pages = []
             search_term_lower = search_term.lower().strip()
+            first_dpi = self._first_ocr_dpi()
+            page_words = {}
+            page_matches = {}
             
-            for page_num, image in enumerate(images):
-                if page_num >= len(doc):
-                    break
-                    
+            def read_pages(dpi, page_nums):
+                """OCR page_nums at dpi into page_words/page_matches, reusing cached pages"""
+                results = self._cached_ocr_pages(content_key, dpi, page_nums)
+                if results:
+                    timings.count('ocr_pages_reused', len(results))
+                todo = [page_num for page_num in page_nums if page_num not in results]
+                # Convert PDF to images and OCR them, a chunk of pages at a time
+                for chunk in self._render_page_chunks(pdf_path, dpi, todo, timings, budget):
+                    chunk_words = self._ocr_pages(chunk, doc, timings, budget)
+                    self._store_ocr_pages(content_key, dpi, chunk_words)
+                    results.update(chunk_words)
+                    del chunk
+                for page_num, words in results.items():
+                    page_words[page_num] = words
+                    page_matches[page_num] = self._match_ocr_words(words, search_term_lower)
+            
+            read_pages(first_dpi, list(range(len(doc))))
+            
+            if self.adaptive_ocr and first_dpi < self.OCR_HIGH_DPI:
+                confidence = {page_num: self._page_confidence(words) for page_num, words in page_words.items()}
+                if any(page_matches.values()):
+                    escalate = [
+                        page_num for page_num in page_words
+                        if not page_matches[page_num] and confidence[page_num] < self.OCR_MIN_CONFIDENCE
+                    ]
+                else:
+                    # Small print lowers a page's confidence, so its page is the likeliest miss
+                    escalate = sorted(page_words, key=confidence.get)[:self.OCR_ESCALATE_MAX_PAGES]
+                if escalate:
+                    logger.debug(f"Re-running OCR on {len(escalate)} page(s) of {pdf_path.name} at {self.OCR_HIGH_DPI} DPI")
+                    timings.count('pages_escalated', len(escalate))
+                    read_pages(self.OCR_HIGH_DPI, escalate)
+            
+            found_pages = []
+            for page_num in sorted(page_words):
                 page = doc[page_num]
                 
-                # Get OCR data with bounding boxes
-                ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                
-                # Clear existing text if any
-                page.clean_contents()
-                
-                # Add invisible text layer for searchability
-                text_instances = []
-                full_text = ""
-                
-                for i in range(len(ocr_data['text'])):
-                    text = ocr_data['text'][i].strip()
-                    if text:
-                        # Get position from OCR
-                        x = ocr_data['left'][i]
-                        y = ocr_data['top'][i]
-                        w = ocr_data['width'][i]
-                        h = ocr_data['height'][i]
+                if overlay:
+                    with timings.stage('overlay'):
+                        # Clear existing text if any
+                        page.clean_contents()
                         
-                        # Convert image coordinates to PDF coordinates
-                        # Assuming standard DPI conversion
-                        scale = page.rect.width / image.width
-                        pdf_x = x * scale
-                        pdf_y = y * scale
-                        pdf_w = w * scale
-                        pdf_h = h * scale
-                        
-                        # Create rectangle for this word
-                        rect = fitz.Rect(pdf_x, pdf_y, pdf_x + pdf_w, pdf_y + pdf_h)
-                        
-                        # Add invisible text at this position
-                        rc = page.insert_text(
-                            fitz.Point(pdf_x, pdf_y + pdf_h),
-                            text,
-                            fontsize=1,
-                            color=(1, 1, 1),  # White (invisible on white background)
-                            render_mode=3  # Invisible rendering
-                        )
-                        
-                        full_text += text + " "
-                        
-                        # Check if this word matches our search term
-                        if search_term_lower in text.lower():
-                            text_instances.append(rect)
+                        # Add invisible text layer for searchability
+                        for text, rect, _ in page_words[page_num]:
+                            timings.count('ocr_words')
+                            page.insert_text(
+                                fitz.Point(rect.x0, rect.y1),
+                                text,
+                                fontsize=1,
+                                color=(1, 1, 1),  # White (invisible on white background)
+                                render_mode=3  # Invisible rendering
+                            )
                 
-                # Also check for multi-word matches in the full text
-                if search_term_lower in full_text.lower() and not text_instances:
-                    # Find approximate position for multi-word match
-                    # This is a simplified approach - could be improved
-                    start_idx = full_text.lower().find(search_term_lower)
-                    if start_idx >= 0:
-                        # Add a general marker for this page
-                        text_instances.append(fitz.Rect(50, 50, 200, 70))
-                
-                if text_instances:
-                    found_pages.append((page_num, text_instances))
+                if page_matches[page_num]:
+                    found_pages.append((page_num, page_matches[page_num]))
                     logger.debug(f"Found '{search_term}' on page {page_num + 1} via OCR")
             
             return len(found_pages) > 0, found_pages
             
+        except TaskCancelled:
+            raise
         except Exception as e:
             logger.error(f"OCR error on {pdf_path}: {e}")
             return False, []
     
-    def search_and_highlight_pdf(self, pdf_path: Path, search_term: str, source_folder: str = None) -> Tuple[bool, Path]:
+    def search_and_highlight_pdf(self, pdf_path: Path, search_term: str, source_folder: str = None,
+                                 budget: Optional[TaskBudget] = None) -> Tuple[bool, Path]:
         """Search for term in PDF and highlight if found, using OCR if needed
         
         Args:
             pdf_path: Path to the PDF file
             search_term: Term to search for
             source_folder: Name of the source folder (e.g., 'Material CoC 123456') for organizing outputs
+            budget: Optional time budget / stop event; TaskCancelled or TaskTimedOut is raised when it runs out
+        """
+        found, output_path, _ = self.search_and_highlight_pages(pdf_path, search_term, source_folder, budget)
+        return found, output_path
+    
+    def highlighted_output_path(self, pdf_path: Path, source_folder: str = None) -> Path:
+        """Where the highlighted copy of pdf_path is written, based on the output settings"""
+        if self.destructive:
+            # Replace original file in place
+            return pdf_path
+        if self.separate_output and self.output_folder:
+            # Create subfolder based on source folder
+            if source_folder:
+                subfolder = self.output_folder / source_folder
+                subfolder.mkdir(exist_ok=True)
+                return subfolder / f"highlighted_{pdf_path.name}"
+            return self.output_folder / f"highlighted_{pdf_path.name}"
+        return pdf_path.parent / f"highlighted_{pdf_path.name}"
+    
+    def copy_highlighted_output(self, highlighted_path: Path, pdf_path: Path, source_folder: str = None) -> Path:
+        """Produce the highlighted output of pdf_path from the output of an identical PDF"""
+        output_path = self.highlighted_output_path(pdf_path, source_folder)
+        if output_path != highlighted_path:
+            if self.sidecar_output:
+                record = self._read_sidecar(self.sidecar_path(highlighted_path))
+                self._write_sidecar(output_path, pdf_path, source_folder, record['term'], record['matches'])
+            else:
+                shutil.copyfile(highlighted_path, output_path)
+        return output_path
+    
+    @staticmethod
+    def _highlight_page(page: fitz.Page, rects, label: Optional[str] = None):
+        """Add yellow highlights over rects, and optionally a red label at the top of the page"""
+        for rect in rects:
+            try:
+                highlight = page.add_highlight_annot(rect)
+                highlight.set_colors({"stroke": [1, 1, 0]})  # Yellow
+                highlight.update()
+            except:
+                pass  # Skip if rect is invalid
+        if label:
+            page.insert_text(fitz.Point(50, 30), label, fontsize=12, color=(1, 0, 0))  # Red text
+    
+    def sidecar_path(self, output_path: Path) -> Path:
+        """Match sidecar belonging to a highlighted output path"""
+        output_path = Path(output_path)
+        return output_path.with_name(output_path.stem + self.SIDECAR_SUFFIX)
+    
+    def _write_sidecar(self, output_path: Path, pdf_path: Path, source_folder: Optional[str], term: str,
+                       matches: List[Dict]) -> Path:
+        """Write the matches for output_path, with the source's size/mtime to detect later edits"""
+        stat = pdf_path.stat()
+        record = {
+            'version': self.SIDECAR_VERSION,
+            'source': str(pdf_path),
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_folder': source_folder,
+            'output': output_path.name,
+            'term': term,
+            'matches': matches,
+        }
+        sidecar = self.sidecar_path(output_path)
+        sidecar.write_text(json.dumps(record), encoding='utf-8')
+        return sidecar
+    
+    def _read_sidecar(self, sidecar: Path) -> Dict:
+        record = json.loads(Path(sidecar).read_text(encoding='utf-8'))
+        if record.get('version') != self.SIDECAR_VERSION:
+            raise ValueError(f"Unsupported sidecar version in {Path(sidecar).name}")
+        return record
+    
+    def write_match_sidecar(self, pdf_path: Path, output_path: Path, search_term: str, source_folder: Optional[str],
+                            page_rects: Dict[int, List[fitz.Rect]], labelled_pages=()) -> Path:
+        """Record matches (1-based page, rects in PDF points, term, source) instead of saving a highlighted copy
+        
+        labelled_pages are the 0-based pages that get the "Matched Part Number" label (OCR matches).
+        """
+        matches = [
+            {
+                'page': page_num + 1,
+                'rects': [[round(value, 2) for value in rect] for rect in rects],
+                'ocr': page_num in labelled_pages,
+            }
+            for page_num, rects in sorted(page_rects.items())
+        ]
+        return self._write_sidecar(output_path, pdf_path, source_folder, search_term, matches)
+    
+    def materialise_highlighted(self, output_path) -> Path:
+        """Create the highlighted PDF described by output_path's sidecar, unless it is already up to date
+        
+        Raises FileNotFoundError when there is no sidecar (and no PDF) and RuntimeError when the
+        source PDF changed after it was searched, since the recorded rects may no longer fit.
+        """
+        output_path = Path(output_path)
+        sidecar = self.sidecar_path(output_path)
+        if output_path.exists() and (not sidecar.exists()
+                                     or output_path.stat().st_mtime_ns >= sidecar.stat().st_mtime_ns):
+            return output_path
+        record = self._read_sidecar(sidecar)
+        source = Path(record['source'])
+        stat = source.stat()
+        if (stat.st_size, stat.st_mtime_ns) != (record['source_size'], record['source_mtime_ns']):
+            raise RuntimeError(f"{source.name} changed after it was searched; process it again to highlight it")
+        
+        label = f"Matched Part Number: {record['term']}"
+        with fitz.open(str(source)) as doc:
+            for match in record['matches']:
+                self._highlight_page(doc[match['page'] - 1], [fitz.Rect(rect) for rect in match['rects']],
+                                     label if match.get('ocr') else None)
+            doc.save(str(output_path), garbage=3, deflate=True)
+        return output_path
+    
+    def materialise_all(self, folder=None, progress_callback=None, stop_flag=None) -> Dict[str, int]:
+        """Create the highlighted PDFs of every sidecar under folder (default: the output folder)
+        
+        Returns counts of PDFs created, already up to date and failed.
+        """
+        folder = Path(folder) if folder else (self.output_folder or self.base_path)
+        sidecars = sorted(folder.rglob(f"*{self.SIDECAR_SUFFIX}"))
+        counts = {'created': 0, 'up_to_date': 0, 'failed': 0}
+        for index, sidecar in enumerate(sidecars, 1):
+            if stop_flag and stop_flag():
+                break
+            output_path = sidecar.with_name(sidecar.name[:-len(self.SIDECAR_SUFFIX)] + '.pdf')
+            try:
+                if output_path.exists() and output_path.stat().st_mtime_ns >= sidecar.stat().st_mtime_ns:
+                    counts['up_to_date'] += 1
+                else:
+                    self.materialise_highlighted(output_path)
+                    counts['created'] += 1
+            except Exception as e:
+                logger.error(f"Could not create {output_path.name}: {e}")
+                counts['failed'] += 1
+            if progress_callback:
+                progress_callback(f"Creating highlighted PDFs: {index}/{len(sidecars)}",
+                                  index / len(sidecars) * 100)
+        return counts
+    
+    def search_and_highlight_pages(self, pdf_path: Path, search_term: str, source_folder: str = None,
+                                   budget: Optional[TaskBudget] = None,
+                                   content_key: Optional[str] = None) -> Tuple[bool, Path, List[int]]:
+        """search_and_highlight_pdf, also returning the 1-based pages the term was found on
+        
+        The text layer is searched through a WordIndex, so separators in the part number do
+        not matter ('127K-667' also finds '127K 667'). content_key (the PDF's content_hash())
+        lets the word index and OCR pages be reused from an identical PDF.
         """
+        timings = StageTimings()
+        started = time.perf_counter()
+        found = False
+        status = 'done'
+        doc = None
+        highlighted_pages = set()
+        page_rects = {}
+        labelled_pages = set()
         try:
-            doc = fitz.open(str(pdf_path))
-            found = False
+            with timings.stage('open'):
+                doc = fitz.open(str(pdf_path))
+            timings.count('pages', len(doc))
             search_term = str(search_term).strip()
-            highlighted_pages = set()
             
-            # First try normal text search
-            for page_num, page in enumerate(doc):
-                text_instances = page.search_for(search_term, quads=False)
-                
-                if text_instances:
+            # First try normal text search, on the words of the text layer read once per document
+            with timings.stage('text_index'):
+                index = self.word_index(doc, content_key, budget)
+            with timings.stage('text_search'):
+                for page_num, text_instances in index.search(search_term).items():
                     found = True
                     highlighted_pages.add(page_num)
-                    for inst in text_instances:
-                        # Add yellow highlight
-                        highlight = page.add_highlight_annot(inst)
-                        highlight.set_colors({"stroke": [1, 1, 0]})  # Yellow
-                        highlight.update()
+                    page_rects.setdefault(page_num, []).extend(text_instances)
+                    if not self.sidecar_output:
+                        self._highlight_page(doc[page_num], text_instances)
             
             # If not found OR force OCR is enabled, perform OCR
-            use_ocr = self.force_ocr or (not found and not self.check_pdf_has_text(pdf_path))
+            if self.force_ocr:
+                use_ocr = True
+            elif not found:
+                with timings.stage('text_probe'):
+                    use_ocr = not self.check_pdf_has_text(pdf_path)
+            else:
+                use_ocr = False
             
             if use_ocr:
                 logger.info(f"Performing OCR for {pdf_path.name}")
-                ocr_found, ocr_matches = self.ocr_pdf_and_create_searchable(pdf_path, doc, search_term)
+                ocr_found, ocr_matches = self.ocr_pdf_and_create_searchable(
+                    pdf_path, doc, search_term, timings=timings, budget=budget, content_key=content_key,
+                    overlay=not self.sidecar_output
+                )
                 
                 if ocr_found:
                     found = True
-                    # Highlight the found text regions
-                    for page_num, match_rects in ocr_matches:
-                        if page_num < len(doc):
-                            page = doc[page_num]
-                            
-                            # Highlight each matched region
-                            for rect in match_rects:
-                                try:
-                                    highlight = page.add_highlight_annot(rect)
-                                    highlight.set_colors({"stroke": [1, 1, 0]})  # Yellow
-                                    highlight.update()
-                                except:
-                                    pass  # Skip if rect is invalid
-                            
-                            # Also add text annotation at top
-                            point = fitz.Point(50, 30)
-                            text_str = f"Matched Part Number: {search_term}"
-                            page.insert_text(point, text_str, fontsize=12, color=(1, 0, 0))  # Red text
+                    # Highlight the found text regions, with a label at the top of the page
+                    with timings.stage('highlight'):
+                        for page_num, match_rects in ocr_matches:
+                            if page_num < len(doc):
+                                highlighted_pages.add(page_num)
+                                labelled_pages.add(page_num)
+                                page_rects.setdefault(page_num, []).extend(match_rects)
+                                if not self.sidecar_output:
+                                    self._highlight_page(doc[page_num], match_rects,
+                                                         f"Matched Part Number: {search_term}")
             
             if found:
-                # Determine output path based on settings
-                if self.destructive:
-                    # Replace original file in place
-                    output_path = pdf_path
-                elif self.separate_output and self.output_folder:
-                    # Create subfolder based on source folder
-                    if source_folder:
-                        subfolder = self.output_folder / source_folder
-                        subfolder.mkdir(exist_ok=True)
-                        output_path = subfolder / f"highlighted_{pdf_path.name}"
-                    else:
-                        output_path = self.output_folder / f"highlighted_{pdf_path.name}"
-                else:
-                    output_path = pdf_path.parent / f"highlighted_{pdf_path.name}"
+                output_path = self.highlighted_output_path(pdf_path, source_folder)
                 
-                # Save with text layer for searchability
-                doc.save(str(output_path), garbage=3, deflate=True)
+                if budget:
+                    budget.check()
+                if self.sidecar_output:
+                    # The highlighted PDF is created later from the sidecar, when it is opened
+                    with timings.stage('sidecar'):
+                        self.write_match_sidecar(pdf_path, output_path, search_term, source_folder,
+                                                 page_rects, labelled_pages)
+                else:
+                    # Save with text layer for searchability
+                    with timings.stage('save'):
+                        doc.save(str(output_path), garbage=3, deflate=True)
                 doc.close()
-                return True, output_path
+                return True, output_path, sorted(page_num + 1 for page_num in highlighted_pages)
             else:
                 doc.close()
-                return False, pdf_path
+                return False, pdf_path, []
                 
+        except TaskCancelled as e:
+            status = 'timed_out' if isinstance(e, TaskTimedOut) else 'cancelled'
+            timings.count(status)
+            found = False
+            if doc is not None:
+                doc.close()
+            raise
         except Exception as e:
             logger.error(f"Error processing PDF {pdf_path}: {e}")
-            return False, pdf_path
+            timings.count('errors')
+            status = 'error'
+            found = False
+            return False, pdf_path, []
+        finally:
+            match_pages = sorted(page_num + 1 for page_num in highlighted_pages) if found else []
+            self._record_pdf_timings(pdf_path, search_term, found, time.perf_counter() - started, timings, status,
+                                     match_pages)
     
-    def process_directory(self, progress_callback=None, detailed_callback=None, stop_flag=None) -> pd.DataFrame:
-        """Process all FAI folders and Material CoC folders in the directory"""
-        all_results = []
-        
-        # Helper to check if we should stop
-        def should_stop():
-            return stop_flag and stop_flag()
-        stats = {
-            'fai_folders': 0,
-            'coc_folders': 0,
-            'excel_files': 0,
-            'excel_rows': 0,
-            'pdfs_found': 0,
-            'parts_highlighted': 0
+    def _record_pdf_timings(self, pdf_path: Path, search_term: str, found: bool, wall: float,
+                            timings: StageTimings, status: str = 'done', match_pages: Optional[List[int]] = None,
+                            duplicate_of: Optional[Path] = None):
+        """Store the per-PDF timing entry and fold it into the run totals"""
+        report = timings.to_dict()
+        report.update({
+            'pdf': str(pdf_path),
+            'part_number': str(search_term),
+            'found': found,
+            'match_pages': match_pages or [],
+            'status': status,
+            'wall': wall,
+        })
+        if duplicate_of is not None:
+            report['duplicate_of'] = str(duplicate_of)
+        with self._report_lock:
+            self.pdf_reports.append(report)
+        self.run_timings.merge(timings)
+        self.run_timings.count('pdfs_processed')
+    
+    def build_run_report(self, stats: Dict, wall: float, cpu: float) -> Dict:
+        """Assemble the machine-readable report for the last run"""
+        self.run_report = {
+            'base_path': str(self.base_path),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'options': {
+                'force_ocr': self.force_ocr,
+                'separate_output': self.separate_output,
+                'destructive': self.destructive,
+                'sidecar_output': self.sidecar_output,
+                'adaptive_ocr': self.adaptive_ocr,
+                'preprocess_ocr': self.preprocess_ocr,
+                'pdf_timeout': self.pdf_timeout,
+                'ocr_backend': self._resolve_ocr_backend(),
+                'ocr_profile': self.ocr_profile,
+                'memory_budget_mb': self.memory_budget_mb,
+                'results_db': str(self.results_db) if self.results_db else None,
+                'profile_threshold': self.profile_threshold,
+                'profile_mode': self.profile_mode,
+                'profile_memory': self.profile_memory,
+            },
+            'stats': dict(stats),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            **self.run_timings.to_dict(),
+            'schedule': dict(self.schedule_report),
+            'memory': self._memory_report(),
+            'pdfs': sorted(self.pdf_reports, key=lambda r: r['wall'], reverse=True),
+            'profiles': sorted(self.profile_reports, key=lambda r: r['wall'], reverse=True),
+        }
+        return self.run_report
+    
+    def _memory_report(self) -> Dict:
+        """Peak memory for the run report: the admission estimate and the measured process peaks"""
+        peaks = peak_memory_bytes()
+        return {
+            'budget_mb': self.schedule_report.get('memory_budget_mb'),
+            'peak_in_flight_estimate_mb': self.schedule_report.get('peak_in_flight_memory_mb'),
+            'peak_process_rss_mb': round(peaks['process'] / 2**20, 1) if peaks['process'] else None,
+            'peak_child_rss_mb': round(peaks['children'] / 2**20, 1) if peaks['children'] else None,
         }
+    
+    def format_timing_breakdown(self, top_n: int = 5) -> List[str]:
+        """Human-readable stage breakdown of the last run for the progress log"""
+        if not self.run_report:
+            return []
         
-        # Step 1: Find all Material CoC folders and their corresponding Excel folders (search up to depth 3)
-        if detailed_callback:
-            detailed_callback("Step 1: Finding folder pairs...", 0)
+        report = self.run_report
+        lines = [f"Run time: {report['wall_seconds']:.1f}s wall, {report['cpu_seconds']:.1f}s CPU (main process)"]
+        lines.append("Stage breakdown (PDF stages are summed across worker threads):")
+        stages = sorted(report['stages'].items(), key=lambda item: item[1]['wall'], reverse=True)
+        for name, entry in stages:
+            lines.append(f"  {name:<14} {entry['wall']:9.2f}s wall {entry['cpu']:9.2f}s CPU  x{entry['calls']}")
+        if report['counters']:
+            counters = ', '.join(f"{name}={value}" for name, value in sorted(report['counters'].items()))
+            lines.append(f"Counters: {counters}")
+        memory = report.get('memory') or {}
+        if memory.get('peak_in_flight_estimate_mb') is not None:
+            line = (f"Memory: in-flight estimate peaked at {memory['peak_in_flight_estimate_mb']:.0f} MB "
+                    f"of a {memory['budget_mb']:.0f} MB budget")
+            if memory.get('peak_process_rss_mb'):
+                line += f", process peak {memory['peak_process_rss_mb']:.0f} MB"
+            lines.append(line)
+        if report['pdfs']:
+            lines.append("Slowest PDFs:")
+            for entry in report['pdfs'][:top_n]:
+                lines.append(f"  {entry['wall']:7.2f}s  {Path(entry['pdf']).name}")
+        if report.get('profiles'):
+            lines.append(f"Profiled PDFs (over {report['options']['profile_threshold']}s), top functions by "
+                         f"cumulative time:")
+            for entry in report['profiles'][:top_n]:
+                memory = f", traced peak {entry['traced_peak_mb']:.0f} MB" if 'traced_peak_mb' in entry else ""
+                lines.append(f"  {entry['wall']:7.2f}s  {Path(entry['pdf']).name}{memory} -> {entry['profile']}")
+                for function in entry['top'][:3]:
+                    lines.append(f"      {function['cumulative_seconds']:7.2f}s  {function['function']}")
+        return lines
+    
+    def discover_folder_pairs(self, stats: Optional[Dict] = None,
+                              quiet: bool = False) -> List[Tuple[Optional[Path], Path, str]]:
+        """Find all Material CoC folders and their corresponding Excel folders (search up to depth 3)
+        
+        quiet skips logging each pair, for callers that rescan and log only what changed.
+        """
+        if stats is None:
+            stats = {'fai_folders': 0, 'coc_folders': 0}
         
         # Search for Material CoC folders up to depth 3 (these are stable)
         coc_folders = []
@@ -543,6 +2822,9 @@ class PDFExcelProcessor:
             try:
                 for item in directory.iterdir():
                     if item.is_dir():
+                        if item == self.output_folder:
+                            # Output subfolders are named after the CoC folders they came from
+                            continue
                         if item.name.startswith('Material CoC'):
                             coc_folders.append(item)
                         # Recurse into subdirectories
@@ -600,12 +2882,408 @@ class PDFExcelProcessor:
             if excel_folder and excel_folder.exists():
                 stats['fai_folders'] += 1
                 folder_pairs.append((excel_folder, coc_folder, identifier))
-                logger.info(f"Paired: {excel_folder.name} <-> {coc_folder.name}")
+                if not quiet:
+                    logger.info(f"Paired: {excel_folder.name} <-> {coc_folder.name}")
             else:
-                logger.warning(f"No Excel folder found for {coc_folder.name}. Tried: {', '.join(potential_names)}")
+                if not quiet:
+                    logger.warning(f"No Excel folder found for {coc_folder.name}. Tried: {', '.join(potential_names)}")
                 # Still add the CoC folder even without Excel folder
                 folder_pairs.append((None, coc_folder, identifier))
         
+        return folder_pairs
+    
+    def _journal_excel_key(self, excel_file: Path) -> str:
+        """Identify an Excel file in the journal; the stamp changes whenever the file is edited"""
+        try:
+            name = excel_file.relative_to(self.base_path).as_posix()
+        except ValueError:
+            name = str(excel_file)
+        stat = excel_file.stat()
+        return f"{name}|{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def load_journal(self) -> Dict[str, Dict]:
+        """Finished rows of earlier runs by journal key (the latest record wins)"""
+        rows = {}
+        for record in RunJournal.load(self.journal_path):
+            if record.get('type') == 'row' and 'key' in record:
+                rows[record['key']] = record['row']
+        return rows
+    
+    @staticmethod
+    def worker_count() -> int:
+        """Number of PDFs processed in parallel"""
+        return min(8, os.cpu_count() or 4)  # Use up to 8 threads
+    
+    def open_worker_pool(self, pool: Optional[ThreadPoolExecutor] = None) -> ThreadPoolExecutor:
+        """Keep one thread pool for all following runs instead of starting one per run
+        
+        Used by long-running callers such as FolderWatcher; pool is an existing pool to
+        use instead, e.g. the job server's. A worker abandoned after a timeout keeps its
+        thread until it returns, so close_worker_pool() when done.
+        """
+        if pool is not None:
+            self._worker_pool = pool
+        elif self._worker_pool is None:
+            self._worker_pool = ThreadPoolExecutor(max_workers=self.worker_count(), thread_name_prefix='pdf-worker')
+        return self._worker_pool
+    
+    def close_worker_pool(self):
+        """Shut down the pool started by open_worker_pool()"""
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown(wait=False, cancel_futures=True)
+            self._worker_pool = None
+    
+    def _run_pdf_tasks(self, pdf_tasks: List[PDFTask], row_results: List[ResultRow], stats: Dict,
+                       should_stop, detailed_callback=None, result_callback=None,
+                       journal: Optional[RunJournal] = None):
+        """Search/highlight the PDFs of pdf_tasks in a thread pool and fill in row_results
+        
+        Every PDF is probed first (estimate_pdf_cost) and the tasks are submitted
+        longest-processing-time first, so a large scanned packet does not start last
+        and keep one worker busy after the rest of the pool is idle. The same
+        estimates weight the progress (45-90%) and the time-left estimate.
+        
+        A task is only started while the estimated memory of all PDFs in flight stays
+        within resolve_memory_budget(). When the next task in line does not fit, smaller
+        ones may start in the memory left over after reserving room for it; a task that
+        exceeds the whole budget runs on its own.
+        
+        Each task gets a TaskBudget of pdf_timeout seconds, counted from when it starts
+        running. Workers check it between pages, and the Tesseract/Poppler subprocesses
+        are killed when it runs out or the user presses Stop. A worker stuck in native
+        code past its deadline plus TIMEOUT_GRACE_SECONDS is abandoned and reported as
+        timed out so one corrupt PDF cannot hang the whole run.
+        
+        PDFs are hashed by content after discovery, since the same supplier certificate is
+        often copied into many CoC folders. Tasks with identical content and part number
+        are analysed once and the other copies get their highlighted output copied from
+        it. Copies searched for different part numbers share OCR pages through the run's
+        OCR cache, and are never run at the same time so the later one finds them cached.
+        """
+        max_workers = self.worker_count()
+        
+        if detailed_callback:
+            detailed_callback(f"Step 4: Estimating cost of {len(pdf_tasks)} PDFs...", 45)
+        hashes = {}
+        for task in pdf_tasks:
+            if should_stop():
+                break
+            # Rows pointing at the same file are only hashed once
+            if task.pdf_path not in hashes:
+                with self.run_timings.stage('content_hash'):
+                    hashes[task.pdf_path] = self.content_hash(task.pdf_path)
+            task.content_hash = hashes[task.pdf_path]
+        
+        # One analysis per (content, part number); the other tasks become its duplicates
+        leaders = {}
+        unique_tasks = []
+        for task in pdf_tasks:
+            content = task.content_hash
+            key = (content, str(task.part_number).strip()) if content else (None, task.result_index)
+            if key in leaders:
+                leaders[key]['duplicates'].append(task)
+            else:
+                leaders[key] = task
+                unique_tasks.append(task)
+        duplicates_collapsed = len(pdf_tasks) - len(unique_tasks)
+        stats['duplicates_collapsed'] += duplicates_collapsed
+        
+        # Contents still searched more than once keep their OCR words until the last search ends
+        content_refs = {}
+        for task in unique_tasks:
+            if task.content_hash:
+                content_refs[task.content_hash] = content_refs.get(task.content_hash, 0) + 1
+        shared_contents = {content for content, refs in content_refs.items() if refs > 1}
+        if not self._ocr_cache.shared:
+            self._ocr_cache.reset(shared_contents)
+        
+        with self.run_timings.stage('cost_probe'):
+            for task in unique_tasks:
+                if should_stop():
+                    break
+                task.cost = self.estimate_pdf_cost(task.pdf_path)
+        for task in unique_tasks:
+            if task.cost is None:
+                task.cost = {'pages': 0, 'bytes': 0, 'has_text': False, 'ocr': False, 'seconds': 0.0,
+                             'memory': self.MEMORY_BASE_MB * 2**20}
+        unique_tasks.sort(key=lambda task: task.cost['seconds'], reverse=True)
+        
+        total_cost = sum(task.cost['seconds'] for task in unique_tasks) or 1.0
+        memory_budget = self.resolve_memory_budget()
+        self.schedule_report = {
+            'order': 'longest_first',
+            'workers': max_workers,
+            'memory_budget_mb': round(memory_budget / 2**20, 1),
+            'estimated_seconds': total_cost,
+            'estimated_ocr_pdfs': sum(1 for task in unique_tasks if task.cost['ocr']),
+            'estimated_pages': sum(task.cost['pages'] for task in unique_tasks),
+            'unique_pdfs': len(unique_tasks),
+            'duplicates_collapsed': duplicates_collapsed,
+            'shared_ocr_contents': len(shared_contents),
+        }
+        
+        if detailed_callback:
+            message = (f"Step 5: Processing {len(unique_tasks)} PDFs in parallel with {max_workers} threads, "
+                       f"largest first (estimated {self.format_duration(total_cost / max_workers)})")
+            if duplicates_collapsed:
+                message += f"; {duplicates_collapsed} duplicate PDFs reuse their results"
+            detailed_callback(message + "...", 45)
+        
+        stop_event = threading.Event()
+        budgets = {}
+        profiler = None
+        if self.profile_threshold is not None:
+            run_dir = self.profile_dir / datetime.now().strftime('run_%Y%m%d_%H%M%S')
+            profiler = PDFProfiler(self.profile_threshold, run_dir, self.profile_mode, self.profile_memory,
+                                   self.PROFILE_TOP_N)
+        
+        def process_single_pdf(task):
+            """Process a single PDF in a thread"""
+            budget = TaskBudget(self.pdf_timeout, stop_event)
+            budgets[task.result_index] = budget
+            started = time.perf_counter()
+            try:
+                budget.check()
+                with profiler.profile(task.pdf_path, task.part_number) if profiler else nullcontext():
+                    found, output_path, match_pages = self.search_and_highlight_pages(
+                        task.pdf_path, 
+                        task.part_number,
+                        source_folder=task.source_folder,
+                        budget=budget,
+                        content_key=(task.content_hash if self._ocr_cache.shared or
+                                     task.content_hash in shared_contents else None)
+                    )
+                status = 'Yes' if found and output_path else 'No'
+            except TaskTimedOut:
+                logger.warning(f"Timed out after {self.pdf_timeout}s: {task.pdf_path}")
+                status, output_path, match_pages = 'Timed Out', None, []
+            except TaskCancelled:
+                status, output_path, match_pages = 'Cancelled', None, []
+            except Exception as e:
+                logger.error(f"Error processing PDF {task.pdf_path}: {e}")
+                status, output_path, match_pages = 'No', None, []
+            return task.result_index, status, output_path, match_pages, time.perf_counter() - started
+        
+        def record(task, status, output_path, match_pages=None, seconds=None):
+            result = row_results[task.result_index]
+            result.part_found = status
+            if status == 'Yes':
+                stats['parts_highlighted'] += 1
+                result.highlighted_pdf = output_path.name
+                result.source_folder = task.source_folder
+                self.processed_pdfs.append(output_path)
+            else:
+                result.highlighted_pdf = ''
+                if status == 'Timed Out':
+                    stats['pdfs_timed_out'] += 1
+            result.match_pages = list(match_pages or [])
+            result.pdf_seconds = seconds
+            if journal and status != 'Cancelled' and task.journal_key:
+                journal.append({'type': 'row', 'key': task.journal_key, 'row': result.as_dict()})
+            if result_callback:
+                result_callback(result.as_dict())
+        
+        def finish(task, status, output_path, match_pages=None, seconds=None):
+            """Record an analysed task and the duplicates sharing its result; returns the rows recorded"""
+            record(task, status, output_path, match_pages, seconds)
+            for duplicate in task.duplicates:
+                started = time.perf_counter()
+                timings = StageTimings()
+                dup_status, dup_output, dup_pages = status, None, list(match_pages or [])
+                if status == 'Yes':
+                    try:
+                        with timings.stage('duplicate_copy'):
+                            dup_output = self.copy_highlighted_output(output_path, duplicate.pdf_path,
+                                                                      duplicate.source_folder)
+                    except Exception as e:
+                        logger.error(f"Could not copy highlighted output for {duplicate.pdf_path}: {e}")
+                        dup_status, dup_pages = 'No', []
+                elif status != 'Cancelled':
+                    dup_pages = []
+                wall = time.perf_counter() - started
+                if status != 'Cancelled':
+                    self._record_pdf_timings(duplicate.pdf_path, duplicate.part_number, dup_status == 'Yes',
+                                             wall, timings, 'duplicate', dup_pages, duplicate_of=task.pdf_path)
+                record(duplicate, dup_status, dup_output, dup_pages, wall)
+            content = task.content_hash
+            if content in content_refs and not self._ocr_cache.shared:
+                content_refs[content] -= 1
+                if content_refs[content] <= 0:
+                    self._ocr_cache.release(content)
+            return 1 + len(task.duplicates)
+        
+        pool_wall_start = time.perf_counter()
+        pool_cpu_start = time.thread_time()
+        executor = self._worker_pool or ThreadPoolExecutor(max_workers=max_workers)
+        if profiler:
+            profiler.start()
+        waiting = list(unique_tasks)
+        futures = {}
+        pending = set()
+        running_contents = set()
+        in_flight_memory = 0
+        peak_memory = 0
+        memory_waits = 0
+        
+        def admit():
+            """Start waiting tasks, in order, while workers are free and the memory budget allows"""
+            nonlocal in_flight_memory, peak_memory, memory_waits
+            reserved = 0
+            for task in list(waiting):
+                if len(pending) >= max_workers:
+                    break
+                if task.content_hash in running_contents:
+                    # Wait for the copy being read now so this one can reuse its OCR pages
+                    continue
+                memory = task.cost['memory']
+                if not pending or in_flight_memory + reserved + memory <= memory_budget:
+                    waiting.remove(task)
+                    future = executor.submit(process_single_pdf, task)
+                    futures[future] = task
+                    pending.add(future)
+                    if task.content_hash in shared_contents:
+                        running_contents.add(task.content_hash)
+                    in_flight_memory += memory
+                    peak_memory = max(peak_memory, in_flight_memory)
+                elif not reserved:
+                    # Keep room for the first task that did not fit so it is not starved
+                    reserved = memory
+                    memory_waits += 1
+        
+        try:
+            completed = 0
+            done_cost = 0.0
+            admit()
+            
+            while pending:
+                done, pending = wait(pending, timeout=self.CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    task = futures[future]
+                    in_flight_memory -= task.cost['memory']
+                    running_contents.discard(task.content_hash)
+                    if future.cancelled():
+                        finish(task, 'Cancelled', None)
+                        continue
+                    try:
+                        _, status, output_path, match_pages, seconds = future.result()
+                    except Exception as e:
+                        logger.error(f"Error getting result from thread: {e}")
+                        status, output_path, match_pages, seconds = 'No', None, [], None
+                    completed += finish(task, status, output_path, match_pages, seconds)
+                    done_cost += task.cost['seconds']
+                    if detailed_callback:
+                        # Time left scales the observed time by the estimated work remaining
+                        elapsed = time.perf_counter() - pool_wall_start
+                        eta = elapsed * (total_cost - done_cost) / done_cost if done_cost else None
+                        progress = 45 + min(1.0, done_cost / total_cost) * 45
+                        message = f"Step 5: Processed {completed}/{len(pdf_tasks)} PDFs"
+                        if eta is not None:
+                            message += f", about {self.format_duration(eta)} left"
+                        file_info = {
+                            'filename': task.pdf_path.name,
+                            'current': completed,
+                            'total': len(pdf_tasks),
+                            'eta': eta,
+                        }
+                        detailed_callback(message, progress, file_info)
+                
+                if should_stop() and not stop_event.is_set():
+                    # Running tasks notice the event at their next check; waiting ones never start
+                    stop_event.set()
+                    for future in pending:
+                        future.cancel()
+                    for task in waiting:
+                        finish(task, 'Cancelled', None)
+                    waiting.clear()
+                
+                # Give up on workers stuck past their deadline (e.g. hung inside a corrupt PDF)
+                for future in list(pending):
+                    task = futures[future]
+                    budget = budgets.get(task.result_index)
+                    if budget and budget.expired(self.TIMEOUT_GRACE_SECONDS):
+                        logger.warning(f"Abandoning unresponsive worker for {task.pdf_path}")
+                        pending.discard(future)
+                        # Its memory is released from the estimate even though the thread lingers
+                        in_flight_memory -= task.cost['memory']
+                        running_contents.discard(task.content_hash)
+                        completed += finish(task, 'Timed Out', None)
+                        done_cost += task.cost['seconds']
+                
+                if waiting and not stop_event.is_set():
+                    admit()
+        finally:
+            if executor is self._worker_pool:
+                # The pool outlives the run; only drop what this run still has queued
+                for future in pending:
+                    future.cancel()
+            else:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if not self._ocr_cache.shared:
+                self._ocr_cache.reset()
+            if profiler:
+                profiler.stop()
+                self.profile_reports.extend(profiler.outliers)
+        
+        self.run_timings.add_time('pdf_pool', time.perf_counter() - pool_wall_start,
+                                  time.thread_time() - pool_cpu_start)
+        self.schedule_report['peak_in_flight_memory_mb'] = round(peak_memory / 2**20, 1)
+        self.schedule_report['memory_waits'] = memory_waits
+    
+    def process_directory(self, progress_callback=None, detailed_callback=None, stop_flag=None,
+                          result_callback=None, resume: bool = False,
+                          folder_pairs: Optional[List[Tuple[Optional[Path], Path, str]]] = None) -> pd.DataFrame:
+        """Process all FAI folders and Material CoC folders in the directory
+        
+        folder_pairs, if given, limits the run to those (excel_folder, coc_folder,
+        identifier) pairs instead of discovering all of them.
+        
+        result_callback, if given, is called with a copy of each result row as soon as
+        its status is final, so callers can show results while the run is still going.
+        
+        Finished rows are appended to the run journal (journal_path). With resume=True,
+        rows already in the journal are taken from it instead of being processed again;
+        rows of Excel files changed since then, and cancelled rows, are redone. Raises
+        JournalInUse if another run is using the same journal.
+        """
+        all_results = []
+        
+        # Fresh instrumentation for this run
+        self.run_timings = StageTimings()
+        self.pdf_reports = []
+        self.run_report = {}
+        self.schedule_report = {}
+        self.profile_reports = []
+        self.processed_pdfs = []
+        run_wall_start = time.perf_counter()
+        run_cpu_start = time.process_time()
+        
+        # Helper to check if we should stop
+        def should_stop():
+            return stop_flag and stop_flag()
+        stats = {
+            'fai_folders': 0,
+            'coc_folders': 0,
+            'excel_files': 0,
+            'excel_rows': 0,
+            'pdfs_found': 0,
+            'parts_highlighted': 0,
+            'pdfs_timed_out': 0,
+            'rows_resumed': 0,
+            'duplicates_collapsed': 0
+        }
+        
+        # Step 1: Find all Material CoC folders and their corresponding Excel folders (search up to depth 3)
+        if detailed_callback:
+            detailed_callback("Step 1: Finding folder pairs...", 0)
+        
+        if folder_pairs is None:
+            with self.run_timings.stage('discovery'):
+                folder_pairs = self.discover_folder_pairs(stats)
+        else:
+            stats['coc_folders'] = len(folder_pairs)
+            stats['fai_folders'] = sum(1 for excel_folder, _, _ in folder_pairs if excel_folder)
+        
         if detailed_callback:
             detailed_callback(f"Step 1: Found {stats['coc_folders']} CoC folders, {stats['fai_folders']} Excel folders", 10)
         
@@ -614,15 +3292,16 @@ class PDFExcelProcessor:
             detailed_callback("Step 2: Finding Excel files...", 15)
         
         excel_files_to_process = []
-        for excel_folder, coc_folder, identifier in folder_pairs:
-            # Skip if no Excel folder found
-            if not excel_folder:
-                continue
-            
-            excel_files = list(excel_folder.glob('*.xlsx')) + list(excel_folder.glob('*.xls'))
-            for excel_file in excel_files:
-                excel_files_to_process.append((excel_file, excel_folder, coc_folder, identifier))
-                stats['excel_files'] += 1
+        with self.run_timings.stage('discovery'):
+            for excel_folder, coc_folder, identifier in folder_pairs:
+                # Skip if no Excel folder found
+                if not excel_folder:
+                    continue
+                
+                excel_files = list(excel_folder.glob('*.xlsx')) + list(excel_folder.glob('*.xls'))
+                for excel_file in excel_files:
+                    excel_files_to_process.append((excel_file, excel_folder, coc_folder, identifier))
+                    stats['excel_files'] += 1
         
         if detailed_callback:
             detailed_callback(f"Step 2: Found {stats['excel_files']} Excel files", 20)
@@ -631,180 +3310,1298 @@ class PDFExcelProcessor:
             logger.error("No Excel files found in any FAI folder")
             if detailed_callback:
                 detailed_callback("Error: No Excel files found", 100)
+            self.build_run_report(stats, time.perf_counter() - run_wall_start, time.process_time() - run_cpu_start)
             return pd.DataFrame()
         
-        # Step 3: Parse Excel files and extract rows
-        if detailed_callback:
-            detailed_callback("Step 3: Parsing Excel files...", 25)
+        # Finished rows go to the journal as they complete, so an interrupted run can resume
+        # (the journal is locked first, so no other run can rewrite it while it is read)
+        journal = RunJournal(self.journal_path, resume=resume)
+        journaled = self.load_journal() if resume else {}
+        journal.append({'type': 'run', 'started_at': datetime.now().isoformat(timespec='seconds'), 'resume': resume})
+        
+        try:
+            # Step 3: Parse Excel files and extract rows
+            if detailed_callback:
+                detailed_callback("Step 3: Parsing Excel files...", 25)
+            
+            total_files = len(excel_files_to_process)
+            pdf_tasks = []
+            for idx, (excel_file, excel_folder, coc_folder, identifier) in enumerate(excel_files_to_process):
+                # Check if we should stop
+                if should_stop():
+                    logger.info("Processing stopped by user")
+                    break
+                
+                progress = 25 + (idx / total_files) * 20  # Progress from 25% to 45%
+                
+                # Update with file info
+                file_info = {
+                    'filename': excel_file.name,
+                    'current': idx + 1,
+                    'total': total_files
+                }
+                
+                if progress_callback:
+                    progress_callback(f"Processing {excel_file.name}...", progress, file_info)
+                
+                logger.info(f"Processing Excel file: {excel_file}")
+                
+                # Extract data from Excel
+                with self.run_timings.stage('excel_parse'):
+                    df = self.read_excel_tables(excel_file)
+                
+                if df.empty:
+                    logger.warning(f"No valid data found in {excel_file}")
+                    continue
+                
+                stats['excel_rows'] += len(df)
+                
+                excel_key = self._journal_excel_key(excel_file)
+                with self.run_timings.stage('pdf_match'):
+                    candidates = self.list_coc_pdfs(coc_folder) if coc_folder else []
+                source_folder_name = coc_folder.name if coc_folder else None
+                
+                # Process each row - collect tasks for parallel processing across all Excel files
+                # First pass: prepare all rows and identify PDFs to process. The table is read
+                # column-wise and every row becomes a ResultRow.
+                table_rows = zip(df['Cablex P/N'].tolist(), df['FAIR Identifier'].tolist(),
+                                 df['Part Number'].tolist(), df['Sheet'].tolist())
+                for idx_row, (cablex_pn, fair_id, part_number, sheet) in enumerate(table_rows):
+                    # Check if we should stop
+                    if should_stop():
+                        break
+                    
+                    journal_key = f"{excel_key}|{idx_row}"
+                    if journal_key in journaled:
+                        # Finished in an earlier run: reuse the journaled row as-is
+                        result = journaled[journal_key]
+                        stats['rows_resumed'] += 1
+                        if result.get('PDF Status') == 'Found':
+                            stats['pdfs_found'] += 1
+                        if result.get('Part Number Found') == 'Yes':
+                            stats['parts_highlighted'] += 1
+                        elif result.get('Part Number Found') == 'Timed Out':
+                            stats['pdfs_timed_out'] += 1
+                        if result_callback:
+                            result_callback(dict(result))
+                        all_results.append(ResultRow.from_dict(result))
+                        continue
+                    
+                    result = ResultRow(cablex_pn=cablex_pn, fair_id=fair_id, part_number=part_number, sheet=sheet,
+                                       fai_folder=identifier, excel_file=excel_file.name,
+                                       excel_folder_name=excel_folder.name)
+                    
+                    # Check if PDF exists
+                    pdf_path = None
+                    if coc_folder:
+                        with self.run_timings.stage('pdf_match'):
+                            pdf_path = self.find_matching_pdf(cablex_pn, fair_id, coc_folder, candidates)
+                    
+                    if pdf_path:
+                        stats['pdfs_found'] += 1
+                        result.pdf_status = 'Found'
+                        result.pdf_file = pdf_path.name
+                        
+                        # Add to tasks for parallel processing
+                        pdf_tasks.append(PDFTask(pdf_path, part_number, source_folder_name, len(all_results),
+                                                 journal_key))
+                    else:
+                        result.pdf_status = 'Not Found'
+                        result.pdf_file = ''
+                        result.part_found = 'N/A'
+                        result.highlighted_pdf = ''
+                        result.match_pages = []
+                        result.pdf_seconds = None
+                        journal.append({'type': 'row', 'key': journal_key, 'row': result.as_dict()})
+                        if result_callback:
+                            result_callback(result.as_dict())
+                    
+                    all_results.append(result)
+            
+            # Steps 4-5: Process PDFs of all Excel files in one pool, most expensive first
+            if pdf_tasks and not should_stop():
+                self._run_pdf_tasks(pdf_tasks, all_results, stats, should_stop, detailed_callback, result_callback,
+                                    journal)
+            elif pdf_tasks:
+                for task in pdf_tasks:
+                    result = all_results[task.result_index]
+                    result.part_found = 'Cancelled'
+                    result.highlighted_pdf = ''
+                    result.match_pages = []
+                    result.pdf_seconds = None
+                    if result_callback:
+                        result_callback(result.as_dict())
+            
+        finally:
+            journal.close()
+        
+        # Step 6: Create final DataFrame
+        if detailed_callback:
+            detailed_callback("Step 6: Creating final output CSV...", 90)
+        
+        with self.run_timings.stage('assemble'):
+            self.results_df = results_from_rows(all_results)
+        
+        self.build_run_report(stats, time.perf_counter() - run_wall_start, time.process_time() - run_cpu_start)
+        if self.results_db:
+            self.record_history()
+        
+        # Final summary
+        summary = f"Complete! Processed {stats['excel_rows']} rows from {stats['excel_files']} Excel files. "
+        summary += f"Found {stats['pdfs_found']} PDFs, highlighted {stats['parts_highlighted']} part numbers."
+        if stats['pdfs_timed_out']:
+            summary += f" {stats['pdfs_timed_out']} PDFs timed out."
+        if stats['rows_resumed']:
+            summary += f" {stats['rows_resumed']} rows resumed from the journal."
+        if stats['duplicates_collapsed']:
+            summary += f" {stats['duplicates_collapsed']} duplicate PDFs collapsed."
+        
+        if detailed_callback:
+            detailed_callback(summary, 100)
+        elif progress_callback:
+            progress_callback(summary, 100)
+            
+        return self.results_df
+    
+    def options(self) -> Dict:
+        """The OPTION_NAMES settings of this processor, to build an identical one elsewhere"""
+        return {name: getattr(self, name) for name in self.OPTION_NAMES}
+    
+    def create_work_queue(self, queue_path) -> int:
+        """Split the folder's pairs into the work units of a WorkQueue; returns the number of units
+        
+        QueueWorkers (python pdf_excel_processor.py --work QUEUE) on any host then process
+        the units with this processor's options, and collect_work_queue() merges them.
+        """
+        with self.run_timings.stage('discovery'):
+            folder_pairs = self.discover_folder_pairs()
+        return WorkQueue(queue_path).create(self.base_path, self.options(), folder_pairs)
+    
+    def collect_work_queue(self, queue_path, progress_callback=None, stop_flag=None,
+                           poll_seconds: float = 2.0) -> pd.DataFrame:
+        """Wait until every unit of the queue is done or failed and merge them into results_df
+        
+        The merged run gets a run report (stages, counters and PDFs summed over the units)
+        and is recorded in results_db like a local run. With stop_flag, whatever is
+        finished when it turns true is merged.
+        """
+        work_queue = WorkQueue(queue_path)
+        while True:
+            counts = work_queue.counts()
+            total = sum(counts.values())
+            finished = counts['done'] + counts['failed']
+            if progress_callback:
+                progress_callback(f"{finished}/{total} work units finished, {counts['leased']} in progress",
+                                  finished / total * 100 if total else 100)
+            if finished >= total or (stop_flag and stop_flag()):
+                break
+            time.sleep(poll_seconds)
+        
+        meta = work_queue.meta()
+        self.run_timings = StageTimings()
+        self.pdf_reports = []
+        self.profile_reports = []
+        stats = {}
+        rows = []
+        workers = set()
+        retried = 0
+        failed = []
+        cpu = 0.0
+        for unit in work_queue.units():
+            if unit['attempts'] > 1:
+                retried += 1
+            if unit['state'] == 'failed':
+                failed.append(unit['identifier'])
+                logger.error(f"Work unit {unit['identifier']} failed: {unit['error']}")
+            if unit['state'] != 'done':
+                continue
+            workers.add(unit['worker'])
+            rows.extend(unit['rows'])
+            report = unit['report']
+            for name, value in report.get('stats', {}).items():
+                stats[name] = stats.get(name, 0) + value
+            for name, entry in report.get('stages', {}).items():
+                self.run_timings.add_time(name, entry['wall'], entry['cpu'], entry['calls'])
+            for name, amount in report.get('counters', {}).items():
+                self.run_timings.count(name, amount)
+            self.pdf_reports.extend(report.get('pdfs', []))
+            self.profile_reports.extend(report.get('profiles', []))
+            cpu += report.get('cpu_seconds', 0.0)
+        stats['units_failed'] = len(failed)
+        
+        self.schedule_report = {
+            'order': 'work_queue',
+            'queue': str(work_queue.path),
+            'units': sum(work_queue.counts().values()),
+            'workers': sorted(workers),
+            'retried_units': retried,
+            'failed_units': failed,
+        }
+        with self.run_timings.stage('assemble'):
+            self.results_df = apply_result_schema(pd.DataFrame(rows))
+        wall = time.time() - float(meta.get('created_ts', time.time()))
+        self.build_run_report(stats, wall, cpu)
+        if self.results_db:
+            self.record_history()
+        return self.results_df
+    
+    def record_history(self) -> Optional[int]:
+        """Add the last run to the SQLite history (results_db); returns the run id"""
+        try:
+            run_id = ResultsStore(self.results_db).record_run(self.run_report, self.results_df)
+            logger.info(f"Run {run_id} recorded in {self.results_db}")
+            return run_id
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Could not record run in {self.results_db}: {e}")
+            return None
+    
+    def save_results(self, output_path: str = None, columnar_formats: Tuple[str, ...] = ()) -> str:
+        """Save results to CSV file
+        
+        columnar_formats ('parquet', 'arrow') additionally writes the typed results next
+        to the CSV with the same name and the matching extension.
+        """
+        if self.results_df.empty:
+            raise ValueError("No results to save. Run process_directory first.")
+            
+        if not output_path:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_path = self.base_path / f"processing_results_{timestamp}.csv"
+        else:
+            output_path = Path(output_path)
+            
+        results_for_csv(self.results_df).to_csv(output_path, index=False)
+        logger.info(f"Results saved to {output_path}")
+        
+        for fmt in columnar_formats:
+            self.export_results(output_path.with_suffix(self.COLUMNAR_SUFFIXES[fmt]), fmt)
+        
+        if self.run_report:
+            self.save_run_report(output_path.with_name(f"{output_path.stem}_report.json"))
+        return str(output_path)
+    
+    def export_results(self, output_path, fmt: Optional[str] = None) -> str:
+        """Write the typed results as Parquet or Arrow IPC (Feather v2)
+        
+        fmt is 'parquet' or 'arrow'; by default it follows the file extension. Statuses
+        are stored as dictionary-encoded strings, 'Match Pages' as list<int32> and
+        'PDF Seconds' as float64, so the file loads without any re-typing.
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet/Arrow export needs pyarrow. Install it with: pip install pyarrow")
+        if self.results_df.empty:
+            raise ValueError("No results to save. Run process_directory first.")
+        
+        output_path = Path(output_path)
+        if fmt is None:
+            fmt = 'parquet' if output_path.suffix.lower() == '.parquet' else 'arrow'
+        if fmt not in self.COLUMNAR_SUFFIXES:
+            raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(self.COLUMNAR_SUFFIXES)}")
+        
+        results = apply_result_schema(self.results_df)
+        table = pa.Table.from_pandas(results, preserve_index=False)
+        fields = []
+        for field in table.schema:
+            dtype = RESULT_SCHEMA.get(field.name)
+            if field.name == 'Match Pages':
+                field = pa.field(field.name, pa.list_(pa.int32()))
+            elif isinstance(dtype, tuple):
+                field = pa.field(field.name, pa.dictionary(pa.int8(), pa.string()))
+            elif dtype == 'string':
+                field = pa.field(field.name, pa.string())
+            fields.append(field)
+        table = table.cast(pa.schema(fields))
+        
+        if fmt == 'parquet':
+            pq.write_table(table, output_path, compression='zstd')
+        else:
+            feather.write_feather(table, output_path, compression='zstd')
+        logger.info(f"Results exported to {output_path}")
+        return str(output_path)
+    
+    def save_run_report(self, output_path) -> str:
+        """Save the per-stage timing report of the last run as JSON"""
+        output_path = Path(output_path)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.run_report, f, indent=2)
+        logger.info(f"Run report saved to {output_path}")
+        return str(output_path)
+
+
+class FolderWatcher:
+    """Watch mode: keeps processing the folder pairs whose workbooks or PDFs change
+    
+    Each poll discovers the folder pairs under the processor's base path and takes a
+    snapshot (name, size, modification time) of their Excel files and CoC PDFs. A pair
+    whose snapshot differs from the one it was last processed with is pending, and is
+    processed once nothing in it has changed for settle_seconds, so files still being
+    copied are not read half-written. Pairs that settle together go through one
+    process_directory run on the processor's persistent worker pool, and every run is
+    recorded in the processor's results store (results_db).
+    
+    The snapshots of processed pairs are kept in STATE_NAME under the base path, so after
+    a restart only pairs changed in the meantime are processed. On the very first start
+    the existing pairs are only recorded, unless process_existing is set. With watchdog
+    installed, filesystem events wake the poll early instead of waiting for interval.
+    Batches are journaled to JOURNAL_NAME, so the journal of a full run stays resumable.
+    """
+    
+    STATE_NAME = 'watch_state.json'
+    # Every batch starts a new journal; a separate file keeps it from replacing the one
+    # an interrupted full run over the same base path would resume from
+    JOURNAL_NAME = 'watch_journal.jsonl'
+    # Excel lock files (~$Book.xlsx) and the highlighted copies written next to the
+    # originals are not inputs, so they never make a pair pending
+    IGNORED_PREFIXES = ('~$', 'highlighted_')
+    
+    def __init__(self, processor: PDFExcelProcessor, interval: float = 10.0, settle_seconds: float = 5.0,
+                 process_existing: bool = False):
+        if processor.destructive:
+            raise ValueError("Watch mode cannot replace the original PDFs: every highlight would look like a new change")
+        self.processor = processor
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self.process_existing = process_existing
+        self.state_path = processor.base_path / self.STATE_NAME
+        processor.journal_path = processor.base_path / self.JOURNAL_NAME
+        # CoC folder (relative to the base path) -> snapshot it was last processed with
+        self.processed = self._load_state()
+        # CoC folder -> {'snapshot', 'changed_at', 'detected_at'} of pairs waiting to settle
+        self.pending = {}
+        # Summaries of the latest runs
+        self.batches = deque(maxlen=100)
+        # CoC folder -> Excel folder it was paired with at the last scan, to log only changes
+        self._pairing = {}
+        self.stop_event = threading.Event()
+        self._wake = threading.Event()
+    
+    def _load_state(self) -> Dict[str, List]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('processed', {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable watch state {self.state_path}: {e}")
+            return {}
+    
+    def _save_state(self):
+        temp_path = self.state_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'processed': self.processed}, f)
+        os.replace(temp_path, self.state_path)
+    
+    def _key(self, coc_folder: Path) -> str:
+        try:
+            return coc_folder.relative_to(self.processor.base_path).as_posix()
+        except ValueError:
+            return str(coc_folder)
+    
+    def snapshot_pair(self, excel_folder: Optional[Path], coc_folder: Path) -> List[List]:
+        """[name, size, mtime_ns] of the pair's workbooks and PDFs, in a stable order"""
+        files = []
+        if excel_folder:
+            files += list(excel_folder.glob('*.xlsx')) + list(excel_folder.glob('*.xls'))
+        files += list(coc_folder.glob('*.pdf'))
+        snapshot = []
+        for path in files:
+            if path.name.startswith(self.IGNORED_PREFIXES):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                # Deleted or renamed since the listing; the next poll sees the result
+                continue
+            snapshot.append([self._key(path), stat.st_size, stat.st_mtime_ns])
+        return sorted(snapshot)
+    
+    def scan(self) -> Dict[str, Tuple[Tuple[Optional[Path], Path, str], List[List]]]:
+        """Current folder pairs and their snapshots by CoC folder"""
+        pairs = self.processor.discover_folder_pairs(quiet=True)
+        self._log_pairing(pairs)
+        return {self._key(pair[1]): (pair, self.snapshot_pair(pair[0], pair[1])) for pair in pairs}
+    
+    def _log_pairing(self, pairs: List[Tuple[Optional[Path], Path, str]]):
+        """Log the pairs that are new or paired differently since the last scan"""
+        pairing = {self._key(coc_folder): excel_folder for excel_folder, coc_folder, _ in pairs}
+        for excel_folder, coc_folder, _ in pairs:
+            key = self._key(coc_folder)
+            if key in self._pairing and self._pairing[key] == excel_folder:
+                continue
+            if excel_folder:
+                logger.info(f"Paired: {excel_folder.name} <-> {coc_folder.name}")
+            else:
+                logger.warning(f"No Excel folder found for {coc_folder.name}")
+        for key in self._pairing.keys() - pairing.keys():
+            logger.info(f"Folder pair gone: {key}")
+        self._pairing = pairing
+    
+    def baseline(self):
+        """Record every current pair as processed without processing it"""
+        self.processed = {key: snapshot for key, (_, snapshot) in self.scan().items()}
+        self.pending = {}
+        self._save_state()
+        logger.info(f"Watching {len(self.processed)} existing folder pairs under {self.processor.base_path}")
+    
+    def poll_once(self) -> Optional[pd.DataFrame]:
+        """Scan once and process the pending pairs that have settled; returns their results"""
+        now = time.monotonic()
+        current = self.scan()
+        for key in set(self.processed) - set(current):
+            del self.processed[key]
+        
+        ready = []
+        for key, (pair, snapshot) in current.items():
+            if snapshot == self.processed.get(key):
+                self.pending.pop(key, None)
+                continue
+            entry = self.pending.get(key)
+            if entry is None or entry['snapshot'] != snapshot:
+                # New or still changing: (re)start its settle time
+                self.pending[key] = entry = {
+                    'snapshot': snapshot,
+                    'changed_at': now,
+                    'detected_at': entry['detected_at'] if entry else now,
+                }
+            # Modification times also catch files that changed before this watcher saw them
+            newest = max((mtime for _, _, mtime in snapshot), default=0) / 1e9
+            if now - entry['changed_at'] >= self.settle_seconds and time.time() - newest >= self.settle_seconds:
+                ready.append((key, pair))
+        for key in set(self.pending) - set(current):
+            del self.pending[key]
+        
+        if not ready:
+            return None
+        return self.process_pairs(ready)
+    
+    def process_pairs(self, ready: List[Tuple[str, Tuple[Optional[Path], Path, str]]]) -> pd.DataFrame:
+        """Process settled pairs in one run and mark them processed"""
+        identifiers = [pair[2] for _, pair in ready]
+        logger.info(f"Processing {len(ready)} changed folder pairs: {', '.join(identifiers)}")
+        started = time.perf_counter()
+        results = self.processor.process_directory(stop_flag=self.stop_event.is_set,
+                                                   folder_pairs=[pair for _, pair in ready])
+        seconds = time.perf_counter() - started
+        if self.stop_event.is_set():
+            # Cancelled rows do not count as processed; the pairs are picked up after a restart
+            return results
+        
+        latency = 0.0
+        for key, _ in ready:
+            entry = self.pending.pop(key)
+            self.processed[key] = entry['snapshot']
+            latency = max(latency, time.monotonic() - entry['detected_at'])
+        self._save_state()
+        batch = {
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'pairs': identifiers,
+            'rows': len(results),
+            'parts_highlighted': self.processor.run_report.get('stats', {}).get('parts_highlighted', 0),
+            'seconds': round(seconds, 3),
+            'latency_seconds': round(latency, 3),
+        }
+        self.batches.append(batch)
+        logger.info(f"Processed {batch['rows']} rows from {len(ready)} folder pairs in {seconds:.1f}s, "
+                    f"{latency:.1f}s after the change was first seen")
+        return results
+    
+    def _start_observer(self):
+        """Start watchdog notifications that wake the poll, if available"""
+        if not WATCHDOG_AVAILABLE:
+            return None
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+        wake = self._wake
+        
+        class WakeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+        
+        try:
+            observer = Observer()
+            observer.schedule(WakeHandler(), str(self.processor.base_path), recursive=True)
+            observer.start()
+            return observer
+        except OSError as e:
+            # e.g. the inotify watch limit; plain polling still works
+            logger.warning(f"Filesystem notifications unavailable, polling every {self.interval}s: {e}")
+            return None
+    
+    def run(self):
+        """Watch until stop() is called"""
+        self.processor.open_worker_pool()
+        observer = self._start_observer()
+        try:
+            if not self.processed and not self.process_existing:
+                self.baseline()
+            while not self.stop_event.is_set():
+                self._wake.clear()
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Watch poll failed: {e}")
+                # Pending pairs are looked at again once they may have settled
+                timeout = min(self.interval, self.settle_seconds) if self.pending else self.interval
+                deadline = time.monotonic() + timeout
+                while not self.stop_event.is_set() and time.monotonic() < deadline:
+                    if self._wake.wait(min(1.0, max(0.0, deadline - time.monotonic()))):
+                        # Let a burst of events pass before scanning again
+                        self._wake.clear()
+                        deadline = min(deadline, time.monotonic() + 1.0)
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            self.processor.close_worker_pool()
+    
+    def stop(self):
+        """Ask run() to return; a run in progress is cancelled"""
+        self.stop_event.set()
+
+
+def _json_row(row: Dict) -> Dict:
+    """Result row with missing values as None, for JSON"""
+    return {key: None if not isinstance(value, (list, tuple)) and pd.isna(value) else value
+            for key, value in row.items()}
+
+
+class QueueWorker:
+    """Worker that processes the units of a WorkQueue until none are left
+    
+    The processor is built from the options the coordinator stored in the queue, over
+    base_path (the base folder as this host mounts it; by default the coordinator's
+    path). Each unit is one process_directory run limited to its folder pair, on a
+    worker pool kept for the worker's lifetime. A background thread renews the unit's
+    lease; if the lease is lost anyway the unit is dropped, since another worker has it.
+    """
+    
+    def __init__(self, queue_path, base_path: Optional[str] = None, worker_id: Optional[str] = None,
+                 lease_seconds: float = WorkQueue.LEASE_SECONDS, poll_seconds: float = 2.0):
+        self.queue = WorkQueue(queue_path)
+        meta = self.queue.meta()
+        if 'base_path' not in meta:
+            raise ValueError(f"{queue_path} is not a work queue made by create_work_queue")
+        self.base_path = Path(base_path or meta['base_path'])
+        self.worker_id = worker_id or f"{platform.node()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.processor = PDFExcelProcessor(str(self.base_path), **meta['options'])
+        # Workers sharing the base folder must not write the same journal
+        self.processor.journal_path = (Path(tempfile.gettempdir()) /
+                                       f"fai_worker_{os.getpid()}_{PDFExcelProcessor.JOURNAL_NAME}")
+        self.stop_event = threading.Event()
+        self.units_done = 0
+    
+    def _pair(self, unit: Dict) -> Tuple[Optional[Path], Path, str]:
+        excel_folder = self.base_path / unit['excel_folder'] if unit['excel_folder'] else None
+        return excel_folder, self.base_path / unit['coc_folder'], unit['identifier']
+    
+    def process_unit(self, unit: Dict):
+        """Process one claimed unit and hand its results (or its failure) back to the queue"""
+        lease_lost = threading.Event()
+        finished = threading.Event()
+        
+        def keep_lease():
+            while not finished.wait(self.lease_seconds / 3):
+                if not self.queue.renew(unit['id'], self.worker_id, self.lease_seconds):
+                    lease_lost.set()
+                    return
+        
+        renewer = threading.Thread(target=keep_lease, daemon=True)
+        renewer.start()
+        try:
+            results = self.processor.process_directory(
+                stop_flag=lambda: self.stop_event.is_set() or lease_lost.is_set(),
+                folder_pairs=[self._pair(unit)]
+            )
+        except Exception as e:
+            finished.set()
+            logger.error(f"Work unit {unit['identifier']} failed on attempt {unit['attempt']}: {e}")
+            self.queue.fail(unit['id'], self.worker_id, f"{type(e).__name__}: {e}")
+            return
+        finished.set()
+        renewer.join()
+        
+        if lease_lost.is_set():
+            logger.warning(f"Lost the lease on work unit {unit['identifier']}; another worker has it")
+        elif self.stop_event.is_set():
+            self.queue.release(unit['id'], self.worker_id)
+        elif self.queue.complete(unit['id'], self.worker_id, [_json_row(row) for row in results.to_dict('records')],
+                                 self.processor.run_report):
+            self.units_done += 1
+            logger.info(f"Work unit {unit['identifier']} done: {len(results)} rows")
+    
+    def run(self) -> int:
+        """Claim and process units until the queue has none left (or stop()); returns units done"""
+        self.processor.open_worker_pool()
+        try:
+            while not self.stop_event.is_set():
+                unit = self.queue.claim(self.worker_id, self.lease_seconds)
+                if unit is None:
+                    counts = self.queue.counts()
+                    if not counts['pending'] and not counts['leased']:
+                        break
+                    # Others are still working; their units come back here if their leases run out
+                    self.stop_event.wait(self.poll_seconds)
+                    continue
+                self.process_unit(unit)
+        finally:
+            self.processor.close_worker_pool()
+            for path in (self.processor.journal_path, RunJournal.lock_path(self.processor.journal_path)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        logger.info(f"Worker {self.worker_id} finished {self.units_done} work units")
+        return self.units_done
+    
+    def stop(self):
+        self.stop_event.set()
+
+
+class ServerJob:
+    """One directory job of the JobServer and the events it has published
+    
+    While the job runs its rows and state changes are kept, but only the latest
+    PROGRESS_EVENTS progress events, so a client that joins late gets a snapshot: every
+    row so far and the recent progress. Once the job has ended and no client is still
+    streaming, only the state changes are kept; the rows are served from results.
+    """
+    
+    PROGRESS_EVENTS = 100
+    
+    def __init__(self, directory: str, options: Dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.directory = directory
+        self.options = options
+        self.state = 'queued'
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self.finished_at = None
+        self.error = None
+        # Clients waiting for this job; it is only cancelled when all of them give up
+        self.clients = 1
+        self.cancel_event = threading.Event()
+        self.results = pd.DataFrame()
+        self.report = {}
+        # Sequence number of the next event; events are numbered across all kinds
+        self.next_seq = 0
+        self._progress = deque(maxlen=self.PROGRESS_EVENTS)
+        # Rows and state changes, in sequence order
+        self._kept = []
+        # Event streams currently open on this job
+        self.streams = 0
+        self._condition = threading.Condition()
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in ('done', 'failed', 'cancelled')
+    
+    def publish(self, kind: str, **data):
+        with self._condition:
+            event = {'seq': self.next_seq, 'type': kind, **data}
+            self.next_seq += 1
+            (self._progress if kind == 'progress' else self._kept).append(event)
+            self._condition.notify_all()
+    
+    def set_state(self, state: str, **data):
+        self.state = state
+        if self.finished:
+            self.finished_at = datetime.now().isoformat(timespec='seconds')
+        self.publish('state', state=state, **data)
+        if self.finished:
+            with self._condition:
+                if not self.streams:
+                    self._compact()
+    
+    def _compact(self):
+        """Drop everything but the state changes of a finished job"""
+        self._progress.clear()
+        self._kept = [event for event in self._kept if event['type'] == 'state']
+    
+    def wait_events(self, since: int, timeout: float) -> List[Dict]:
+        """Events from sequence number since on, waiting up to timeout for the first one
+        
+        Dropped events (older progress, rows of a finished job) are skipped.
+        """
+        with self._condition:
+            if self.next_seq <= since and not self.finished:
+                self._condition.wait(timeout)
+            kept = self._kept[bisect.bisect_left(self._kept, since, key=lambda event: event['seq']):]
+            progress = [event for event in self._progress if event['seq'] >= since]
+            if not progress:
+                return kept
+            return sorted(kept + progress, key=lambda event: event['seq'])
+    
+    def open_stream(self):
+        with self._condition:
+            self.streams += 1
+    
+    def close_stream(self):
+        with self._condition:
+            self.streams -= 1
+            if self.finished and not self.streams:
+                self._compact()
+    
+    def summary(self) -> Dict:
+        return {
+            'id': self.id,
+            'directory': self.directory,
+            'options': self.options,
+            'state': self.state,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'clients': self.clients,
+            'events': self.next_seq,
+            'rows': len(self.results),
+            'stats': self.report.get('stats', {}),
+            'error': self.error,
+        }
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of JobServer (self.server.job_server)"""
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+    
+    def _send_json(self, data, status: int = 200):
+        body = json.dumps(data, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _route(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        return parts, urllib.parse.parse_qs(url.query)
+    
+    def _job(self, job_id: str) -> Optional[ServerJob]:
+        job = self.server.job_server.jobs.get(job_id)
+        if job is None:
+            self._send_json({'error': f'No job {job_id}'}, 404)
+        return job
+    
+    def do_GET(self):
+        server = self.server.job_server
+        parts, query = self._route()
+        if parts == ['status']:
+            self._send_json(server.status())
+        elif parts == ['jobs']:
+            self._send_json([job.summary() for job in server.jobs.values()])
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job:
+                self._send_json(job.summary())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            job = self._job(parts[1])
+            if job:
+                self._stream_events(job, int(query.get('since', ['0'])[0]))
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            job = self._job(parts[1])
+            if job:
+                self._send_json([_json_row(row) for row in job.results.to_dict('records')])
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'report':
+            job = self._job(parts[1])
+            if job:
+                self._send_json(job.report)
+        else:
+            self._send_json({'error': 'Not found'}, 404)
+    
+    def do_POST(self):
+        server = self.server.job_server
+        parts, _ = self._route()
+        if parts == ['jobs']:
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b'{}')
+                job, joined = server.submit(request.get('directory', ''), request.get('options') or {})
+            except (ValueError, TypeError) as e:
+                self._send_json({'error': str(e)}, 400)
+                return
+            self._send_json({**job.summary(), 'joined': joined}, 200 if joined else 201)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            job = self._job(parts[1])
+            if job:
+                server.cancel(job)
+                self._send_json(job.summary())
+        else:
+            self._send_json({'error': 'Not found'}, 404)
+    
+    def _stream_events(self, job: ServerJob, since: int):
+        """Send events as JSON lines until the job ends; blank lines keep idle streams alive"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        job.open_stream()
+        try:
+            while True:
+                events = job.wait_events(since, JobServer.HEARTBEAT_SECONDS)
+                for event in events:
+                    self.wfile.write(json.dumps(event, default=str).encode('utf-8') + b'\n')
+                if not events:
+                    self.wfile.write(b'\n')
+                self.wfile.flush()
+                if events:
+                    since = events[-1]['seq'] + 1
+                if job.finished and since >= job.next_seq:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client went away; the job keeps running
+        finally:
+            job.close_stream()
+
+
+class JobServer:
+    """Local HTTP job server that runs directory jobs for several GUIs on one back end
+    
+    Jobs run one at a time on a single worker pool, and every job's processor shares
+    one OCRCache, so a PDF several operators' folders have in common is OCRed once.
+    Submitting a directory with the same options as a queued or running job joins that
+    job instead of starting another. Only the standard library is used; by default the
+    server listens on localhost only.
+    
+    API (JSON):
+        POST /jobs                    {"directory": ..., "options": {...}} -> job
+        GET  /jobs, /jobs/<id>        job summaries
+        GET  /jobs/<id>/events?since=N
+                                      progress, rows and state changes as JSON lines,
+                                      streamed until the job ends (only the recent
+                                      progress is kept, and only state changes once
+                                      the job has ended)
+        GET  /jobs/<id>/results       result rows; /jobs/<id>/report the run report
+        POST /jobs/<id>/cancel        stop waiting; cancelled once no client waits
+        GET  /status                  queue and OCR cache state
+    """
+    
+    DEFAULT_PORT = 8765
+    # PDFExcelProcessor options a job may set
+    JOB_OPTIONS = PDFExcelProcessor.OPTION_NAMES
+    # Contents kept in the shared OCR cache (least recently used are dropped first)
+    OCR_CACHE_CONTENTS = 500
+    # Finished jobs kept for clients that come back for their results
+    KEEP_FINISHED_JOBS = 50
+    HEARTBEAT_SECONDS = 1.0
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, results_db: Optional[str] = None,
+                 ocr_cache_contents: int = OCR_CACHE_CONTENTS):
+        self.results_db = results_db
+        self.ocr_cache = OCRCache(max_contents=ocr_cache_contents)
+        self.jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=PDFExcelProcessor.worker_count(), thread_name_prefix='pdf-worker')
+        self.httpd = ThreadingHTTPServer((host, port), _JobRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.job_server = self
+        self._runner = threading.Thread(target=self._run_jobs, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def submit(self, directory: str, options: Dict) -> Tuple[ServerJob, bool]:
+        """Queue a job, or join the queued/running job with the same directory and options"""
+        unknown = set(options) - set(self.JOB_OPTIONS) - {'history', 'resume'}
+        if unknown:
+            raise ValueError(f"Unknown job options: {', '.join(sorted(unknown))}")
+        path = Path(directory).expanduser()
+        if not directory or not path.is_dir():
+            raise ValueError(f"Not a directory on the server: {directory!r}")
+        directory = str(path.resolve())
+        with self._lock:
+            for job in self.jobs.values():
+                if not job.finished and job.directory == directory and job.options == options:
+                    job.clients += 1
+                    return job, True
+            job = ServerJob(directory, options)
+            self.jobs[job.id] = job
+            finished = [old.id for old in self.jobs.values() if old.finished]
+            for old_id in finished[:max(0, len(finished) - self.KEEP_FINISHED_JOBS)]:
+                del self.jobs[old_id]
+        job.publish('state', state='queued')
+        self._queue.put(job)
+        logger.info(f"Job {job.id} queued: {directory}")
+        return job, False
+    
+    def cancel(self, job: ServerJob):
+        with self._lock:
+            job.clients -= 1
+            if job.clients <= 0:
+                job.cancel_event.set()
+    
+    def status(self) -> Dict:
+        states = [job.state for job in self.jobs.values()]
+        return {
+            'queued': states.count('queued'),
+            'running': states.count('running'),
+            'jobs': len(states),
+            'ocr_cache_contents': len(self.ocr_cache),
+            'ocr_cache_hits': self.ocr_cache.hits,
+        }
+    
+    def _run_jobs(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.cancel_event.is_set():
+                job.set_state('cancelled')
+                continue
+            self._run_job(job)
+    
+    def _run_job(self, job: ServerJob):
+        options = {key: value for key, value in job.options.items() if key in self.JOB_OPTIONS}
+        results_db = self.results_db
+        if job.options.get('history') and not results_db:
+            results_db = str(Path(job.directory) / PDFExcelProcessor.HISTORY_DB_NAME)
+        job.set_state('running')
+        try:
+            processor = PDFExcelProcessor(job.directory, results_db=results_db, ocr_cache=self.ocr_cache, **options)
+            processor.open_worker_pool(self._pool)
+            
+            def progress(message, value, file_info=None):
+                job.publish('progress', message=message, progress=value, file_info=file_info)
+            
+            job.results = processor.process_directory(
+                detailed_callback=progress,
+                stop_flag=job.cancel_event.is_set,
+                result_callback=lambda row: job.publish('row', row=_json_row(row)),
+                resume=bool(job.options.get('resume')),
+            )
+            job.report = processor.run_report
+            job.set_state('cancelled' if job.cancel_event.is_set() else 'done', stats=job.report.get('stats', {}))
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.set_state('failed', error=job.error, error_type=type(e).__name__)
+        logger.info(f"Job {job.id} {job.state}")
+    
+    def serve_forever(self):
+        """Handle requests until shutdown() is called"""
+        self._runner.start()
+        logger.info(f"Job server listening on {self.url}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self._queue.put(None)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def shutdown(self):
+        for job in list(self.jobs.values()):
+            job.cancel_event.set()
+        self.httpd.shutdown()
+
+
+class JobClient:
+    """Client of a JobServer; the GUI uses it when a server address is set"""
+    
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url.rstrip('/')
+        if '://' not in self.url:
+            self.url = f"http://{self.url}"
+        self.timeout = timeout
+    
+    def _request(self, method: str, path: str, body: Optional[Dict] = None):
+        import urllib.request
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get('error', str(e))
+            except ValueError:
+                message = str(e)
+            raise RuntimeError(f"Job server: {message}") from None
+    
+    def submit(self, directory: str, **options) -> Dict:
+        """Start a job (or join an identical one); the summary's 'joined' tells which
+        
+        options are JobServer.JOB_OPTIONS, plus history=True to record the run in the
+        folder's history database and resume=True to resume the folder's last run.
+        """
+        return self._request('POST', '/jobs', {'directory': str(directory), 'options': options})
+    
+    def job(self, job_id: str) -> Dict:
+        return self._request('GET', f'/jobs/{job_id}')
+    
+    def cancel(self, job_id: str) -> Dict:
+        return self._request('POST', f'/jobs/{job_id}/cancel')
+    
+    def report(self, job_id: str) -> Dict:
+        return self._request('GET', f'/jobs/{job_id}/report')
+    
+    def results(self, job_id: str) -> pd.DataFrame:
+        return apply_result_schema(pd.DataFrame(self._request('GET', f'/jobs/{job_id}/results')))
+    
+    def events(self, job_id: str, since: int = 0, stop_flag=None):
+        """Yield the job's events as they happen, until it ends
+        
+        When stop_flag() turns true the job is cancelled (for this client) and the
+        remaining events, up to the final state, are still yielded.
+        """
+        import urllib.request
+        cancelled = False
+        with urllib.request.urlopen(f"{self.url}/jobs/{job_id}/events?since={since}",
+                                    timeout=max(self.timeout, JobServer.HEARTBEAT_SECONDS * 10)) as response:
+            for line in response:
+                if stop_flag and not cancelled and stop_flag():
+                    self.cancel(job_id)
+                    cancelled = True
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ServerRun:
+    """Results and report of a job run on a JobServer, held by the GUI in place of a processor
+    
+    Nothing is created in the (shared) folder and no OCR cache is built: saving the
+    results, the run report and the table's file links only need the attributes below,
+    so the processor's own methods are reused. A local processor is only built when
+    highlighted PDFs have to be created from sidecars.
+    """
+    
+    COLUMNAR_SUFFIXES = PDFExcelProcessor.COLUMNAR_SUFFIXES
+    SIDECAR_SUFFIX = PDFExcelProcessor.SIDECAR_SUFFIX
+    
+    def __init__(self, base_path: str, options: Dict):
+        self.base_path = Path(base_path)
+        self.options = options
+        self.separate_output = options.get('separate_output', True)
+        self.destructive = options.get('destructive', False)
+        self.sidecar_output = options.get('sidecar_output', False) and not self.destructive
+        self.output_folder = (self.base_path / "highlighted_pdfs"
+                              if self.separate_output and not self.destructive else None)
+        self.results_df = pd.DataFrame()
+        self.run_report = {}
+        self._processor = None
+    
+    save_results = PDFExcelProcessor.save_results
+    export_results = PDFExcelProcessor.export_results
+    save_run_report = PDFExcelProcessor.save_run_report
+    format_timing_breakdown = PDFExcelProcessor.format_timing_breakdown
+    sidecar_path = PDFExcelProcessor.sidecar_path
+    
+    def _local_processor(self) -> PDFExcelProcessor:
+        if self._processor is None:
+            options = {name: value for name, value in self.options.items() if name in PDFExcelProcessor.OPTION_NAMES}
+            self._processor = PDFExcelProcessor(str(self.base_path), **options)
+        return self._processor
+    
+    def materialise_highlighted(self, output_path) -> Path:
+        return self._local_processor().materialise_highlighted(output_path)
+    
+    def materialise_all(self, folder=None, progress_callback=None, stop_flag=None) -> Dict[str, int]:
+        return self._local_processor().materialise_all(folder, progress_callback, stop_flag)
+
+
+class ProgressBus:
+    """Thread-safe channel carrying progress from the worker thread to the Tk main thread
+    
+    Publishing never touches a widget. Status updates overwrite each other so only
+    the latest one is shown, log lines go into a ring buffer that drops (and counts)
+    the oldest lines when the UI falls behind, and post() queues a callable to run
+    on the main thread. The GUI drains the bus a few times per second.
+    """
+    
+    def __init__(self, log_capacity: int = 500):
+        self._lock = threading.Lock()
+        self._status = None
+        self._log = deque(maxlen=log_capacity)
+        self._dropped = 0
+        self._calls = []
+        self._closed = False
+    
+    def status(self, message: str, progress: float, file_info: Optional[Dict] = None):
+        with self._lock:
+            self._status = (message, progress, dict(file_info) if file_info else None)
+    
+    def log(self, line: str):
+        with self._lock:
+            if len(self._log) == self._log.maxlen:
+                self._dropped += 1
+            self._log.append(line)
+    
+    def post(self, func, *args):
+        """Run func(*args) on the main thread at the next drain"""
+        with self._lock:
+            self._calls.append((func, args))
+    
+    def close(self):
+        """Mark the end of the run; the poller stops after the final drain"""
+        with self._lock:
+            self._closed = True
+    
+    def drain(self) -> Tuple[Optional[Tuple], List[str], int, List[Tuple], bool]:
+        """Take everything published since the last drain
+        
+        Returns (latest status or None, log lines, lines dropped, posted calls, closed).
+        """
+        with self._lock:
+            drained = (self._status, list(self._log), self._dropped, self._calls, self._closed)
+            self._status = None
+            self._log.clear()
+            self._dropped = 0
+            self._calls = []
+        return drained
+
+
+class VirtualTreeview:
+    """Treeview that only materialises the rows currently scrolled into view
+    
+    rows is the full list of value tuples and view a list of indices into it (for
+    example a filtered subset). Only a window of about one screen of items exists
+    in the Treeview; scrolling re-fills those items in place, so switching to a
+    view of any size costs the same as drawing a single screen.
+    """
+    
+    DEFAULT_ROW_HEIGHT = 20
+    WHEEL_ROWS = 3
+    
+    def __init__(self, parent, columns, height: int = 10):
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=height)
+        self.vsb = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.rows = []
+        self.view = []
+        self.offset = 0
+        self.visible_rows = height
+        self._items = []  # Reusable item ids, top to bottom
+        self._item_rows = {}  # item id -> row index
+        self._selected_row = None
         
-        total_files = len(excel_files_to_process)
-        for idx, (excel_file, excel_folder, coc_folder, identifier) in enumerate(excel_files_to_process):
-            # Check if we should stop
-            if should_stop():
-                logger.info("Processing stopped by user")
-                break
-            
-            progress = 25 + (idx / total_files) * 20  # Progress from 25% to 45%
-            
-            # Update with file info
-            file_info = {
-                'filename': excel_file.name,
-                'current': idx + 1,
-                'total': total_files
-            }
-            
-            if progress_callback:
-                progress_callback(f"Processing {excel_file.name}...", progress, file_info)
-            
-            logger.info(f"Processing Excel file: {excel_file}")
-            
-            # Extract data from Excel
-            df = self.read_excel_tables(excel_file)
-            
-            if df.empty:
-                logger.warning(f"No valid data found in {excel_file}")
-                continue
-            
-            stats['excel_rows'] += len(df)
-            
-            # Add identifier column
-            df['FAI Folder'] = identifier
-            df['Excel File'] = excel_file.name
-            df['Excel Folder Name'] = excel_folder.name
-            
-            # Process each row - collect tasks for parallel processing
-            total_rows = len(df)
-            pdf_tasks = []
-            row_results = []
-            
-            # First pass: prepare all rows and identify PDFs to process
-            for idx_row, row in df.iterrows():
-                # Check if we should stop
-                if should_stop():
-                    break
-                    
-                result = row.to_dict()
-                
-                # Check if PDF exists
-                pdf_path = None
-                if coc_folder:
-                    pdf_path = self.find_matching_pdf(
-                        row['Cablex P/N'], 
-                        row['FAIR Identifier'], 
-                        coc_folder
-                    )
-                
-                if pdf_path:
-                    stats['pdfs_found'] += 1
-                    result['PDF Status'] = 'Found'
-                    result['PDF File'] = pdf_path.name
-                    
-                    # Add to tasks for parallel processing
-                    source_folder_name = coc_folder.name if coc_folder else None
-                    pdf_tasks.append({
-                        'pdf_path': pdf_path,
-                        'part_number': row['Part Number'],
-                        'source_folder': source_folder_name,
-                        'result_index': len(row_results)
-                    })
-                else:
-                    result['PDF Status'] = 'Not Found'
-                    result['PDF File'] = ''
-                    result['Part Number Found'] = 'N/A'
-                    result['Highlighted PDF'] = ''
-                
-                row_results.append(result)
-            
-            # Process PDFs in parallel using ThreadPoolExecutor
-            if pdf_tasks and not should_stop():
-                max_workers = min(8, os.cpu_count() or 4)  # Use up to 8 threads
-                
-                if detailed_callback:
-                    detailed_callback(f"Step 4-5: Processing {len(pdf_tasks)} PDFs in parallel with {max_workers} threads...", 50)
-                
-                def process_single_pdf(task):
-                    """Process a single PDF in a thread"""
-                    try:
-                        found, output_path = self.search_and_highlight_pdf(
-                            task['pdf_path'], 
-                            task['part_number'],
-                            source_folder=task['source_folder']
-                        )
-                        return task['result_index'], found, output_path, task['source_folder']
-                    except Exception as e:
-                        logger.error(f"Error processing PDF {task['pdf_path']}: {e}")
-                        return task['result_index'], False, None, task['source_folder']
-                
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    # Submit all tasks
-                    futures = {executor.submit(process_single_pdf, task): task for task in pdf_tasks}
-                    
-                    # Process completed tasks
-                    completed = 0
-                    for future in as_completed(futures):
-                        if should_stop():
-                            executor.shutdown(wait=False)
-                            break
-                        
-                        try:
-                            result_index, found, output_path, source_folder = future.result(timeout=30)
-                            
-                            if found and output_path:
-                                stats['parts_highlighted'] += 1
-                                row_results[result_index]['Part Number Found'] = 'Yes'
-                                row_results[result_index]['Highlighted PDF'] = output_path.name
-                                row_results[result_index]['Source Folder'] = source_folder
-                                self.processed_pdfs.append(output_path)
-                            else:
-                                row_results[result_index]['Part Number Found'] = 'No'
-                                row_results[result_index]['Highlighted PDF'] = ''
-                            
-                            completed += 1
-                            if detailed_callback:
-                                progress = 50 + (completed / len(pdf_tasks)) * 30
-                                detailed_callback(f"Step 4-5: Processed {completed}/{len(pdf_tasks)} PDFs", progress)
-                        except Exception as e:
-                            logger.error(f"Error getting result from thread: {e}")
-            
-            # Add all results
-            all_results.extend(row_results)
+        try:
+            self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight')) or self.DEFAULT_ROW_HEIGHT
+        except (tk.TclError, ValueError):
+            self.row_height = self.DEFAULT_ROW_HEIGHT
         
-        # Step 6: Create final DataFrame
-        if detailed_callback:
-            detailed_callback("Step 6: Creating final output CSV...", 90)
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_by(-self.WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_by(self.WHEEL_ROWS))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self._move_selection(self.visible_rows))
+    
+    def set_view(self, rows, view):
+        """Show the given view of rows from the top"""
+        self.rows = rows
+        self.view = view
+        self.offset = 0
+        self.render()
+    
+    def row_for_item(self, item) -> Optional[int]:
+        return self._item_rows.get(item)
+    
+    def render(self):
+        """Fill the visible window from the current view and offset"""
+        max_offset = max(0, len(self.view) - self.visible_rows)
+        self.offset = min(max(0, self.offset), max_offset)
+        window = self.view[self.offset:self.offset + self.visible_rows]
         
-        self.results_df = pd.DataFrame(all_results)
+        for i, row_idx in enumerate(window):
+            values = self.rows[row_idx]
+            if i < len(self._items):
+                self.tree.item(self._items[i], values=values)
+            else:
+                self._items.append(self.tree.insert('', 'end', values=values))
+        if len(self._items) > len(window):
+            self.tree.delete(*self._items[len(window):])
+            del self._items[len(window):]
+        self._item_rows = dict(zip(self._items, window))
         
-        # Final summary
-        summary = f"Complete! Processed {stats['excel_rows']} rows from {stats['excel_files']} Excel files. "
-        summary += f"Found {stats['pdfs_found']} PDFs, highlighted {stats['parts_highlighted']} part numbers."
+        # Keep the selection on the same row rather than the same screen position
+        selected = tuple(item for item, row in self._item_rows.items() if row == self._selected_row)
+        if tuple(self.tree.selection()) != selected:
+            self.tree.selection_set(selected)
         
-        if detailed_callback:
-            detailed_callback(summary, 100)
-        elif progress_callback:
-            progress_callback(summary, 100)
-            
-        return self.results_df
+        total = len(self.view)
+        if total:
+            self.vsb.set(self.offset / total, min(1.0, (self.offset + len(window)) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
     
-    def save_results(self, output_path: str = None) -> str:
-        """Save results to CSV file"""
-        if self.results_df.empty:
-            raise ValueError("No results to save. Run process_directory first.")
-            
-        if not output_path:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_path = self.base_path / f"processing_results_{timestamp}.csv"
+    def _scroll_to(self, offset: int):
+        self.offset = offset
+        self.render()
+        return 'break'
+    
+    def _scroll_by(self, rows: int):
+        return self._scroll_to(self.offset + rows)
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(value) * len(self.view)))
+        elif action == 'scroll':
+            step = int(value) * (self.visible_rows if unit == 'pages' else 1)
+            self._scroll_by(step)
+    
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas; only the sign matters here
+        return self._scroll_by(-self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS)
+    
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self._selected_row = self._item_rows.get(selection[0], self._selected_row)
+    
+    def _move_selection(self, step: int):
+        """Arrow/page keys: move the selection and scroll the window along with it"""
+        if not self.view:
+            return 'break'
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            position = self.offset + self._items.index(selection[0])
         else:
-            output_path = Path(output_path)
-            
-        self.results_df.to_csv(output_path, index=False)
-        logger.info(f"Results saved to {output_path}")
-        return str(output_path)
+            position = self.offset - step if step > 0 else self.offset
+        position = min(max(0, position + step), len(self.view) - 1)
+        
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible_rows:
+            self.offset = position - self.visible_rows + 1
+        self._selected_row = self.view[position]
+        self.render()
+        self.tree.focus(self._items[position - self.offset])
+        return 'break'
+    
+    def _on_resize(self, event):
+        # The first row of the widget is taken by the column headings
+        visible_rows = max(1, event.height // self.row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
 
 
 class ProcessorGUI:
     """GUI interface for the PDF Excel Processor"""
     
+    # Result rows flow from the worker thread to Tk through a bounded queue,
+    # drained in batches by a root.after poller
+    RESULT_QUEUE_SIZE = 2000
+    RESULT_BATCH_SIZE = 250
+    RESULT_POLL_MS = 100
+    _RESULTS_DONE = object()
+    # Progress is coalesced on a ProgressBus and applied at most this often;
+    # the log widget keeps only the most recent lines
+    PROGRESS_POLL_MS = 250
+    PROGRESS_LOG_BUFFER = 500
+    PROGRESS_LOG_MAX_LINES = 2000
+    # The OCR status line waits for the background dependency probe; heavy modules are
+    # preloaded once the window has had time to show
+    DEPENDENCY_POLL_MS = 100
+    PRELOAD_DELAY_MS = 200
+    FILTERS = ("All", "PDF Found", "PDF Not Found", "Part Number Not Found", "Part Number Found", "Timed Out")
+    
     def __init__(self, root):
         self.root = root
         self.root.title("FAI/Material CoC Processor")
@@ -814,23 +4611,46 @@ class ProcessorGUI:
         self.current_file_info = {"current": 0, "total": 0, "filename": ""}
         self.processing_thread = None
         self.stop_processing = False
+        self.results_queue = queue.Queue(maxsize=self.RESULT_QUEUE_SIZE)
+        self.progress_bus = ProgressBus(self.PROGRESS_LOG_BUFFER)
+        self.summary_counts = {}
+        self._reset_summary_counts()
         self.setup_ui()
         
         # Update window to calculate size, then set minimum size
         self.root.update_idletasks()
         self.root.minsize(self.root.winfo_width(), self.root.winfo_height())
         
+        DEPENDENCIES.start()
+        self.root.after(self.DEPENDENCY_POLL_MS, self._poll_dependencies)
+        self.root.after(self.PRELOAD_DELAY_MS, preload_heavy_modules)
+        
+    def _poll_dependencies(self):
+        """Show the OCR status once the dependency probe has finished"""
+        if not DEPENDENCIES.done:
+            self.root.after(self.DEPENDENCY_POLL_MS, self._poll_dependencies)
+            return
+        status = DEPENDENCIES.wait()
+        if not (OCR_AVAILABLE and status['ocr_libraries']):
+            text, color = "OCR Not Available (install dependencies)", "red"
+        elif not status['tesseract']:
+            text, color = "OCR Not Available (Tesseract not found)", "red"
+        elif not status['poppler']:
+            text, color = "OCR Not Available (Poppler not found)", "red"
+        else:
+            version = f" (Tesseract {status['tesseract_version']})" if status['tesseract_version'] else ""
+            text, color = f"OCR Available{version}", "green"
+        self.ocr_label.config(text=f"Status: {text}", foreground=color)
+        
     def setup_ui(self):
         """Setup the GUI components"""
         # Main frame
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # OCR Status
-        ocr_status = "OCR Available" if OCR_AVAILABLE else "OCR Not Available (install dependencies)"
-        ocr_color = "green" if OCR_AVAILABLE else "red"
-        ocr_label = ttk.Label(main_frame, text=f"Status: {ocr_status}", foreground=ocr_color)
-        ocr_label.grid(row=0, column=0, columnspan=3, pady=5)
+        # OCR Status (filled in by _poll_dependencies)
+        self.ocr_label = ttk.Label(main_frame, text="Status: Checking OCR...", foreground="gray")
+        self.ocr_label.grid(row=0, column=0, columnspan=3, pady=5)
         
         # Directory selection
         ttk.Label(main_frame, text="Select Directory:").grid(row=1, column=0, sticky=tk.W, pady=5)
@@ -867,6 +4687,93 @@ class ProcessorGUI:
             value="destructive"
         ).grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
         
+        ttk.Radiobutton(
+            options_frame,
+            text="Only record matches (small .matches.json files; highlighted PDFs are created when opened)",
+            variable=self.output_mode_var,
+            value="sidecar"
+        ).grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+        
+        # Adaptive OCR resolution checkbox
+        self.adaptive_ocr_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            options_frame,
+            text="Adaptive OCR resolution (fast low-DPI pass, high DPI only where the part number is missed)",
+            variable=self.adaptive_ocr_var
+        ).grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
+        
+        # Scan clean-up before OCR
+        self.preprocess_ocr_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text="Clean up scans before OCR (binarise, straighten and crop; helps skewed or noisy fax copies)",
+            variable=self.preprocess_ocr_var
+        ).grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
+        
+        # Tesseract profile
+        profile_frame = ttk.Frame(options_frame)
+        profile_frame.grid(row=6, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(profile_frame, text="OCR profile:").pack(side=tk.LEFT)
+        self.ocr_profile_var = tk.StringVar(value='default')
+        ttk.Combobox(profile_frame, textvariable=self.ocr_profile_var, values=list(PDFExcelProcessor.OCR_PROFILES),
+                     state='readonly', width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(profile_frame, text="(fast-sparse: part-number tokens only, fastest; accurate: full layout at 300 DPI)"
+                  ).pack(side=tk.LEFT)
+        
+        # Per-PDF time limit
+        timeout_frame = ttk.Frame(options_frame)
+        timeout_frame.grid(row=7, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(timeout_frame, text="Time limit per PDF (seconds, 0 = none):").pack(side=tk.LEFT)
+        self.pdf_timeout_var = tk.IntVar(value=300)
+        ttk.Spinbox(timeout_frame, from_=0, to=3600, increment=30, width=6,
+                    textvariable=self.pdf_timeout_var).pack(side=tk.LEFT, padx=5)
+        
+        # Memory budget for the PDFs processed at the same time
+        memory_frame = ttk.Frame(options_frame)
+        memory_frame.grid(row=8, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(memory_frame, text="Memory budget for parallel PDFs (MB, 0 = half of RAM):").pack(side=tk.LEFT)
+        self.memory_budget_var = tk.IntVar(value=0)
+        ttk.Spinbox(memory_frame, from_=0, to=262144, increment=512, width=7,
+                    textvariable=self.memory_budget_var).pack(side=tk.LEFT, padx=5)
+        
+        # Resume option
+        self.resume_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text="Resume previous run (skip rows already finished in this folder's journal)",
+            variable=self.resume_var
+        ).grid(row=9, column=0, sticky=tk.W, padx=5, pady=2)
+        
+        # Optional SQLite history
+        self.history_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text=f"Keep history of runs in {PDFExcelProcessor.HISTORY_DB_NAME} (searchable with History)",
+            variable=self.history_var
+        ).grid(row=10, column=0, sticky=tk.W, padx=5, pady=2)
+        
+        # Profiling mode for slow PDFs
+        profiling_frame = ttk.Frame(options_frame)
+        profiling_frame.grid(row=11, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(profiling_frame, text="Profile PDFs taking at least (seconds, 0 = off):").pack(side=tk.LEFT)
+        self.profile_threshold_var = tk.IntVar(value=0)
+        ttk.Spinbox(profiling_frame, from_=0, to=3600, increment=30, width=6,
+                    textvariable=self.profile_threshold_var).pack(side=tk.LEFT, padx=5)
+        self.profile_memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profiling_frame, text="with memory tracing", variable=self.profile_memory_var
+                        ).pack(side=tk.LEFT, padx=5)
+        ttk.Label(profiling_frame, text=f"(saved in {PDFExcelProcessor.PROFILE_DIR_NAME}/ and the Run Report)"
+                  ).pack(side=tk.LEFT)
+        
+        # Optional job server (python pdf_excel_processor.py --serve) that runs the jobs instead
+        server_frame = ttk.Frame(options_frame)
+        server_frame.grid(row=12, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(server_frame, text="Job server (optional):").pack(side=tk.LEFT)
+        self.server_var = tk.StringVar(value=os.environ.get('FAI_JOB_SERVER', ''))
+        ttk.Entry(server_frame, textvariable=self.server_var, width=28).pack(side=tk.LEFT, padx=5)
+        ttk.Label(server_frame, text=f"(e.g. 127.0.0.1:{JobServer.DEFAULT_PORT}; empty = process here)"
+                  ).pack(side=tk.LEFT)
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=3, column=0, columnspan=3, pady=20)
@@ -880,6 +4787,13 @@ class ProcessorGUI:
         self.reset_btn = ttk.Button(button_frame, text="Reset", command=self.reset_gui, state='disabled')
         self.reset_btn.pack(side=tk.LEFT, padx=5)
         
+        self.materialise_btn = ttk.Button(button_frame, text="Create Highlighted PDFs",
+                                          command=self.materialise_pdfs, state='disabled')
+        self.materialise_btn.pack(side=tk.LEFT, padx=5)
+        
+        history_btn = ttk.Button(button_frame, text="History", command=self.show_history)
+        history_btn.pack(side=tk.LEFT, padx=5)
+        
         help_btn = ttk.Button(button_frame, text="Help", command=self.show_help)
         help_btn.pack(side=tk.LEFT, padx=5)
         
@@ -914,10 +4828,15 @@ class ProcessorGUI:
         ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=5)
         self.filter_var = tk.StringVar(value="All")
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_var, width=30, state='readonly')
-        filter_combo['values'] = ("All", "PDF Found", "PDF Not Found", "Part Number Not Found", "Part Number Found")
+        filter_combo['values'] = self.FILTERS
         filter_combo.pack(side=tk.LEFT, padx=5)
         filter_combo.bind('<<ComboboxSelected>>', self.apply_filter)
         
+        ttk.Label(filter_frame, text="Search:").pack(side=tk.LEFT, padx=(15, 5))
+        self.search_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add('write', lambda *args: self.apply_filter())
+        
         # Results table with scrollbar
         table_frame = ttk.Frame(main_frame)
         table_frame.grid(row=10, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -928,9 +4847,10 @@ class ProcessorGUI:
         table_frame.grid_rowconfigure(0, weight=1)
         table_frame.grid_columnconfigure(0, weight=1)
         
-        # Create Treeview for results table
+        # Create Treeview for results table; only the visible rows exist as items
         columns = ('Excel File', 'Part Number', 'PDF Status', 'PDF File', 'Highlighted')
-        self.results_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=10)
+        self.results_table = VirtualTreeview(table_frame, columns=columns, height=10)
+        self.results_tree = self.results_table.tree
         
         # Define headings
         self.results_tree.heading('Excel File', text='Excel File')
@@ -947,20 +4867,19 @@ class ProcessorGUI:
         self.results_tree.column('Highlighted', width=80)
         
         # Add scrollbars
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.results_tree.yview)
         hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=self.results_tree.xview)
-        self.results_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.results_tree.configure(xscrollcommand=hsb.set)
         
         # Grid layout
         self.results_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        vsb.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.results_table.vsb.grid(row=0, column=1, sticky=(tk.N, tk.S))
         hsb.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
         # Bind double-click event to open files
         self.results_tree.bind('<Double-1>', self.on_item_double_click)
         
         # Store full results for filtering
-        self.full_results = []
+        self._clear_results()
         
         # Save button
         self.save_btn = ttk.Button(main_frame, text="Save Results to CSV", command=self.save_results, state='disabled')
@@ -972,6 +4891,74 @@ class ProcessorGUI:
         if directory:
             self.dir_var.set(directory)
     
+    def show_history(self):
+        """Look up part numbers / identifiers in the SQLite history of the selected folder"""
+        directory = self.dir_var.get()
+        db_path = Path(directory) / PDFExcelProcessor.HISTORY_DB_NAME if directory else None
+        if not db_path or not db_path.exists():
+            messagebox.showinfo(
+                "History",
+                "No history found for this folder.\n\nTick \"Keep history of runs\" before processing "
+                f"to record results in {PDFExcelProcessor.HISTORY_DB_NAME}."
+            )
+            return
+        store = ResultsStore(db_path)
+        
+        history_window = tk.Toplevel(self.root)
+        history_window.title(f"History - {db_path}")
+        history_window.geometry("1000x450")
+        
+        search_frame = ttk.Frame(history_window, padding="10")
+        search_frame.pack(fill=tk.X)
+        ttk.Label(search_frame, text="Part number / FAIR Identifier / Cablex P/N contains:").pack(side=tk.LEFT)
+        search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        found_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Found only", variable=found_only_var).pack(side=tk.LEFT, padx=5)
+        summary_label = ttk.Label(history_window, text="", padding=(10, 0))
+        summary_label.pack(fill=tk.X)
+        
+        columns = ('Run', 'Part Number', 'Cablex P/N', 'FAIR Identifier', 'PDF Status', 'Found', 'Pages', 'PDF File')
+        table_frame = ttk.Frame(history_window, padding="10")
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings')
+        for column, width in zip(columns, (140, 120, 90, 110, 80, 70, 60, 280)):
+            tree.heading(column, text=column)
+            tree.column(column, width=width)
+        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=vsb.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        def run_search(event=None):
+            text = search_var.get().strip()
+            try:
+                rows = store.query(contains=text or None, found_only=found_only_var.get())
+            except sqlite3.Error as e:
+                messagebox.showerror("History", f"Could not read history: {e}", parent=history_window)
+                return
+            tree.delete(*tree.get_children())
+            for row in rows.itertuples(index=False):
+                tree.insert('', 'end', values=(
+                    row.run_finished.replace('T', ' '), row.part_number, row.cablex_pn, row.fair_identifier,
+                    row.pdf_status, row.part_found, row.match_pages or '', row.pdf_file or ''
+                ))
+            
+            summary = f"{len(rows)} row(s)"
+            if text:
+                last = store.last_verified(text)
+                if last:
+                    summary += f" | {text} last verified {last['run_finished'].replace('T', ' ')} in {last['pdf_file']}"
+                elif not rows.empty:
+                    summary += f" | {text} has not been verified (exact part number)"
+            summary_label.config(text=summary)
+        
+        ttk.Button(search_frame, text="Search", command=run_search).pack(side=tk.LEFT, padx=5)
+        search_entry.bind('<Return>', run_search)
+        search_entry.focus_set()
+        run_search()
+    
     def show_help(self):
         """Display help dialog with usage instructions"""
         help_window = tk.Toplevel(self.root)
@@ -1019,6 +5006,55 @@ HOW TO USE
      - Processes all PDFs with OCR to make them searchable
      - Slower but ensures text is found in scanned images
    
+   ✓ Adaptive OCR resolution
+     - Reads pages at 150 DPI first, which is enough for clean prints
+     - Re-reads at 300 DPI only pages with low scan quality (OCR confidence);
+       if the part number was not found at all, only the least clear page
+     - Untick to read every page once at a fixed 200 DPI
+   
+   ✓ Clean up scans before OCR
+     - Pages are rendered in grayscale, converted to black and white with
+       a threshold that adapts to uneven backgrounds, straightened (up to
+       5 degrees of skew) and cropped to the printed area
+     - Helps with skewed, grey or noisy fax-quality scans and gives
+       Tesseract smaller images; leave it off for clean prints
+   
+   OCR profile
+     - default: Tesseract's standard settings
+     - fast-sparse: only looks for scattered letter/digit/dash tokens such
+       as part numbers; fastest, but the OCR text layer is less complete
+     - accurate: full page layout analysis, every page read at 300 DPI;
+       slowest, for hard-to-read scans
+   
+   Time limit per PDF
+     - A PDF that takes longer is abandoned and shown as "Timed Out"
+       instead of "No", so corrupt files cannot hang the run
+     - Set to 0 to disable the limit
+   
+   Memory budget for parallel PDFs
+     - Large scans are only started together while their estimated memory
+       (pages held at once x rendered page size) fits in this budget
+     - 0 uses half of the computer's RAM; lower it if other programs
+       need memory while the tool runs
+   
+   ✓ Resume previous run
+     - Every finished row is saved to processing_journal.jsonl in the
+       selected folder while the run is going
+     - Tick this after a run was stopped, crashed or the window was closed:
+       rows already in the journal are reused and only the rest is processed
+     - Rows of Excel files edited since then are processed again
+     - Unticked, a run starts a new journal
+     - Only one run at a time can use a folder's journal: starting a second
+       run on the same folder (another window or the job server) stops with
+       "another run is using this folder" and leaves the first run's journal
+       untouched; watch mode keeps its own journal (watch_journal.jsonl)
+   
+   ✓ Keep history of runs
+     - Adds every run, its rows and per-PDF timings to
+       processing_history.sqlite in the selected folder
+     - Click "History" to look up a part number, FAIR Identifier or
+       Cablex P/N across all recorded runs and see when it last verified
+   
    ○ Output Mode (choose one):
      
      • Save in separate 'highlighted_pdfs' folder (SAFE)
@@ -1030,12 +5066,22 @@ HOW TO USE
        - Modifies original PDF files directly
        - No backup created - use with caution!
        - Useful when you want originals updated
+     
+     • Only record matches (FASTEST, least disk space)
+       - Writes a small .matches.json file per matched PDF (pages, match
+         positions, part number, source PDF) instead of a full copy
+       - Double-click "Yes" in the Highlighted column to create and open the
+         highlighted PDF for that row
+       - "Create Highlighted PDFs" creates all of them in one go
+       - Highlighted PDFs created this way have no OCR text layer
 
 3. PROCESS FILES
    Click "Process Files" and monitor progress:
    - Progress bar shows overall completion
-   - File info shows current file (e.g., "file.xlsx (6/11)")
-   - Progress Details shows step-by-step actions
+   - File info shows current file (e.g., "file.xlsx (6/11)"), and during PDF
+     processing the estimated time left
+   - Progress Details shows step-by-step actions (the most recent 2000 lines are kept)
+   - The results table and summary line fill in live as each PDF finishes
 
 4. REVIEW RESULTS
    
@@ -1047,11 +5093,17 @@ HOW TO USE
      - PDF Not Found: Entries without PDFs
      - Part Number Not Found: PDFs found but part not highlighted
      - Part Number Found: Successfully highlighted entries
+     - Timed Out: PDFs that exceeded the per-PDF time limit
+   
+   • Search Box: Type part of a part number, Excel file or PDF name
+     - Combines with the filter (e.g. "Part Number Not Found" + "127K")
+     - Not case sensitive
    
    • Results Table: Interactive table with your results
      - Double-click Excel File to open it
      - Double-click PDF File to view original
      - Double-click "Yes" in Highlighted column to view highlighted PDF
+       (created on first open when only matches were recorded)
 
 5. EXPORT RESULTS
    Click "Save Results to CSV" to export all data for further analysis.
@@ -1062,7 +5114,10 @@ WHAT THE TOOL DOES
 2. Extracts tables from Excel files (Cablex P/N, FAIR Identifier, Part Number)
 3. Matches PDFs using flexible naming patterns
 4. Performs OCR on scanned PDFs to make them searchable
-5. Searches for part numbers in PDFs
+   - Copies of the same certificate in several CoC folders are read once;
+     their highlighted PDFs are copied from the first one
+5. Searches for part numbers in PDFs (ignoring case, spaces and dashes in
+   the text layer: "127K-667" also matches "127K 667")
 6. Highlights found part numbers with yellow markers
 7. Adds "Matched Part Number: [number]" text at top of highlighted PDFs
 8. Creates searchable PDF outputs with embedded OCR text
@@ -1095,6 +5150,51 @@ OUTPUT FILES
   - Complete processing results
   - All matching details and status information
   - Can be opened in Excel for analysis
+  - Includes the pages the part number was found on and seconds per PDF
+
+• Parquet / Arrow (optional, needs the pyarrow package):
+  - Written next to the CSV automatically, or choose .parquet / .arrow
+    in the save dialog
+  - Same columns with their types kept, for loading into analytics tools
+
+• Run Report (JSON):
+  - Saved next to the CSV as <name>_report.json
+  - Time spent per stage and per PDF, plus counters
+  - The same breakdown is printed at the end of Progress Details
+
+WATCH MODE
+----------
+• Run "python pdf_excel_processor.py --watch FOLDER" to keep FOLDER
+  processed without the GUI
+• Only folder pairs whose workbooks or PDFs changed are processed, once
+  their files have stopped changing (--settle seconds)
+• Every run is added to processing_history.sqlite, so History shows them
+• Stop with Ctrl+C; see --help for the options
+
+PROFILING SLOW PDFs
+-------------------
+• Set "Profile PDFs taking at least" to a number of seconds to find out
+  where the time goes for PDFs that are slow
+• Each such PDF gets a profile file in profiles/ (open .pstats files with
+  Python's pstats or snakeviz); the slowest functions are listed at the
+  end of Progress Details and in the Run Report
+• "with memory tracing" also records how much Python memory was in use;
+  it slows the run down, so only turn it on while investigating
+
+JOB SERVER
+----------
+• Run "python pdf_excel_processor.py --serve" once on the host and enter
+  its address (e.g. 127.0.0.1:8765) under "Job server" in each GUI
+• The server runs the jobs: the same folder submitted twice is processed
+  once, and PDFs already OCRed for one job are not OCRed again
+• Leave "Job server" empty to process on this computer
+
+DISTRIBUTED RUNS
+----------------
+• "--coordinate FOLDER --queue SHARE/queue.sqlite" splits FOLDER into one
+  work unit per folder pair and saves the merged results when all are done
+• "--work SHARE/queue.sqlite" on each worker host processes units until
+  none are left; units of a worker that dies are retried by the others
 
 TROUBLESHOOTING
 --------------
@@ -1144,41 +5244,47 @@ For issues or questions, check the README.md file or open an issue on GitHub.
         help_window.geometry(f"+{x}+{y}")
             
     def update_progress(self, message, progress, file_info=None):
-        """Update progress bar and status"""
-        self.status_label.config(text=message)
-        
-        # Update file progress label and progress bar if file info provided
-        if file_info:
-            self.current_file_info = file_info
-            file_label = f"{file_info['filename']} ({file_info['current']}/{file_info['total']})"
-            self.file_progress_label.config(text=file_label)
-            # Set progress bar based on file count
-            file_progress = (file_info['current'] / file_info['total']) * 100 if file_info['total'] > 0 else 0
-            self.progress_var.set(file_progress)
-        else:
-            self.progress_var.set(progress)
-        
-        self.root.update_idletasks()
-        
-    def update_detailed_progress(self, message, progress, file_info=None):
-        """Update detailed progress with step-by-step information"""
+        """Update progress bar and status (main thread only)"""
         self.status_label.config(text=message[:80] + "..." if len(message) > 80 else message)
         
-        # Update file progress label and progress bar if file info provided
+        # Update file progress label if file info provided
         if file_info:
             self.current_file_info = file_info
             file_label = f"{file_info['filename']} ({file_info['current']}/{file_info['total']})"
+            if file_info.get('eta') is not None:
+                file_label += f" - about {PDFExcelProcessor.format_duration(file_info['eta'])} left"
             self.file_progress_label.config(text=file_label)
-            # Set progress bar based on file count
-            file_progress = (file_info['current'] / file_info['total']) * 100 if file_info['total'] > 0 else 0
-            self.progress_var.set(file_progress)
-        else:
-            self.progress_var.set(progress)
         
-        # Append to progress text area
-        self.progress_text.insert(tk.END, f"[{progress:3.0f}%] {message}\n")
+        # The processor reports overall progress, weighted by the estimated cost of each PDF
+        self.progress_var.set(progress)
+    
+    def append_progress_log(self, lines, dropped: int = 0):
+        """Append lines to the progress log, keeping only the most recent lines (main thread only)"""
+        text = ""
+        if dropped:
+            text += f"... {dropped} progress lines skipped ...\n"
+        text += "".join(line if line.endswith("\n") else line + "\n" for line in lines)
+        if not text:
+            return
+        self.progress_text.insert(tk.END, text)
+        
+        # The widget ends with an empty line after the last newline
+        excess = int(self.progress_text.index('end-1c').split('.')[0]) - 1 - self.PROGRESS_LOG_MAX_LINES
+        if excess > 0:
+            self.progress_text.delete('1.0', f'{excess + 1}.0')
         self.progress_text.see(tk.END)  # Auto-scroll to bottom
-        self.root.update_idletasks()
+    
+    def _poll_progress(self, bus: ProgressBus):
+        """Apply whatever the worker published since the last poll"""
+        status, lines, dropped, calls, closed = bus.drain()
+        if bus is self.progress_bus:
+            if status:
+                self.update_progress(*status)
+            self.append_progress_log(lines, dropped)
+        for func, args in calls:
+            func(*args)
+        if not closed:
+            self.root.after(self.PROGRESS_POLL_MS, self._poll_progress, bus)
         
     def stop_processing_func(self):
         """Stop the current processing"""
@@ -1189,11 +5295,11 @@ For issues or questions, check the README.md file or open an issue on GitHub.
     def reset_gui(self):
         """Reset GUI to initial state for another run"""
         # Clear results
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        self.full_results = []
+        self._clear_results()
+        self._reset_summary_counts()
         
-        # Clear progress
+        # Clear progress; a new bus detaches any poller still draining the old run
+        self.progress_bus = ProgressBus(self.PROGRESS_LOG_BUFFER)
         self.progress_text.delete(1.0, tk.END)
         self.progress_var.set(0)
         self.file_progress_label.config(text="")
@@ -1209,6 +5315,7 @@ For issues or questions, check the README.md file or open an issue on GitHub.
         self.stop_btn.config(state='disabled')
         self.reset_btn.config(state='disabled')
         self.save_btn.config(state='disabled')
+        self.materialise_btn.config(state='disabled')
         
         # Reset stop flag
         self.stop_processing = False
@@ -1225,66 +5332,193 @@ For issues or questions, check the README.md file or open an issue on GitHub.
         self.stop_btn.config(state='enabled')
         self.reset_btn.config(state='disabled')
         self.save_btn.config(state='disabled')
+        self.materialise_btn.config(state='disabled')
         self.progress_text.delete(1.0, tk.END)
         self.progress_var.set(0)
         self.stop_processing = False
         
+        # Clear table before processing; rows stream in while the run is going
+        self._clear_results()
+        self._reset_summary_counts()
+        self.results_summary.config(text="")
+        self.results_queue = queue.Queue(maxsize=self.RESULT_QUEUE_SIZE)
+        results_queue = self.results_queue
+        self.root.after(self.RESULT_POLL_MS, self._poll_results, results_queue)
+        
+        # The worker only ever publishes to the bus; widgets are updated by _poll_progress
+        self.progress_bus = ProgressBus(self.PROGRESS_LOG_BUFFER)
+        bus = self.progress_bus
+        self.root.after(self.PROGRESS_POLL_MS, self._poll_progress, bus)
+        
         # Add initial message
         self.progress_text.insert(tk.END, f"Starting processing for: {directory}\n")
         self.progress_text.insert(tk.END, "="*80 + "\n")
         
+        # Get processing options here; Tk variables must not be read from the worker
+        force_ocr = self.force_ocr_var.get()
+        adaptive_ocr = self.adaptive_ocr_var.get()
+        preprocess_ocr = self.preprocess_ocr_var.get()
+        ocr_profile = self.ocr_profile_var.get()
+        try:
+            pdf_timeout = self.pdf_timeout_var.get() or None
+        except tk.TclError:
+            pdf_timeout = 300
+        try:
+            memory_budget_mb = self.memory_budget_var.get() or None
+        except tk.TclError:
+            memory_budget_mb = None
+        try:
+            profile_threshold = self.profile_threshold_var.get() or None
+        except tk.TclError:
+            profile_threshold = None
+        profile_memory = self.profile_memory_var.get()
+        resume = self.resume_var.get()
+        results_db = Path(directory) / PDFExcelProcessor.HISTORY_DB_NAME if self.history_var.get() else None
+        output_mode = self.output_mode_var.get()
+        separate_output = (output_mode in ("separate", "sidecar"))
+        destructive = (output_mode == "destructive")
+        sidecar_output = (output_mode == "sidecar")
+        server_url = self.server_var.get().strip()
+        
+        options = {
+            'force_ocr': force_ocr,
+            'separate_output': separate_output,
+            'destructive': destructive,
+            'adaptive_ocr': adaptive_ocr,
+            'preprocess_ocr': preprocess_ocr,
+            'ocr_profile': ocr_profile,
+            'pdf_timeout': pdf_timeout,
+            'memory_budget_mb': memory_budget_mb,
+            'sidecar_output': sidecar_output,
+            'profile_threshold': profile_threshold,
+            'profile_memory': profile_memory,
+        }
+        
         def run_processing():
             try:
-                # Get processing options
-                force_ocr = self.force_ocr_var.get()
-                output_mode = self.output_mode_var.get()
-                separate_output = (output_mode == "separate")
-                destructive = (output_mode == "destructive")
-                
-                # Create processor with options
-                self.processor = PDFExcelProcessor(
-                    directory,
-                    force_ocr=force_ocr,
-                    separate_output=separate_output,
-                    destructive=destructive
-                )
-                
-                # Create a wrapper for detailed callback that runs in main thread
-                # Clear table before processing
-                self.root.after(0, lambda: self.results_tree.delete(*self.results_tree.get_children()))
-                self.root.after(0, lambda: self.results_summary.config(text=""))
+                def detailed_callback(msg, prog, file_info=None):
+                    bus.status(msg, prog, file_info)
+                    bus.log(f"[{prog:3.0f}%] {msg}")
                 
-                def detailed_callback_wrapper(msg, prog, file_info=None):
-                    self.root.after(0, self.update_detailed_progress, msg, prog, file_info)
-                
-                results = self.processor.process_directory(
-                    progress_callback=self.update_progress,
-                    detailed_callback=detailed_callback_wrapper,
-                    stop_flag=lambda: self.stop_processing
-                )
+                if server_url:
+                    # Thin client: the server runs the job; nothing is processed (or created) locally
+                    self.processor = ServerRun(directory, options)
+                    self.run_on_server(server_url, directory, detailed_callback, results_queue.put, {
+                        **options,
+                        'history': results_db is not None,
+                        'resume': resume,
+                    })
+                else:
+                    self.processor = PDFExcelProcessor(directory, results_db=results_db, **options)
+                    self.processor.process_directory(
+                        progress_callback=bus.status,
+                        detailed_callback=detailed_callback,
+                        stop_flag=lambda: self.stop_processing,
+                        result_callback=results_queue.put,
+                        resume=resume
+                    )
                 
                 # Check if stopped
                 if self.stop_processing:
-                    self.root.after(0, lambda: self.status_label.config(text="Processing stopped by user"))
-                    self.root.after(0, lambda: self.progress_text.insert(tk.END, "\n*** Processing stopped by user ***\n"))
-                else:
-                    # Display results
-                    self.root.after(0, self.display_results, results)
+                    bus.post(lambda: self.status_label.config(text="Processing stopped by user"))
+                    bus.log("\n*** Processing stopped by user ***")
                 
+                # Stage breakdown at the end of the progress log
+                breakdown = self.processor.format_timing_breakdown()
+                if breakdown:
+                    bus.log("\n" + "\n".join(breakdown))
+                
+            except JournalInUse as e:
+                error_msg = (f"Another run is using this folder.\n\n{e}\n\n"
+                             f"Wait for it to finish (or stop it), then start again.")
+                bus.log(f"\n{error_msg}")
+                bus.post(messagebox.showerror, "Folder In Use", error_msg)
+                logger.warning(f"Processing not started: {e}")
             except Exception as e:
                 error_msg = f"Error: {str(e)}\n{type(e).__name__}"
-                self.root.after(0, lambda: self.progress_text.insert(tk.END, f"\n{error_msg}\n"))
-                self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
+                bus.log(f"\n{error_msg}")
+                bus.post(messagebox.showerror, "Error", error_msg)
                 import traceback
                 logger.error(f"Processing error: {traceback.format_exc()}")
             finally:
+                # Tell the result poller that no more rows are coming
+                results_queue.put(self._RESULTS_DONE)
+                
                 # Re-enable buttons
-                self.root.after(0, lambda: self.process_btn.config(state='normal'))
-                self.root.after(0, lambda: self.stop_btn.config(state='disabled'))
-                self.root.after(0, lambda: self.reset_btn.config(state='normal'))
+                bus.post(lambda: self.process_btn.config(state='normal'))
+                bus.post(lambda: self.stop_btn.config(state='disabled'))
+                bus.post(lambda: self.reset_btn.config(state='normal'))
+                if sidecar_output:
+                    bus.post(lambda: self.materialise_btn.config(state='normal'))
+                bus.close()
                 
         self.processing_thread = threading.Thread(target=run_processing, daemon=True)
         self.processing_thread.start()
+    
+    def run_on_server(self, server_url: str, directory: str, detailed_callback, result_callback, options: Dict):
+        """Run the job on a JobServer and take over its results and report (worker thread)"""
+        client = JobClient(server_url)
+        job = client.submit(directory, **options)
+        if job['joined']:
+            detailed_callback(f"Joined the job already running for this folder on {client.url}", 0)
+        else:
+            detailed_callback(f"Job {job['id']} submitted to {client.url}", 0)
+        state = job['state']
+        streamed_rows = 0
+        for event in client.events(job['id'], stop_flag=lambda: self.stop_processing):
+            if event['type'] == 'progress':
+                detailed_callback(event['message'], event['progress'], event.get('file_info'))
+            elif event['type'] == 'row':
+                streamed_rows += 1
+                result_callback(event['row'])
+            elif event['type'] == 'state':
+                state = event['state']
+                if state == 'failed':
+                    if event.get('error_type') == JournalInUse.__name__:
+                        raise JournalInUse(event.get('error'))
+                    raise RuntimeError(f"Job failed on the server: {event.get('error')}")
+        if state in ('done', 'cancelled'):
+            self.processor.results_df = client.results(job['id'])
+            self.processor.run_report = client.report(job['id'])
+            results = self.processor.results_df
+            if not streamed_rows and not results.empty:
+                # The job ended before the stream opened, and a finished job keeps no row events
+                for row in results.astype(object).where(results.notna(), None).to_dict('records'):
+                    result_callback(row)
+    
+    def materialise_pdfs(self):
+        """Create every highlighted PDF recorded in sidecars by the last run, in a background thread"""
+        processor = self.processor
+        if not processor or not processor.sidecar_output:
+            return
+        
+        self.materialise_btn.config(state='disabled')
+        self.process_btn.config(state='disabled')
+        self.stop_btn.config(state='enabled')
+        self.stop_processing = False
+        self.progress_var.set(0)
+        self.progress_bus = ProgressBus(self.PROGRESS_LOG_BUFFER)
+        bus = self.progress_bus
+        self.root.after(self.PROGRESS_POLL_MS, self._poll_progress, bus)
+        
+        def run_materialise():
+            try:
+                counts = processor.materialise_all(progress_callback=bus.status,
+                                                   stop_flag=lambda: self.stop_processing)
+                message = (f"Highlighted PDFs: {counts['created']} created, {counts['up_to_date']} already up to date"
+                           + (f", {counts['failed']} failed (see log)" if counts['failed'] else ""))
+                bus.status(message, 100)
+                bus.log(message)
+            except Exception as e:
+                bus.log(f"\nError creating highlighted PDFs: {e}")
+                bus.post(messagebox.showerror, "Error", f"Could not create highlighted PDFs: {e}")
+            finally:
+                bus.post(lambda: self.process_btn.config(state='normal'))
+                bus.post(lambda: self.stop_btn.config(state='disabled'))
+                bus.post(lambda: self.materialise_btn.config(state='normal'))
+                bus.close()
+        
+        threading.Thread(target=run_materialise, daemon=True).start()
         
     def open_file(self, file_path):
         """Open a file using the system's default application"""
@@ -1310,8 +5544,10 @@ For issues or questions, check the README.md file or open an issue on GitHub.
         if not selection:
             return
         
-        item = self.results_tree.item(selection[0])
-        values = item['values']
+        row_idx = self.results_table.row_for_item(selection[0])
+        if row_idx is None:
+            return
+        values = self.full_results[row_idx]
         
         # Get column clicked
         column = self.results_tree.identify_column(event.x)
@@ -1333,131 +5569,357 @@ For issues or questions, check the README.md file or open an issue on GitHub.
             if values[4] == 'Yes':
                 highlighted_file = values[7]  # Full path stored in tag
                 if highlighted_file:
+                    if not Path(highlighted_file).exists() and self.processor.sidecar_path(highlighted_file).exists():
+                        # Sidecar mode: create the highlighted PDF the first time it is opened
+                        try:
+                            self.processor.materialise_highlighted(highlighted_file)
+                        except Exception as e:
+                            messagebox.showerror("Error", f"Could not create highlighted PDF: {e}")
+                            return
                     self.open_file(highlighted_file)
     
+    @staticmethod
+    def _row_matches_filter(row_data, filter_value: str) -> bool:
+        """Whether a table row passes the selected filter"""
+        pdf_status = row_data[2]
+        highlighted = row_data[4]
+        if filter_value == "PDF Found":
+            return pdf_status == "Found"
+        elif filter_value == "PDF Not Found":
+            return pdf_status == "Not Found"
+        elif filter_value == "Part Number Not Found":
+            return pdf_status == "Found" and highlighted == "No"
+        elif filter_value == "Part Number Found":
+            return highlighted == "Yes"
+        elif filter_value == "Timed Out":
+            return highlighted == "Timed Out"
+        return True
+    
+    @staticmethod
+    def _row_search_key(row_data) -> str:
+        """Lowercased text the search box matches against (Excel file, part number, PDF file)"""
+        return f"{row_data[0]}\n{row_data[1]}\n{row_data[3]}".lower()
+    
+    def _clear_results(self):
+        """Drop all rows together with the filter and search indexes"""
+        self.full_results = []
+        self.filter_index = {name: [] for name in self.FILTERS}
+        self.search_keys = []
+        self.apply_filter()
+    
     def apply_filter(self, event=None):
-        """Apply filter to the results table"""
-        # Clear current items
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        """Show the rows of the selected filter that contain the search text"""
+        base = self.filter_index[self.filter_var.get()]
+        self.search_text = self.search_var.get().strip().lower()
+        if self.search_text:
+            self.view = [i for i in base if self.search_text in self.search_keys[i]]
+        else:
+            # Shared with the index, so rows streamed in later show up without rebuilding
+            self.view = base
+        self.results_table.set_view(self.full_results, self.view)
+    
+    def _row_display_data(self, row) -> Tuple:
+        """Table values for one result row, including the full paths used for opening files"""
+        excel_file = row.get('Excel File', '')
+        part_number = row.get('Part Number', '')
+        pdf_status = row.get('PDF Status', 'Not Found')
+        pdf_file = row.get('PDF File', '') if pdf_status == 'Found' else ''
+        part_found = row.get('Part Number Found', 'N/A')
+        if part_found in ('Yes', 'Timed Out', 'Cancelled'):
+            highlighted = part_found
+        else:
+            highlighted = 'No' if pdf_status == 'Found' else 'N/A'
         
-        filter_value = self.filter_var.get()
+        # Build full paths
+        excel_path = ''
+        if excel_file:
+            fai_folder = f"FAI {row.get('FAI Folder', '')}"
+            excel_path = str(self.processor.base_path / fai_folder / excel_file)
         
-        # Apply filter and repopulate
-        for row_data in self.full_results:
-            excel_file, part_number, pdf_status, pdf_file, highlighted, excel_path, pdf_path, highlighted_path = row_data
-            
-            # Apply filter logic
-            if filter_value == "All":
-                show = True
-            elif filter_value == "PDF Found":
-                show = (pdf_status == "Found")
-            elif filter_value == "PDF Not Found":
-                show = (pdf_status == "Not Found")
-            elif filter_value == "Part Number Not Found":
-                show = (pdf_status == "Found" and highlighted == "No")
-            elif filter_value == "Part Number Found":
-                show = (highlighted == "Yes")
+        pdf_path = ''
+        if pdf_file:
+            coc_folder = f"Material CoC {row.get('FAI Folder', '')}"
+            pdf_path = str(self.processor.base_path / coc_folder / pdf_file)
+        
+        highlighted_path = ''
+        if row.get('Highlighted PDF'):
+            if self.processor.separate_output and self.processor.output_folder:
+                # Check if we have source folder info
+                source_folder = row.get('Source Folder', '')
+                if source_folder:
+                    highlighted_path = str(self.processor.output_folder / source_folder / row.get('Highlighted PDF'))
+                else:
+                    highlighted_path = str(self.processor.output_folder / row.get('Highlighted PDF'))
             else:
-                show = True
+                coc_folder = f"Material CoC {row.get('FAI Folder', '')}"
+                highlighted_path = str(self.processor.base_path / coc_folder / row.get('Highlighted PDF'))
+        
+        return (excel_file, part_number, pdf_status, pdf_file, highlighted,
+                excel_path, pdf_path, highlighted_path)
+    
+    def _reset_summary_counts(self):
+        self.summary_counts = {'total': 0, 'pdfs_found': 0, 'parts_found': 0, 'timed_out': 0}
+    
+    def _update_summary(self, final: bool = False):
+        """Refresh the summary line from the running counts"""
+        counts = self.summary_counts
+        total_rows = counts['total']
+        if final and total_rows == 0:
+            self.results_summary.config(text="No results found.")
+            return
+        
+        summary = "Processing Complete! | " if final else "Processing... | "
+        summary += f"Total entries: {total_rows} | "
+        summary += f"PDFs found: {counts['pdfs_found']}/{total_rows} | "
+        if counts['pdfs_found'] > 0:
+            summary += f"Part numbers highlighted: {counts['parts_found']}/{counts['pdfs_found']}"
+        if counts['timed_out']:
+            summary += f" | Timed out: {counts['timed_out']}"
+        self.results_summary.config(text=summary)
+    
+    def _add_result_rows(self, rows):
+        """Append result rows to the filter and search indexes, then redraw the visible window once"""
+        filter_value = self.filter_var.get()
+        counts = self.summary_counts
+        for row in rows:
+            row_data = self._row_display_data(row)
+            row_idx = len(self.full_results)
+            self.full_results.append(row_data)
+            search_key = self._row_search_key(row_data)
+            self.search_keys.append(search_key)
             
-            if show:
-                # Insert with full paths as tags for opening files
-                item_id = self.results_tree.insert('', 'end', 
-                    values=(excel_file, part_number, pdf_status, pdf_file, highlighted,
-                           excel_path, pdf_path, highlighted_path))
+            counts['total'] += 1
+            if row_data[2] == 'Found':
+                counts['pdfs_found'] += 1
+            if row_data[4] == 'Yes':
+                counts['parts_found'] += 1
+            elif row_data[4] == 'Timed Out':
+                counts['timed_out'] += 1
+            
+            for name, index in self.filter_index.items():
+                if self._row_matches_filter(row_data, name):
+                    index.append(row_idx)
+            if self.search_text and self.search_text in search_key and self._row_matches_filter(row_data, filter_value):
+                self.view.append(row_idx)
+        
+        self.results_table.render()
+    
+    def _poll_results(self, results_queue):
+        """Move a batch of streamed rows from the worker queue into the table"""
+        if results_queue is not self.results_queue:
+            return  # A newer run replaced this queue
+        
+        rows = []
+        finished = False
+        while len(rows) < self.RESULT_BATCH_SIZE:
+            try:
+                item = results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._RESULTS_DONE:
+                finished = True
+                break
+            rows.append(item)
+        
+        if rows:
+            self._add_result_rows(rows)
+            self._update_summary()
+        
+        if finished:
+            self._update_summary(final=not self.stop_processing)
+            if self.processor and not self.processor.results_df.empty:
+                self.save_btn.config(state='normal')
+        else:
+            self.root.after(self.RESULT_POLL_MS, self._poll_results, results_queue)
     
     def display_results(self, results):
-        """Display processing results"""
+        """Display a complete results DataFrame in one go"""
         # Clear previous results
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        self.full_results = []
+        self._clear_results()
+        self._reset_summary_counts()
+        
+        if not results.empty:
+            # Typed columns hold <NA> for missing values; the table expects plain values
+            plain = results.astype(object).where(results.notna(), None)
+            self._add_result_rows(plain.to_dict('records'))
+        self._update_summary(final=True)
         
-        if results.empty:
-            self.results_summary.config(text="No results found.")
-        else:
-            # Summary statistics
-            total_rows = len(results)
-            pdfs_found = len(results[results['PDF Status'] == 'Found'])
-            parts_found = len(results[results['Part Number Found'] == 'Yes'])
-            
-            summary = f"Processing Complete! | "
-            summary += f"Total entries: {total_rows} | "
-            summary += f"PDFs found: {pdfs_found}/{total_rows} | "
-            if pdfs_found > 0:
-                summary += f"Part numbers highlighted: {parts_found}/{pdfs_found}"
-            
-            self.results_summary.config(text=summary)
-            
-            # Populate table
-            for idx, row in results.iterrows():
-                excel_file = row.get('Excel File', '')
-                part_number = row.get('Part Number', '')
-                pdf_status = row.get('PDF Status', 'Not Found')
-                pdf_file = row.get('PDF File', '') if pdf_status == 'Found' else ''
-                part_found = row.get('Part Number Found', 'N/A')
-                highlighted = 'Yes' if part_found == 'Yes' else 'No' if pdf_status == 'Found' else 'N/A'
-                
-                # Build full paths
-                excel_path = ''
-                if excel_file:
-                    fai_folder = f"FAI {row.get('FAI Folder', '')}"
-                    excel_path = str(self.processor.base_path / fai_folder / excel_file)
-                
-                pdf_path = ''
-                if pdf_file:
-                    coc_folder = f"Material CoC {row.get('FAI Folder', '')}"
-                    pdf_path = str(self.processor.base_path / coc_folder / pdf_file)
-                
-                highlighted_path = ''
-                if row.get('Highlighted PDF'):
-                    if self.processor.separate_output and self.processor.output_folder:
-                        # Check if we have source folder info
-                        source_folder = row.get('Source Folder', '')
-                        if source_folder:
-                            highlighted_path = str(self.processor.output_folder / source_folder / row.get('Highlighted PDF'))
-                        else:
-                            highlighted_path = str(self.processor.output_folder / row.get('Highlighted PDF'))
-                    else:
-                        coc_folder = f"Material CoC {row.get('FAI Folder', '')}"
-                        highlighted_path = str(self.processor.base_path / coc_folder / row.get('Highlighted PDF'))
-                
-                # Store full data including paths
-                row_data = (excel_file, part_number, pdf_status, pdf_file, highlighted,
-                           excel_path, pdf_path, highlighted_path)
-                self.full_results.append(row_data)
-                
-                # Insert into tree (paths are stored in values for access)
-                self.results_tree.insert('', 'end', 
-                    values=row_data)
-            
         self.process_btn.config(state='normal')
         self.save_btn.config(state='normal')
         
     def save_results(self):
-        """Save results to CSV"""
+        """Save results to CSV, plus a Parquet copy when pyarrow is installed"""
         if not self.processor or self.processor.results_df.empty:
             messagebox.showerror("Error", "No results to save")
             return
             
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("Arrow files", "*.arrow"),
+                       ("All files", "*.*")]
         )
         
         if file_path:
-            output_path = self.processor.save_results(file_path)
+            try:
+                suffix = Path(file_path).suffix.lower()
+                if suffix in ('.parquet', '.arrow'):
+                    output_path = self.processor.export_results(file_path)
+                else:
+                    columnar = ('parquet',) if PYARROW_AVAILABLE else ()
+                    output_path = self.processor.save_results(file_path, columnar_formats=columnar)
+                    if columnar:
+                        output_path += f"\n(and {Path(output_path).with_suffix('.parquet').name})"
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save results: {e}")
+                return
             messagebox.showinfo("Success", f"Results saved to {output_path}")
 
 
-# Main entry point - GUI only
-def main():
-    """Launch FAI PDF Processor GUI"""
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="FAI PDF Processor. Opens the GUI unless --watch, --serve, --coordinate or --work is given.")
+    parser.add_argument('--watch', metavar='FOLDER',
+                        help='Keep processing new or changed folder pairs under FOLDER until stopped (no GUI)')
+    parser.add_argument('--interval', type=float, default=10.0, help='Seconds between scans of the folder')
+    parser.add_argument('--settle', type=float, default=5.0,
+                        help='Seconds a folder pair must stay unchanged before it is processed')
+    parser.add_argument('--process-existing', action='store_true',
+                        help='On the first start, also process the folder pairs that already exist')
+    parser.add_argument('--db', help=f'Results store (watch mode default: {PDFExcelProcessor.HISTORY_DB_NAME} '
+                                     'in FOLDER; job server: one store for all jobs)')
+    parser.add_argument('--no-force-ocr', action='store_true', help='Only OCR PDFs without a text layer')
+    parser.add_argument('--sidecar', action='store_true', help='Write match sidecars instead of highlighted PDFs')
+    parser.add_argument('--ocr-profile', choices=sorted(PDFExcelProcessor.OCR_PROFILES), default='default')
+    parser.add_argument('--preprocess-ocr', action='store_true', help='Clean up scans before OCR')
+    parser.add_argument('--timeout', type=float, default=300, help='Per-PDF time limit in seconds (0 = none)')
+    parser.add_argument('--profile', type=float, metavar='SECONDS',
+                        help=f'Save profiles of PDFs taking SECONDS or more (in FOLDER/{PDFExcelProcessor.PROFILE_DIR_NAME})')
+    parser.add_argument('--profile-mode', choices=PDFProfiler.MODES, default='cprofile')
+    parser.add_argument('--profile-memory', action='store_true', help='Also trace Python memory of profiled PDFs')
+    parser.add_argument('--serve', action='store_true', help='Run the job server for GUIs on this host (no GUI)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address the job server listens on')
+    parser.add_argument('--port', type=int, default=JobServer.DEFAULT_PORT, help='Port the job server listens on')
+    parser.add_argument('--coordinate', metavar='FOLDER',
+                        help='Split FOLDER into work units in --queue, wait for workers and save the merged results')
+    parser.add_argument('--queue', metavar='PATH', help='Work queue database for --coordinate (on a share all hosts see)')
+    parser.add_argument('--local-workers', type=int, default=0,
+                        help='With --coordinate, also start this many workers on this host')
+    parser.add_argument('--work', metavar='QUEUE', help='Process units of the work queue QUEUE until none are left')
+    parser.add_argument('--base', metavar='FOLDER',
+                        help="With --work, where this host mounts the coordinator's folder (default: same path)")
+    return parser.parse_args(argv)
+
+
+def _processor_from_args(args, base_path: Path) -> PDFExcelProcessor:
+    """Processor over base_path with the processing options of the command line"""
+    return PDFExcelProcessor(
+        str(base_path),
+        force_ocr=not args.no_force_ocr,
+        separate_output=True,
+        pdf_timeout=args.timeout or None,
+        results_db=args.db or str(base_path / PDFExcelProcessor.HISTORY_DB_NAME),
+        sidecar_output=args.sidecar,
+        preprocess_ocr=args.preprocess_ocr,
+        ocr_profile=args.ocr_profile,
+        profile_threshold=args.profile,
+        profile_mode=args.profile_mode,
+        profile_memory=args.profile_memory,
+    )
+
+
+def watch(args):
+    """Run the folder watcher from the command line until Ctrl+C or SIGTERM"""
+    base_path = Path(args.watch)
+    processor = _processor_from_args(args, base_path)
+    watcher = FolderWatcher(processor, interval=args.interval, settle_seconds=args.settle,
+                            process_existing=args.process_existing)
+    signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+    logger.info("Watch stopped")
+    return 0
+
+
+def serve(args):
+    """Run the job server from the command line until Ctrl+C or SIGTERM"""
+    server = JobServer(args.host, args.port, results_db=args.db)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    logger.info("Job server stopped")
+    return 0
+
+
+def coordinate(args):
+    """Fill a work queue from a folder, wait for the workers and save the merged results"""
+    if not args.queue:
+        print("--coordinate needs --queue PATH", file=sys.stderr)
+        return 2
+    processor = _processor_from_args(args, Path(args.coordinate))
+    units = processor.create_work_queue(args.queue)
+    logger.info(f"{units} work units queued in {args.queue}; start workers with: "
+                f"python {Path(__file__).name} --work {args.queue}")
+    workers = [subprocess.Popen([sys.executable, str(Path(__file__).resolve()), '--work', args.queue])
+               for _ in range(args.local_workers)]
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        processor.collect_work_queue(args.queue, progress_callback=lambda message, _: logger.info(message),
+                                     stop_flag=stop.is_set)
+    except KeyboardInterrupt:
+        logger.info("Stopped waiting; finished units are saved")
+        processor.collect_work_queue(args.queue, stop_flag=lambda: True)
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.terminate()
+            worker.wait()
+    if processor.results_df.empty:
+        logger.error("No results")
+        return 1
+    processor.save_results()
+    for line in processor.format_timing_breakdown():
+        logger.info(line)
+    return 0
+
+
+def work(args):
+    """Run a queue worker from the command line until the queue is empty, Ctrl+C or SIGTERM"""
+    worker = QueueWorker(args.work, base_path=args.base)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+    return 0
+
+
+# Main entry point - GUI unless one of the command-line modes is given
+def main(argv=None):
+    """Launch FAI PDF Processor GUI, or watch mode, the job server, a work queue coordinator or worker"""
+    args = parse_args(argv)
+    # Tesseract/Poppler are located in the background; the first OCR waits for it
+    DEPENDENCIES.start()
+    if args.watch or args.serve or args.coordinate or args.work:
+        # Their PDFs are OCRed on worker threads; the GUI imports tesserocr with its preload
+        tesserocr_loaded()
+    if args.watch:
+        return watch(args)
+    if args.serve:
+        return serve(args)
+    if args.coordinate:
+        return coordinate(args)
+    if args.work:
+        return work(args)
     root = tk.Tk()
     app = ProcessorGUI(root)
     root.mainloop()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())